@@ -5,13 +5,213 @@ Main Streamlit application entry point.
 Built with LangGraph + OpenAI GPT-4o + Tavily
 """
 
+import uuid
+from typing import Dict, List, Optional, Tuple
+
 import streamlit as st
-import time
 
-from src.ui.main_ui import init_streamlit, render_header, render_api_keys, render_topic_input, render_agent_status
+from src.ui.main_ui import (
+    AGENT_SEQUENCE,
+    init_streamlit,
+    render_header,
+    render_api_keys,
+    render_topic_input,
+    render_agent_status,
+    render_live_output
+)
 from src.ui.sidebar import render_sidebar
-from src.ui.results import render_results, render_success_message
-from src.workflow.thread_workflow import create_thread_workflow
+from src.ui.results import render_results, render_success_message, render_timing_panel
+from src.ui.history import render_history
+from src.models.state import create_initial_state
+from src.workflow.jobs import Job, QueueFullError, get_job_manager
+from src.workflow.prewarm import start_prewarm
+from src.workflow.variants import variant_plan
+from src.utils.api_keys import invalidate_on_auth_error
+from src.utils.credentials import credentials_config
+from src.utils.history import get_history_store
+from src.utils.model_routing import get_model_routes, with_models
+from src.utils.rate_limit import is_rate_limit_error
+
+
+# Variant-mode nodes, shown as the agents whose work they do
+NODE_AGENTS = {
+    "variant": ["writer", "editor"],
+    "select": ["supervisor"],
+    "selected_analytics": ["analytics"]
+}
+
+# State each agent fills in, used to show progress for a resumed run
+RESUMED_OUTPUTS = {
+    "research": "research_data",
+    "strategy": "strategy_plan",
+    "writer": "draft_tweets",
+    "editor": "polished_tweets",
+    "supervisor": "quality_score"
+}
+
+
+def get_checkpointer():
+    """Return the shared checkpoint store, importing it on first use (it loads LangGraph)."""
+    from src.utils.checkpoints import get_checkpointer as shared_checkpointer
+    
+    return shared_checkpointer()
+
+
+def workflow_options(customizations: Dict) -> Dict:
+    """
+    Registry options for a run's compiled workflow.
+    
+    The prewarm thread compiles with the same options, so the first
+    generation finds the workflow already built.
+    
+    Args:
+        customizations (Dict): Sidebar customizations
+    
+    Returns:
+        Dict: Keyword arguments for ``get_thread_workflow``
+    """
+    return {
+        "speculative_analytics": customizations["speculative_analytics"],
+        "checkpointer": get_checkpointer(),
+        "model_routes": with_models(get_model_routes(), customizations.get("models"))
+    }
+
+
+def job_progress(job: Job, events: List[Dict]) -> Tuple[str, float, List[str]]:
+    """
+    Replay a job's events into the agent status display.
+    
+    Args:
+        job (Job): Job being watched
+        events (List[Dict]): Its events so far
+    
+    Returns:
+        Tuple containing: current agent, progress percentage, completed agents
+    """
+    customizations = job.initial_state.get("customizations") or {}
+    # A resumed job starts from its checkpoint, which already holds earlier agents' output
+    completed_agents = [agent for agent, output in RESUMED_OUTPUTS.items() if job.initial_state.get(output) is not None]
+    current_agent = job.initial_state.get("current_agent") or "research"
+    iteration_count = job.initial_state.get("iteration_count", 0)
+    
+    for event in events:
+        if event["type"] != "agent_completed":
+            continue
+        for agent in NODE_AGENTS.get(event["agent"], [event["agent"]]):
+            if agent in AGENT_SEQUENCE:
+                completed_agents.append(agent)
+        current_agent = event["next_agent"] or "complete"
+        iteration_count = event["iteration_count"]
+    
+    # Each extra variant adds a writer and an editor pass
+    variant_steps = 2 * (max(1, len(variant_plan(customizations))) - 1)
+    # Each revision adds another writer → editor → supervisor (→ analytics) pass
+    steps_per_revision = 4 if job.workflow_options.get("speculative_analytics") else 3
+    expected_steps = len(AGENT_SEQUENCE) + variant_steps + steps_per_revision * iteration_count
+    progress = min(len(completed_agents) / expected_steps * 100, 100)
+    return current_agent, progress, completed_agents
+
+
+def watch_job(job: Job, openai_key: str, tavily_key: str):
+    """
+    Show a job's progress until it finishes, then its results.
+    
+    The job runs on a worker thread, so a rerun only stops this watcher; the
+    next script run attaches to the same job and replays its events.
+    
+    Args:
+        job (Job): Job to watch
+        openai_key (str): This session's OpenAI API key
+        tavily_key (str): This session's Tavily API key
+    """
+    notice_container = st.container()
+    progress_container = st.empty()
+    status_container = st.empty()
+    
+    events = []
+    live_agent = None
+    live_text = ""
+    live_tweets = []
+    while True:
+        new_events = job.events_since(len(events), timeout=0.1)
+        events.extend(new_events)
+        
+        streamed = False
+        for event in new_events:
+            if event["type"] == "notice":
+                with notice_container:
+                    getattr(st, event["level"], st.info)(event["message"])
+            elif event["type"] in ("token", "tweet"):
+                # Parallel variants stream side by side; follow the first one
+                if event.get("variant", 0) != 0:
+                    continue
+                if event["agent"] != live_agent:
+                    live_agent, live_text, live_tweets = event["agent"], "", []
+                if event["type"] == "token":
+                    live_text += event["text"]
+                else:
+                    live_tweets.append(event["text"])
+                streamed = True
+        
+        # Redraw once per batch; tokens arrive much faster than the browser needs them
+        if new_events or not events:
+            current_agent, progress, completed_agents = job_progress(job, events)
+            with progress_container.container():
+                render_agent_status(current_agent, progress, completed_agents)
+            if streamed:
+                with status_container.container():
+                    render_live_output(live_agent, live_text, live_tweets)
+        
+        if job.done and len(events) >= len(job.events):
+            break
+    
+    progress_container.empty()
+    status_container.empty()
+    
+    if job.status == "failed":
+        # Shown once; the run can then be resumed from its checkpoint
+        detach_job()
+        # Make the key section re-check a key the provider just rejected
+        invalidate_on_auth_error(job.exception, openai_key, tavily_key)
+        if is_rate_limit_error(job.exception):
+            st.error("The OpenAI or Tavily rate limit was still exceeded after several retries.")
+            st.error("Please wait a minute and try again.")
+        else:
+            st.error(f"An error occurred: {str(job.exception)}")
+            st.error("Please check your API keys and try again.")
+        if st.session_state.get("pending_run"):
+            st.info("Completed steps were saved; press Resume Generation to continue from where it stopped.")
+        return
+    
+    # The job manager already saved the thread to history and removed its checkpoint
+    st.session_state.pop("pending_run", None)
+    final_state = job.final_state
+    if final_state:
+        render_results(final_state)
+        
+        # Success message
+        quality_score = final_state.get("quality_score", "N/A")
+        render_success_message(quality_score)
+        
+        if (job.initial_state.get("customizations") or {}).get("show_timings"):
+            render_timing_panel(job.trace.summary())
+
+
+def attached_job() -> Optional[Job]:
+    """Return the job this session watches, or the one a ``?job=`` link points at."""
+    job_id = st.session_state.get("job_id") or st.query_params.get("job")
+    job = get_job_manager().get(job_id) if job_id else None
+    if job is None:
+        detach_job()
+    else:
+        st.session_state["job_id"] = job.id
+    return job
+
+
+def detach_job():
+    """Stop watching the session's job."""
+    st.session_state.pop("job_id", None)
+    st.query_params.pop("job", None)
 
 
 def main():
@@ -29,15 +229,30 @@ def main():
     # Sidebar customization
     num_tweets, style, word_limit, customizations = render_sidebar()
     
+    # Load the generation stack and compile this configuration's workflow off the render path
+    start_prewarm(lambda: workflow_options(customizations))
+    
     # Main content
     topic = render_topic_input()
     
+    # Generations run on process-wide workers, so they survive reruns and other tabs can watch them
+    job = attached_job()
+    running = job is not None and not job.done
+    
     # Generate button
-    generate_button = st.button("✨ Generate Thread", type="primary", use_container_width=True)
+    generate_button = st.button("✨ Generate Thread", type="primary", use_container_width=True, disabled=running)
+    
+    # A run that failed can continue from its last completed agent
+    # (only stored while checkpoints are enabled)
+    pending_run = st.session_state.get("pending_run")
+    resume_button = False
+    if pending_run and not generate_button and (job is None or job.status == "failed"):
+        st.warning(f"Generation for \"{pending_run['topic']}\" stopped before it finished.")
+        resume_button = st.button("↻ Resume Generation", use_container_width=True)
     
     # Only allow generation if keys are valid
-    if generate_button:
-        if not topic:
+    if generate_button or resume_button:
+        if generate_button and not topic:
             st.error("Please enter a topic!")
             return
         
@@ -45,60 +260,49 @@ def main():
             st.error("Please provide valid API keys above!")
             return
         
-        try:
-            # Initialize workflow
-            workflow = create_thread_workflow(openai_key, tavily_key)
-            
-            # Prepare initial state
-            initial_state = {
+        checkpointer = get_checkpointer()
+        if generate_button:
+            if pending_run and checkpointer:
+                checkpointer.delete_thread(pending_run["run_id"])
+            pending_run = {
+                "run_id": uuid.uuid4().hex,
                 "topic": topic,
                 "style": style,
                 "num_tweets": num_tweets,
                 "word_limit": word_limit,
-                "customizations": customizations,
-                "research_data": None,
-                "strategy_plan": None,
-                "draft_tweets": None,
-                "polished_tweets": None,
-                "analytics_insights": None,
-                "current_agent": "research",
-                "quality_score": None,
-                "needs_revision": False,
-                "iteration_count": 0
+                "customizations": customizations
             }
-            
-            # Progress container
-            progress_container = st.empty()
-            status_container = st.empty()
-            
-            # Execute workflow
-            final_state = None
-            for i, state in enumerate(workflow.stream(initial_state)):
-                current_agent = list(state.keys())[0]
-                current_state = state[current_agent]
-                
-                progress = min((i + 1) * 16.67, 100)
-                
-                with progress_container.container():
-                    render_agent_status(current_agent, progress)
-                
-                time.sleep(1)  # Animation delay
-                final_state = current_state
-            
-            # Clear progress and show results
-            progress_container.empty()
-            status_container.empty()
-            
-            if final_state:
-                render_results(final_state)
-                
-                # Success message
-                quality_score = final_state.get("quality_score", "N/A")
-                render_success_message(quality_score)
-            
-        except Exception as e:
-            st.error(f"An error occurred: {str(e)}")
-            st.error("Please check your API keys and try again.")
+            if checkpointer:
+                st.session_state["pending_run"] = pending_run
+        customizations = pending_run["customizations"]
+        
+        initial_state = create_initial_state(
+            pending_run["topic"], pending_run["style"], pending_run["num_tweets"],
+            pending_run["word_limit"], customizations
+        )
+        try:
+            # Shared compiled workflow; this session's keys and run ID travel in the run config,
+            # and a resumed run continues from its checkpoint
+            job = get_job_manager().submit(
+                initial_state,
+                credentials_config(openai_key, tavily_key, thread_id=pending_run["run_id"]),
+                resume=resume_button,
+                **workflow_options(customizations)
+            )
+        except QueueFullError:
+            st.error("Too many generations are running right now. Please try again in a minute.")
+            return
+        
+        st.session_state["job_id"] = job.id
+        st.query_params["job"] = job.id
+    
+    if job is not None:
+        watch_job(job, openai_key, tavily_key)
+    
+    # Previously generated threads
+    history = get_history_store()
+    if history:
+        render_history(history)
 
 
 if __name__ == "__main__":
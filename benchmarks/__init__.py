@@ -0,0 +1,3 @@
+"""
+Benchmarks run against local stand-in LLM and search backends.
+"""
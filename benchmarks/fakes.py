@@ -0,0 +1,277 @@
+"""
+Deterministic stand-ins for the OpenAI chat model and the Tavily client.
+
+Both sleep for a latency drawn from a configurable distribution and return
+content shaped like the real providers' output, so the workflow can be run
+end to end without network access or API spend:
+    
+    llm = FakeChatModel(latency=LatencyDistribution.parse("lognormal:0.8,0.4"))
+    workflow = create_thread_workflow(llm=llm, search_client=FakeTavilyClient())
+"""
+
+import asyncio
+import hashlib
+import json
+import random
+import re
+import time
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+
+class LatencyDistribution:
+    """Seeded latency sampler"""
+    
+    KINDS = ("constant", "uniform", "normal", "lognormal")
+    
+    def __init__(self, kind: str = "constant", a: float = 0.0, b: float = 0.0, seed: Optional[int] = 0):
+        """
+        Initialize the distribution.
+        
+        Args:
+            kind (str): ``constant`` (a seconds), ``uniform`` (between a and b),
+                ``normal`` (mean a, stddev b) or ``lognormal`` (median a, sigma b)
+            a (float): First parameter
+            b (float): Second parameter
+            seed (Optional[int]): Random seed, for repeatable runs
+        """
+        if kind not in self.KINDS:
+            raise ValueError(f"Unknown latency distribution '{kind}', expected one of {', '.join(self.KINDS)}")
+        self.kind = kind
+        self.a = a
+        self.b = b
+        self._random = random.Random(seed)
+    
+    @classmethod
+    def parse(cls, spec: str, seed: Optional[int] = 0) -> "LatencyDistribution":
+        """
+        Build a distribution from a ``kind:a[,b]`` spec such as ``uniform:0.2,0.6``.
+        
+        Args:
+            spec (str): Distribution spec; a bare number means a constant latency
+            seed (Optional[int]): Random seed
+        
+        Returns:
+            LatencyDistribution: The parsed distribution
+        """
+        kind, _, params = spec.partition(":")
+        if not params:
+            kind, params = "constant", kind
+        values = [float(value) for value in params.split(",")]
+        return cls(kind, values[0], values[1] if len(values) > 1 else 0.0, seed=seed)
+    
+    def sample(self) -> float:
+        """Draw one latency in seconds, never negative."""
+        if self.kind == "uniform":
+            return self._random.uniform(self.a, self.b)
+        if self.kind == "normal":
+            return max(0.0, self._random.gauss(self.a, self.b))
+        if self.kind == "lognormal":
+            return self.a * self._random.lognormvariate(0.0, self.b) if self.a > 0 else 0.0
+        return self.a
+    
+    def __repr__(self) -> str:
+        return f"{self.kind}:{self.a},{self.b}"
+
+
+# Distinct enough that the local duplicate rule never fires on fake threads
+_TWEETS = [
+    "Most teams underestimate how fast this field is moving 🚀",
+    "Three numbers explain the shift: cost, speed and adoption 📊",
+    "The biggest wins come from boring workflow changes, not flashy demos 🛠️",
+    "Regulators are catching up, and that changes the playbook for builders ⚖️",
+    "Skeptics raise fair points about reliability and hidden maintenance costs 🤔",
+    "Early adopters report real savings once the tooling matures 💡",
+    "Expect consolidation as smaller players get acquired or squeezed out 📉",
+    "What would you change first in your own team? Reply and share below 👇"
+]
+
+
+def _digest(text: str) -> int:
+    return int(hashlib.blake2b(text.encode("utf-8"), digest_size=8).hexdigest(), 16)
+
+
+def _sampling_seed(kwargs: Dict) -> Optional[Any]:
+    """Seed, or failing that temperature, passed as a call option."""
+    return kwargs.get("seed", kwargs.get("temperature"))
+
+
+def _estimate_tokens(text: str) -> int:
+    # Cheap on purpose; the fake must not add measurable overhead of its own
+    return max(1, len(text) // 4)
+
+
+class FakeChatModel(BaseChatModel):
+    """
+    Chat model that answers each agent's prompt with canned, well-formed output.
+    
+    Responses depend only on the prompt, so repeated runs produce the same
+    threads; ``revision_rate`` sends that fraction of threads back for revision.
+    """
+    
+    model_name: str = "fake-chat"
+    temperature: float = 0.7
+    latency: Any = None
+    revision_rate: float = 0.0
+    
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat"
+    
+    def _reply(self, messages: List[BaseMessage], sampling_seed: Optional[Any] = None) -> str:
+        """Produce output in the format the agent behind this prompt parses."""
+        system = messages[0].content if len(messages) > 1 else ""
+        prompt = messages[-1].content
+        # Variant branches pass a seed or temperature, which should give them different threads
+        seed = _digest(prompt if sampling_seed is None else f"{prompt}\x1f{sampling_seed}")
+        
+        if "analytics expert" in system:
+            return json.dumps({
+                "posting_times": ["Weekdays 9-11am"],
+                "hashtags": ["AI", "Tech", "Future"],
+                "engagement_prediction": {"likes": 100 + seed % 400, "retweets": 20 + seed % 80, "replies": 5 + seed % 30},
+                "target_audience": "Tech-curious professionals",
+                "optimization_tips": ["Lead with the strongest claim", "Reply to early comments"]
+            })
+        
+        if "compares thread variants" in system:
+            count = len(re.findall(r"^\s*VARIANT \d+:\s*$", prompt, re.MULTILINE))
+            return json.dumps({"variants": [
+                {"variant": n, "score": round(6.5 + (_digest(f"{seed}-{n}") % 30) / 10, 1),
+                 "feedback": "Solid structure, sharpen the hook"}
+                for n in range(1, count + 1)
+            ]})
+        
+        if "evaluates content quality" in system:
+            revise = (seed % 1000) < self.revision_rate * 1000
+            numbers = [int(n) for n in re.findall(r"^\s*(\d+)\.", prompt.split("Tweets:")[-1].split("Rate this thread")[0], re.MULTILINE)]
+            failing = numbers[seed % len(numbers)] if revise and numbers else None
+            score = 6.0 if revise else 7.5 + (seed % 20) / 10
+            return json.dumps({
+                "score": round(score, 1),
+                "feedback": "Clear hook, solid flow.",
+                "revision_needed": revise,
+                "tweets": [
+                    {"tweet": n, "score": 5.0, "feedback": "Too vague, add a concrete detail"} if n == failing
+                    else {"tweet": n, "score": 8.0, "feedback": "Strong"}
+                    for n in numbers
+                ]
+            })
+        
+        if "content writer" in system or "master editor" in system:
+            count_match = re.search(r"numbered 1-(\d+)", prompt)
+            if count_match:
+                numbers = range(1, int(count_match.group(1)) + 1)
+            else:
+                # Editing and targeted revision prompts: answer for the tweets listed last
+                section = prompt.split("Rewrite ONLY these tweets")[-1]
+                numbers = [int(n) for n in re.findall(r"^\s*(\d+)\.", section, re.MULTILINE)] or range(1, 6)
+            return "\n".join(f"{i}. {_TWEETS[(i + seed) % len(_TWEETS)]}" for i in numbers)
+        
+        if "content strategist" in system:
+            return ("Hook: a surprising statistic. Structure: problem, evidence, implications, "
+                    "call to action. Tone: confident and accessible. Engagement: end with a question.")
+        
+        return ("Key facts: adoption is growing quickly. Recent developments: several major releases. "
+                "Statistics: most teams report measurable gains. Expert opinions: cautious optimism. "
+                "Trends: consolidation and regulation.")
+    
+    def _message(self, messages: List[BaseMessage], text: str) -> AIMessage:
+        prompt_tokens = sum(_estimate_tokens(str(message.content)) for message in messages)
+        completion_tokens = _estimate_tokens(text)
+        return AIMessage(
+            content=text,
+            response_metadata={"model_name": self.model_name},
+            usage_metadata={
+                "input_tokens": prompt_tokens,
+                "output_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens
+            }
+        )
+    
+    def _delay(self) -> float:
+        return self.latency.sample() if self.latency else 0.0
+    
+    def _generate(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs) -> ChatResult:
+        time.sleep(self._delay())
+        return ChatResult(generations=[ChatGeneration(message=self._message(messages, self._reply(messages, _sampling_seed(kwargs))))])
+    
+    async def _agenerate(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs) -> ChatResult:
+        await asyncio.sleep(self._delay())
+        return ChatResult(generations=[ChatGeneration(message=self._message(messages, self._reply(messages, _sampling_seed(kwargs))))])
+    
+    def _chunks(self, messages: List[BaseMessage], kwargs: Dict) -> List[str]:
+        words = self._reply(messages, _sampling_seed(kwargs)).split(" ")
+        return [word + " " for word in words[:-1]] + words[-1:]
+    
+    def _stream(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs) -> Iterator[ChatGenerationChunk]:
+        chunks = self._chunks(messages, kwargs)
+        # Spread the sampled latency over the tokens, as a streaming provider would
+        delay = self._delay() / len(chunks)
+        for text in chunks:
+            time.sleep(delay)
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=text))
+            if run_manager:
+                run_manager.on_llm_new_token(text, chunk=chunk)
+            yield chunk
+    
+    async def _astream(self, messages: List[BaseMessage], stop=None, run_manager=None,
+                       **kwargs) -> AsyncIterator[ChatGenerationChunk]:
+        chunks = self._chunks(messages, kwargs)
+        delay = self._delay() / len(chunks)
+        for text in chunks:
+            await asyncio.sleep(delay)
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=text))
+            if run_manager:
+                await run_manager.on_llm_new_token(text, chunk=chunk)
+            yield chunk
+
+
+class FakeTavilyClient:
+    """Search client with ``TavilyClient.search``'s signature and result shape"""
+    
+    def __init__(self, latency: Optional[LatencyDistribution] = None, results_per_query: int = 3,
+                 content_chars: int = 800, api_key: Optional[str] = None):
+        """
+        Initialize the client.
+        
+        Args:
+            latency (Optional[LatencyDistribution]): Per-search latency, none by default
+            results_per_query (int): Results returned for each query
+            content_chars (int): Length of each result's content
+            api_key (Optional[str]): Ignored; accepted for signature compatibility
+        """
+        self.latency = latency
+        self.results_per_query = results_per_query
+        self.content_chars = content_chars
+    
+    def _results(self, query: str, max_results: int) -> Dict:
+        filler = f"{query} is discussed in detail here, with figures, quotes and context. "
+        content = (filler * (self.content_chars // len(filler) + 1))[:self.content_chars]
+        return {
+            "query": query,
+            "results": [
+                {
+                    "title": f"{query} - source {i}",
+                    "url": f"https://example.com/{_digest(query) % 100000}/{i}",
+                    "content": content,
+                    "score": round(1.0 - i * 0.1, 2)
+                }
+                for i in range(min(max_results, self.results_per_query))
+            ]
+        }
+    
+    def search(self, query: str, max_results: int = 5, timeout: float = 60, **kwargs) -> Dict:
+        time.sleep(self.latency.sample() if self.latency else 0.0)
+        return self._results(query, max_results)
+
+
+class AsyncFakeTavilyClient(FakeTavilyClient):
+    """``AsyncTavilyClient`` counterpart of ``FakeTavilyClient``"""
+    
+    async def search(self, query: str, max_results: int = 5, timeout: float = 60, **kwargs) -> Dict:
+        await asyncio.sleep(self.latency.sample() if self.latency else 0.0)
+        return self._results(query, max_results)
@@ -0,0 +1,425 @@
+"""
+Benchmark suite for the TweetCraft workflow on local stand-in backends.
+
+Usage:
+    python -m benchmarks.run --output results.json
+    python -m benchmarks.run --suite scaling --llm-latency lognormal:0.8,0.4 --max-sessions 256
+    python -m benchmarks.run --output new.json --baseline results.json --tolerance 0.15
+
+Suites:
+    end_to_end   Sequential full workflow runs, with per-agent time from run traces
+    agents       Each agent called on its own against a prepared state
+    parsing      ``extract_tweets_from_content`` and streamed ``TweetStreamParser`` throughput
+    scaling      Concurrent sessions on one event loop, doubling from 1 to ``--max-sessions``
+    similarity   Near-duplicate topic lookups in a ``TopicIndex`` of ``--topic-index-size`` entries
+    imports      Cold ``-X importtime`` cost of ``app`` and each ``src`` subpackage, in fresh interpreters
+
+Results are written as JSON. With ``--baseline``, metrics that got worse by more
+than ``--tolerance`` are reported and the exit status is 1.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+# Benchmarks measure uncached work; keep the on-disk caches out of it
+os.environ["TWEETCRAFT_LLM_CACHE"] = "0"
+os.environ["TWEETCRAFT_RESEARCH_CACHE"] = "0"
+os.environ.setdefault("TWEETCRAFT_CACHE_DIR", tempfile.mkdtemp(prefix="tweetcraft-bench-"))
+
+from src.agents.analytics import AnalyticsAgent
+from src.agents.editor import EditorAgent
+from src.agents.research import ResearchAgent
+from src.agents.strategy import StrategyAgent
+from src.agents.supervisor import SupervisorAgent
+from src.agents.writer import WriterAgent
+from src.models.state import create_initial_state
+from src.utils.text_processing import TweetStreamParser, extract_tweets_from_content
+from src.utils.topic_index import TopicIndex, minhash, topic_terms
+from src.utils.tracing import trace_run
+from src.workflow.batch import percentile
+from src.workflow.thread_workflow import create_thread_workflow
+from src.workflow.variants import MAX_VARIANTS, variant_run_config
+
+from .fakes import AsyncFakeTavilyClient, FakeChatModel, FakeTavilyClient, LatencyDistribution
+
+
+SUITES = ("end_to_end", "agents", "parsing", "scaling", "similarity", "imports")
+
+# Modules timed by the imports suite: the Streamlit entry point and every src subpackage
+IMPORT_TARGETS = ("app", "src.models", "src.utils", "src.agents", "src.workflow", "src.ui", "src.service")
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Metrics compared against a baseline, and whether higher values are better
+COMPARED_METRICS = {
+    "latency_p50": False,
+    "latency_p95": False,
+    "calls_per_second": True,
+    "runs_per_second": True
+}
+
+
+def latency_stats(samples: List[float]) -> Dict:
+    """
+    Summarize latency samples in seconds.
+    
+    Args:
+        samples (List[float]): Latencies
+    
+    Returns:
+        Dict: Count, mean, min, max and nearest-rank p50/p95/p99
+    """
+    return {
+        "n": len(samples),
+        "latency_mean": sum(samples) / len(samples) if samples else None,
+        "latency_min": min(samples, default=None),
+        "latency_p50": percentile(samples, 50),
+        "latency_p95": percentile(samples, 95),
+        "latency_p99": percentile(samples, 99),
+        "latency_max": max(samples, default=None)
+    }
+
+
+def _initial_state(i: int, args) -> Dict:
+    return create_initial_state(f"Benchmark topic {i}", "Professional", 5, 35, {
+        "bypass_cache": True,
+        "variants": args.variants,
+        "variant_concurrency": args.variant_concurrency
+    })
+
+
+def _run_config(args) -> Dict:
+    return variant_run_config({}, {"variant_concurrency": args.variant_concurrency})
+
+
+def _fakes(args, seed: int, async_search: bool = False) -> Tuple[FakeChatModel, FakeTavilyClient]:
+    llm = FakeChatModel(latency=LatencyDistribution.parse(args.llm_latency, seed=seed),
+                        revision_rate=args.revision_rate)
+    search_type = AsyncFakeTavilyClient if async_search else FakeTavilyClient
+    return llm, search_type(latency=LatencyDistribution.parse(args.search_latency, seed=seed + 1))
+
+
+def _workflow(args, seed: int, async_search: bool = False):
+    llm, search_client = _fakes(args, seed, async_search)
+    return create_thread_workflow(llm=llm, search_client=search_client,
+                                  speculative_analytics=args.speculative_analytics)
+
+
+def bench_end_to_end(args) -> Dict:
+    """Time sequential full runs and break them down by agent."""
+    workflow = _workflow(args, args.seed)
+    samples = []
+    tokens = []
+    agent_seconds = {}
+    
+    for i in range(args.runs):
+        with trace_run() as trace:
+            started = time.perf_counter()
+            workflow.invoke(_initial_state(i, args), _run_config(args))
+            samples.append(time.perf_counter() - started)
+        summary = trace.summary()
+        tokens.append(summary["prompt_tokens"] + summary["completion_tokens"])
+        for agent, stats in summary["agents"].items():
+            agent_seconds.setdefault(agent, []).append(stats["wall_time"])
+    
+    return {
+        **latency_stats(samples),
+        "tokens_mean": sum(tokens) / len(tokens) if tokens else None,
+        "agents": {agent: latency_stats(seconds) for agent, seconds in agent_seconds.items()}
+    }
+
+
+def bench_agents(args) -> Dict:
+    """Time each agent called directly on a state prepared by one full run."""
+    llm, search_client = _fakes(args, args.seed)
+    state = dict(_workflow(args, args.seed).invoke(_initial_state(0, args), _run_config(args)))
+    state.update({"needs_revision": False, "iteration_count": 0})
+    
+    agents = {
+        "research": ResearchAgent(llm, search_client=search_client),
+        "strategy": StrategyAgent(llm),
+        "writer": WriterAgent(llm),
+        "editor": EditorAgent(llm),
+        "supervisor": SupervisorAgent(llm),
+        "analytics": AnalyticsAgent(llm)
+    }
+    
+    results = {}
+    for name, agent in agents.items():
+        samples = []
+        for _ in range(args.runs):
+            started = time.perf_counter()
+            agent(dict(state))
+            samples.append(time.perf_counter() - started)
+        results[name] = latency_stats(samples)
+    return results
+
+
+def bench_parsing(args) -> Dict:
+    """Measure tweet extraction throughput on whole outputs and on streamed chunks."""
+    def streamed(content: str, count: int):
+        parser = TweetStreamParser(count)
+        for start in range(0, len(content), 16):
+            parser.feed(content[start:start + 16])
+        parser.close()
+    
+    results = {}
+    for count in (5, 25, 100):
+        numbered = "\n".join(f"{i}. Tweet {i} with a concrete example and an emoji 🚀" for i in range(1, count + 1))
+        malformed = " ".join(f"Sentence {i} without numbering." for i in range(1, count + 1))
+        for shape, content, parse in (("numbered", numbered, extract_tweets_from_content),
+                                      ("malformed", malformed, extract_tweets_from_content),
+                                      ("streamed", numbered, streamed)):
+            started = time.perf_counter()
+            for _ in range(args.parse_iterations):
+                parse(content, count)
+            elapsed = time.perf_counter() - started
+            results[f"{shape}_{count}"] = {
+                "calls_per_second": args.parse_iterations / elapsed,
+                "megabytes_per_second": args.parse_iterations * len(content.encode("utf-8")) / elapsed / 1e6
+            }
+    return results
+
+
+def bench_scaling(args) -> Dict:
+    """Run ``sessions`` concurrent generations on one event loop for each level."""
+    results = {}
+    sessions = 1
+    while sessions <= args.max_sessions:
+        workflow = _workflow(args, args.seed, async_search=True)
+        
+        async def session(i: int) -> float:
+            started = time.perf_counter()
+            await workflow.ainvoke(_initial_state(i, args), _run_config(args))
+            return time.perf_counter() - started
+        
+        async def level() -> List[float]:
+            return await asyncio.gather(*(session(i) for i in range(sessions)))
+        
+        started = time.perf_counter()
+        samples = asyncio.run(level())
+        wall_time = time.perf_counter() - started
+        results[str(sessions)] = {
+            **latency_stats(samples),
+            "wall_time": wall_time,
+            "runs_per_second": sessions / wall_time
+        }
+        print(f"scaling: {sessions} sessions, {sessions / wall_time:.1f} runs/s", file=sys.stderr)
+        sessions *= 2
+    return results
+
+
+def bench_similarity(args) -> Dict:
+    """Measure near-duplicate topic lookups against a large prebuilt index."""
+    rng = random.Random(args.seed)
+    vocabulary = [f"term{i}" for i in range(20000)]
+    topics = [" ".join(rng.sample(vocabulary, rng.randint(2, 6))) for _ in range(args.topic_index_size)]
+    
+    index = TopicIndex(os.path.join(tempfile.mkdtemp(prefix="tweetcraft-bench-"), "topics.sqlite3"),
+                       max_entries=args.topic_index_size)
+    now = time.time()
+    conn = index._connect()
+    with conn:
+        conn.executemany(
+            "INSERT INTO topic_index (topic, style, signature, research, created_at) VALUES (?, ?, ?, ?, ?)",
+            ((topic, "Professional", minhash(topic_terms(topic)).tobytes(), "research", now) for topic in topics)
+        )
+    
+    # The first lookup loads and sorts every stored signature
+    started = time.perf_counter()
+    index.find("warm up", "Professional")
+    load_seconds = time.perf_counter() - started
+    
+    results = {"entries": args.topic_index_size, "load_seconds": load_seconds}
+    queries = {
+        # Reworded variants of stored topics, which should match
+        "near_duplicate": [f"the future of {rng.choice(topics)}" for _ in range(args.runs * 10)],
+        # Unrelated topics, which should not
+        "unrelated": [" ".join(rng.sample(vocabulary, 3)) + " novelty" for _ in range(args.runs * 10)]
+    }
+    for name, batch in queries.items():
+        latencies, hits = [], 0
+        for query in batch:
+            started = time.perf_counter()
+            hits += index.find(query, "Professional") is not None
+            latencies.append(time.perf_counter() - started)
+        results[name] = {
+            **latency_stats(latencies),
+            "calls_per_second": len(batch) / sum(latencies),
+            "hit_rate": hits / len(batch)
+        }
+    return results
+
+
+def _import_profile(target: str) -> Dict[str, Tuple[int, int]]:
+    """
+    Import a module in a fresh interpreter under ``-X importtime``.
+    
+    Args:
+        target (str): Module to import
+    
+    Returns:
+        Dict[str, Tuple[int, int]]: Self and cumulative microseconds per imported module
+    """
+    env = {**os.environ, "PYTHONPATH": REPO_ROOT, "PYTHONHASHSEED": "0", "TWEETCRAFT_PREWARM": "0"}
+    stderr = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {target}"],
+                            capture_output=True, text=True, check=True, cwd=REPO_ROOT, env=env).stderr
+    profile = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        profile[name.strip()] = (int(self_us), int(cumulative_us))
+    return profile
+
+
+def bench_imports(args) -> Dict:
+    """Measure cold import time of the app and each subpackage, with the heaviest packages behind it."""
+    results = {}
+    for target in IMPORT_TARGETS:
+        # The first import also writes bytecode caches, so it isn't timed
+        _import_profile(target)
+        samples = []
+        for _ in range(args.import_repeats):
+            profile = _import_profile(target)
+            samples.append(profile[target][1] / 1e6)
+        
+        # Self time grouped by top-level package shows which dependencies the import drags in
+        packages = {}
+        for name, (self_us, _) in profile.items():
+            package = name.split(".")[0]
+            packages[package] = packages.get(package, 0) + self_us
+        heaviest = sorted(packages.items(), key=lambda item: item[1], reverse=True)[:10]
+        results[target] = {
+            **latency_stats(samples),
+            "modules": len(profile),
+            "heaviest_packages": {package: us / 1e6 for package, us in heaviest}
+        }
+    return results
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                              check=True, cwd=os.path.dirname(__file__)).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _flatten(results: Dict, prefix: str = "") -> Dict[str, float]:
+    """Flatten nested results into ``suite/.../metric`` keys for the compared metrics."""
+    flat = {}
+    for key, value in results.items():
+        path = f"{prefix}/{key}" if prefix else key
+        if isinstance(value, dict):
+            flat.update(_flatten(value, path))
+        elif key in COMPARED_METRICS and value is not None:
+            flat[path] = value
+    return flat
+
+
+def compare(results: Dict, baseline: Dict, tolerance: float) -> List[Dict]:
+    """
+    Find metrics that regressed against a baseline.
+    
+    Args:
+        results (Dict): Current suite results
+        baseline (Dict): Suite results from an earlier run
+        tolerance (float): Allowed relative change, e.g. 0.15 for 15%
+    
+    Returns:
+        List[Dict]: One entry per regressed metric
+    """
+    current = _flatten(results)
+    regressions = []
+    for path, previous in _flatten(baseline).items():
+        if path not in current or not previous:
+            continue
+        change = (current[path] - previous) / previous
+        higher_is_better = COMPARED_METRICS[path.rsplit("/", 1)[1]]
+        if (-change if higher_is_better else change) > tolerance:
+            regressions.append({"metric": path, "baseline": previous, "current": current[path], "change": change})
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark the TweetCraft workflow with fake LLM and search backends.")
+    parser.add_argument("--suite", choices=SUITES, action="append",
+                        help="Suite to run; repeat for several (default: all)")
+    parser.add_argument("--output", default="benchmark_results.json", help="Where to write the JSON results")
+    parser.add_argument("--llm-latency", default="constant:0.05",
+                        help="Per-call LLM latency, e.g. constant:0.5, uniform:0.3,1.2, lognormal:0.8,0.4")
+    parser.add_argument("--search-latency", default="constant:0.02", help="Per-query search latency")
+    parser.add_argument("--revision-rate", type=float, default=0.0,
+                        help="Fraction of threads the fake supervisor sends back for revision")
+    parser.add_argument("--speculative-analytics", action="store_true",
+                        help="Run analytics alongside the supervisor")
+    parser.add_argument("--variants", type=int, default=1, choices=range(1, MAX_VARIANTS + 1),
+                        help="Parallel thread variants per run (best-of-N instead of revision loops)")
+    parser.add_argument("--variant-concurrency", type=int, default=None,
+                        help="Variant branches allowed to run at the same time")
+    parser.add_argument("--runs", type=int, default=20, help="Runs per end-to-end and agent benchmark")
+    parser.add_argument("--parse-iterations", type=int, default=2000, help="Calls per parsing benchmark")
+    parser.add_argument("--max-sessions", type=int, default=256, help="Largest concurrent session count")
+    parser.add_argument("--topic-index-size", type=int, default=100000,
+                        help="Stored topics for the similarity benchmark")
+    parser.add_argument("--import-repeats", type=int, default=5,
+                        help="Fresh interpreters per module in the imports benchmark")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the latency distributions")
+    parser.add_argument("--baseline", help="Earlier results file to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.15,
+                        help="Relative change tolerated before a metric counts as a regression")
+    args = parser.parse_args(argv)
+    
+    suites = {
+        "end_to_end": bench_end_to_end,
+        "agents": bench_agents,
+        "parsing": bench_parsing,
+        "scaling": bench_scaling,
+        "similarity": bench_similarity,
+        "imports": bench_imports
+    }
+    results = {}
+    for name in args.suite or SUITES:
+        print(f"Running {name}...", file=sys.stderr)
+        results[name] = suites[name](args)
+    
+    report = {
+        "metadata": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "git_commit": _git_commit(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "config": {key: value for key, value in vars(args).items() if key not in ("output", "baseline")}
+        },
+        "results": results
+    }
+    
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            report["regressions"] = compare(results, json.load(f)["results"], args.tolerance)
+        for regression in report["regressions"]:
+            print(f"REGRESSION {regression['metric']}: {regression['baseline']:.4g} -> "
+                  f"{regression['current']:.4g} ({regression['change']:+.1%})", file=sys.stderr)
+        exit_code = 1 if report["regressions"] else 0
+    
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {args.output}", file=sys.stderr)
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
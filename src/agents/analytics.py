@@ -2,37 +2,37 @@
 Analytics Agent - Provides engagement insights and recommendations.
 """
 
-import json
-from langchain_core.messages import HumanMessage, SystemMessage
+from typing import List, Optional
 
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
+
+from ..models.outputs import AnalyticsInsights
 from ..models.state import ThreadGenerationState
+from ..utils.structured_output import ainvoke_structured, invoke_structured
+
+
+# Completion cap for the insights JSON; the prompt asks for short entries
+MAX_ANALYTICS_TOKENS = 350
 
 
 class AnalyticsAgent:
     """📊 Provides engagement insights and recommendations"""
     
-    def __init__(self, llm):
+    def __init__(self, llm, structured_output: bool = True):
         """
         Initialize the Analytics Agent.
         
         Args:
             llm: Language model instance
+            structured_output (bool): Constrain replies with a JSON schema; turn off for models
+                without structured output support (replies are still parsed as JSON)
         """
         self.llm = llm
+        self.structured_output = structured_output
     
-    def __call__(self, state: ThreadGenerationState) -> ThreadGenerationState:
-        """
-        Execute analytics phase of the workflow.
-        
-        Args:
-            state (ThreadGenerationState): Current workflow state
-            
-        Returns:
-            ThreadGenerationState: Updated state with analytics insights
-        """
+    def _build_messages(self, state: ThreadGenerationState) -> List[BaseMessage]:
+        """Build the engagement analysis prompt."""
         polished_tweets = state["polished_tweets"]
-        topic = state["topic"]
-        style = state["style"]
         
         analytics_prompt = f"""
         Analyze this tweet thread for engagement optimization:
@@ -40,28 +40,58 @@ class AnalyticsAgent:
         {chr(10).join([f"{i+1}. {tweet}" for i, tweet in enumerate(polished_tweets)])}
         
         Provide insights on:
-        1. Best posting times
-        2. Hashtag recommendations (3-5 relevant hashtags)
+        1. Best posting times (up to 3)
+        2. Hashtag recommendations (3-5 relevant hashtags, without the # sign)
         3. Engagement prediction (estimated likes, retweets, replies)
-        4. Target audience analysis
-        5. Optimization suggestions
+        4. Target audience analysis (one sentence)
+        5. Optimization suggestions (up to 3, each under 15 words)
         
-        Format as JSON with keys: posting_times, hashtags, engagement_prediction, target_audience, optimization_tips
+        Reply with JSON only:
+        {{"posting_times": ["..."], "hashtags": ["..."], "engagement_prediction": {{"likes": 0, "retweets": 0, "replies": 0}}, "target_audience": "...", "optimization_tips": ["..."]}}
         """
         
-        analytics_response = self.llm.invoke([
+        return [
             SystemMessage(content="You are a social media analytics expert who provides data-driven insights."),
             HumanMessage(content=analytics_prompt)
-        ]).content
-        
-        # Try to parse JSON, fallback to text if needed
-        try:
-            analytics_data = json.loads(analytics_response)
-        except:
-            analytics_data = {"raw_insights": analytics_response}
+        ]
+    
+    def _process(self, state: ThreadGenerationState, insights: Optional[AnalyticsInsights],
+                 analytics_response: str) -> ThreadGenerationState:
+        """Store the parsed insights, or the raw reply if it never matched the schema."""
+        analytics_data = insights.model_dump() if insights else {"raw_insights": analytics_response}
         
         return {
             **state,
             "analytics_insights": analytics_data,
             "current_agent": "complete"
-        }
\ No newline at end of file
+        }
+    
+    def __call__(self, state: ThreadGenerationState) -> ThreadGenerationState:
+        """
+        Execute analytics phase of the workflow.
+        
+        Args:
+            state (ThreadGenerationState): Current workflow state
+        
+        Returns:
+            ThreadGenerationState: Updated state with analytics insights
+        """
+        insights, analytics_response = invoke_structured(
+            self.llm, self._build_messages(state), AnalyticsInsights, MAX_ANALYTICS_TOKENS, self.structured_output
+        )
+        return self._process(state, insights, analytics_response)
+    
+    async def acall(self, state: ThreadGenerationState) -> ThreadGenerationState:
+        """
+        Execute analytics phase of the workflow without blocking the event loop.
+        
+        Args:
+            state (ThreadGenerationState): Current workflow state
+        
+        Returns:
+            ThreadGenerationState: Updated state with analytics insights
+        """
+        insights, analytics_response = await ainvoke_structured(
+            self.llm, self._build_messages(state), AnalyticsInsights, MAX_ANALYTICS_TOKENS, self.structured_output
+        )
+        return self._process(state, insights, analytics_response)
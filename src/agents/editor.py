@@ -2,10 +2,12 @@
 Editor Agent - Polishes and optimizes the tweets.
 """
 
-from langchain_core.messages import HumanMessage, SystemMessage
+from typing import List
+
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
 
 from ..models.state import ThreadGenerationState
-from ..utils.text_processing import extract_tweets_from_content
+from ..utils.text_processing import extract_numbered_tweets, parse_tweets
 
 
 class EditorAgent:
@@ -20,24 +22,17 @@ class EditorAgent:
         """
         self.llm = llm
     
-    def __call__(self, state: ThreadGenerationState) -> ThreadGenerationState:
-        """
-        Execute editing phase of the workflow.
-        
-        Args:
-            state (ThreadGenerationState): Current workflow state
-            
-        Returns:
-            ThreadGenerationState: Updated state with polished tweets
-        """
+    def _build_messages(self, state: ThreadGenerationState) -> List[BaseMessage]:
+        """Build the editing prompt; a targeted revision only sends the rewritten tweets."""
         draft_tweets = state["draft_tweets"]
         style = state["style"]
         word_limit = state["word_limit"]
+        targets = state.get("revision_targets") or range(len(draft_tweets))
         
         editing_prompt = f"""
         Polish these draft tweets to perfection:
         
-        {chr(10).join([f"{i+1}. {tweet}" for i, tweet in enumerate(draft_tweets)])}
+        {chr(10).join([f"{i+1}. {draft_tweets[i]}" for i in targets])}
         
         EDITING GOALS:
         - Ensure each tweet is under {word_limit} words
@@ -50,16 +45,56 @@ class EditorAgent:
         Return the polished tweets in the same numbered format.
         """
         
-        polished_content = self.llm.invoke([
+        return [
             SystemMessage(content="You are a master editor who perfects social media content for maximum impact and engagement."),
             HumanMessage(content=editing_prompt)
-        ]).content
+        ]
+    
+    def _process(self, state: ThreadGenerationState, polished_content: str) -> ThreadGenerationState:
+        """Extract the polished tweets from the model's output."""
+        targets = state.get("revision_targets")
         
-        # Extract polished tweets
-        polished_tweets = extract_tweets_from_content(polished_content, len(draft_tweets))
+        if targets:
+            # Tweets outside the revision were already polished and approved
+            edited = extract_numbered_tweets(polished_content)
+            polished_tweets = [edited.get(i + 1, tweet) if i in targets else state["polished_tweets"][i]
+                               for i, tweet in enumerate(state["draft_tweets"])]
+            issues = [f"Editor: tweet {i + 1} was not edited" for i in targets if i + 1 not in edited]
+        else:
+            # Extract polished tweets
+            polished_tweets, issues = parse_tweets(polished_content, len(state["draft_tweets"]))
+            polished_tweets = polished_tweets[:len(state["draft_tweets"])]
+            issues = [f"Editor: {issue}" for issue in issues]
         
         return {
             **state,
             "polished_tweets": polished_tweets,
+            "parse_issues": (state.get("parse_issues") or []) + issues,
             "current_agent": "supervisor"
-        }
\ No newline at end of file
+        }
+    
+    def __call__(self, state: ThreadGenerationState) -> ThreadGenerationState:
+        """
+        Execute editing phase of the workflow.
+        
+        Args:
+            state (ThreadGenerationState): Current workflow state
+            
+        Returns:
+            ThreadGenerationState: Updated state with polished tweets
+        """
+        polished_content = self.llm.invoke(self._build_messages(state)).content
+        return self._process(state, polished_content)
+    
+    async def acall(self, state: ThreadGenerationState) -> ThreadGenerationState:
+        """
+        Execute editing phase of the workflow without blocking the event loop.
+        
+        Args:
+            state (ThreadGenerationState): Current workflow state
+            
+        Returns:
+            ThreadGenerationState: Updated state with polished tweets
+        """
+        polished_content = (await self.llm.ainvoke(self._build_messages(state))).content
+        return self._process(state, polished_content)
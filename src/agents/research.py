@@ -2,73 +2,316 @@
 Research Agent - Gathers comprehensive information about the topic.
 """
 
-import streamlit as st
-from tavily import TavilyClient
-from langchain_core.messages import HumanMessage, SystemMessage
+import asyncio
+import time
+import math
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, List, Optional, Set, Tuple
+
+from tavily import AsyncTavilyClient, TavilyClient
+from tavily.errors import InvalidAPIKeyError
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
 
 from ..models.state import ThreadGenerationState
+from ..utils.api_keys import invalidate_api_key
+from ..utils.credentials import client_pool, fingerprint, get_credential, loop_client_pool
+from ..utils.events import report_notice
+from ..utils.rate_limit import get_rate_limiter, rate_limited_search_client
+from ..utils.research_cache import ResearchCache
+from ..utils.research_context import build_research_context
+from ..utils.tracing import record_span
 
 
 class ResearchAgent:
     """🔍 Gathers comprehensive information about the topic"""
     
-    def __init__(self, llm, tavily_api_key: str):
+    def __init__(self, llm, tavily_api_key: Optional[str] = None, concurrent: bool = True,
+                 max_workers: int = 4, query_timeout: float = 20.0,
+                 cache: Optional[ResearchCache] = None, context_token_budget: int = 1500,
+                 search_client=None):
         """
         Initialize the Research Agent.
         
         Args:
             llm: Language model instance
-            tavily_api_key (str): Tavily API key for web search
+            tavily_api_key (Optional[str]): Default Tavily API key, overridden per run by
+                ``config["configurable"]["tavily_api_key"]``
+            concurrent (bool): Run the search queries in parallel instead of one after another
+            max_workers (int): Upper bound on simultaneous search requests
+            query_timeout (float): Seconds a query may run, counted from when it starts, before it is dropped
+            cache (Optional[ResearchCache]): Persistent cache for searches and summaries
+            context_token_budget (int): Token budget for search results in the synthesis prompt
+            search_client: Client with a Tavily-compatible ``search`` used instead of the pooled
+                Tavily clients, e.g. a local stand-in
         """
         self.llm = llm
         self.tavily_api_key = tavily_api_key
+        self.concurrent = concurrent
+        self.max_workers = max_workers
+        self.query_timeout = query_timeout
+        self.cache = cache
+        self.context_token_budget = context_token_budget
+        self.search_client = search_client
     
-    def __call__(self, state: ThreadGenerationState) -> ThreadGenerationState:
-        """
-        Execute research phase of the workflow.
-        
-        Args:
-            state (ThreadGenerationState): Current workflow state
-            
-        Returns:
-            ThreadGenerationState: Updated state with research data
-        """
-        topic = state["topic"]
-        style = state["style"]
-        
-        # Multi-angle research queries
-        search_queries = [
+    def _search_queries(self, topic: str) -> List[str]:
+        """Multi-angle research queries for a topic."""
+        return [
             f"{topic} latest trends 2025",
             f"{topic} statistics facts data",
             f"{topic} expert opinions insights",
             f"{topic} case studies examples"
         ]
+    
+    def _use_cache(self, state: ThreadGenerationState) -> bool:
+        return bool(self.cache) and not state.get("customizations", {}).get("bypass_cache", False)
+    
+    def _cached_research(self, state: ThreadGenerationState) -> Optional[ThreadGenerationState]:
+        """Return the finished state if this topic, or a near-duplicate of it, was researched recently."""
+        if not self._use_cache(state):
+            return None
+        
+        started = time.perf_counter()
+        research_metrics = {"mode": "cached", "wall_time": 0.0, "queries": []}
+        cached_research = self.cache.get_research(state["topic"], state["style"])
+        
+        # A reworded topic ("the future of AI in healthcare" after "AI in healthcare") reuses its twin's research
+        if cached_research is None and state.get("customizations", {}).get("reuse_similar_research", True):
+            match = self.cache.find_similar_research(state["topic"], state["style"])
+            if match is not None:
+                cached_research = match["research"]
+                research_metrics.update(mode="similar", similar_topic=match["topic"], similarity=match["similarity"])
         
+        if cached_research is None:
+            return None
+        
+        research_metrics["wall_time"] = time.perf_counter() - started
+        return {
+            **state,
+            "research_data": cached_research,
+            "research_metrics": research_metrics,
+            "current_agent": "strategy"
+        }
+    
+    def _unavailable(self, state: ThreadGenerationState, error: Exception) -> ThreadGenerationState:
+        """State returned when the search client can't be created."""
+        report_notice("error", f"Tavily client initialization failed: {str(error)}")
+        return {
+            **state,
+            "research_data": "Research unavailable due to API error",
+            "current_agent": "strategy"
+        }
+    
+    def _cached_searches(self, search_queries: List[str], use_cache: bool) -> Tuple[Dict, Set[str]]:
+        """Serve whichever queries the cache already has."""
+        outcomes = {}
+        if use_cache:
+            for query in search_queries:
+                cached = self.cache.get_search(query)
+                if cached is not None:
+                    outcomes[query] = (cached, 0.0, None)
+        return outcomes, set(outcomes)
+    
+    def _merge_outcomes(self, search_queries: List[str], outcomes: Dict, cached_queries: Set[str],
+                        started: float) -> Tuple[List[Dict], Dict]:
+        """
+        Merge per-query outcomes in query order and cache fresh results.
+        
+        Args:
+            search_queries (List[str]): Queries in their original order
+            outcomes (Dict): Query to (results, latency, error), the error being an exception or message
+            cached_queries (Set[str]): Queries served from the cache
+            started (float): ``perf_counter`` value when searching started
+        
+        Returns:
+            Tuple containing: merged results, per-query metrics
+        """
         research_results = []
+        queries = []
+        key_rejected = False
+        for query in search_queries:
+            results, latency, error = outcomes[query]
+            key_rejected = key_rejected or isinstance(error, InvalidAPIKeyError)
+            error = None if error is None else str(error)
+            research_results.extend(results)
+            if self.cache and error is None and query not in cached_queries:
+                self.cache.set_search(query, results)
+            record_span("search", name=query, duration=latency or 0.0,
+                        cached=query in cached_queries, error=error)
+            queries.append({
+                "query": query,
+                "latency": latency,
+                "num_results": len(results),
+                "cached": query in cached_queries,
+                "error": error
+            })
         
-        # Initialize Tavily client
-        try:
-            tavily_client = TavilyClient(api_key=self.tavily_api_key)
+        # Mode describes how the searches that actually ran were run
+        searched = [query for query in search_queries if query not in cached_queries]
+        if not searched:
+            mode = "cached"
+        elif self.concurrent and len(searched) > 1:
+            mode = "concurrent"
+        else:
+            mode = "sequential"
+        
+        metrics = {
+            "mode": mode,
+            "wall_time": time.perf_counter() - started,
+            "queries": queries
+        }
+        if key_rejected:
+            # Make the next key check hit Tavily again instead of trusting its cached result
+            invalidate_api_key("tavily", get_credential("tavily_api_key", self.tavily_api_key))
+            metrics["invalid_api_key"] = True
+        return research_results, metrics
+    
+    def _search(self, tavily_client: TavilyClient, query: str) -> Tuple[List[Dict], float]:
+        """
+        Run a single search query and time it.
+        
+        Args:
+            tavily_client (TavilyClient): Initialized Tavily client
+            query (str): Search query
+        
+        Returns:
+            Tuple containing: results, latency in seconds
+        """
+        started = time.perf_counter()
+        results = tavily_client.search(query, max_results=3, timeout=self.query_timeout)
+        return results.get('results', []), time.perf_counter() - started
+    
+    async def _asearch(self, tavily_client: AsyncTavilyClient, query: str) -> Tuple[List[Dict], float]:
+        """Async variant of ``_search``; synchronous clients are run on a worker thread."""
+        started = time.perf_counter()
+        if asyncio.iscoroutinefunction(tavily_client.search):
+            results = await tavily_client.search(query, max_results=3, timeout=self.query_timeout)
+        else:
+            results = await asyncio.to_thread(tavily_client.search, query, max_results=3, timeout=self.query_timeout)
+        return results.get('results', []), time.perf_counter() - started
+    
+    def _run_searches(self, tavily_client: TavilyClient, search_queries: List[str],
+                      use_cache: bool = True) -> Tuple[List[Dict], Dict]:
+        """
+        Run all search queries, sequentially or on a bounded thread pool.
+        
+        Results are merged in the order of ``search_queries`` regardless of
+        completion order, and a failed or timed out query only drops its own
+        results. Each query gets ``query_timeout`` from when a worker picks it
+        up, so queries queued behind slow ones aren't cut short.
+        
+        Args:
+            tavily_client (TavilyClient): Initialized Tavily client
+            search_queries (List[str]): Queries to run
+            use_cache (bool): Serve queries from the cache when possible
+        
+        Returns:
+            Tuple containing: merged results, per-query metrics
+        """
+        started = time.perf_counter()
+        outcomes, cached_queries = self._cached_searches(search_queries, use_cache)
+        pending = [query for query in search_queries if query not in outcomes]
+        
+        if self.concurrent and len(pending) > 1:
+            workers = max(1, min(self.max_workers, len(pending)))
+            executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tweetcraft-research")
+            query_started = {}
             
-            for query in search_queries:
+            def timed_search(query: str) -> Tuple[List[Dict], float]:
+                query_started[query] = time.perf_counter()
+                return self._search(tavily_client, query)
+            
+            # Backstop for queries that never get a worker: every round of queries taking the full timeout
+            rounds = math.ceil(len(pending) / workers)
+            deadline = time.perf_counter() + self.query_timeout * rounds
+            try:
+                running = {query: executor.submit(timed_search, query) for query in pending}
+                while running:
+                    now = time.perf_counter()
+                    for query, future in list(running.items()):
+                        if future.done():
+                            del running[query]
+                            if future.exception() is not None:
+                                outcomes[query] = ([], None, future.exception())
+                            else:
+                                results, latency = future.result()
+                                outcomes[query] = (results, latency, None)
+                        elif now >= query_started.get(query, math.inf) + self.query_timeout or now >= deadline:
+                            del running[query]
+                            future.cancel()
+                            outcomes[query] = ([], None, f"timed out after {self.query_timeout}s")
+                    
+                    if running:
+                        next_deadline = min([deadline] + [query_started[query] + self.query_timeout
+                                                           for query in running if query in query_started])
+                        wait(running.values(), timeout=max(0.0, next_deadline - now), return_when=FIRST_COMPLETED)
+            finally:
+                # Don't block on queries that already blew their timeout
+                executor.shutdown(wait=False, cancel_futures=True)
+        else:
+            for query in pending:
                 try:
-                    results = tavily_client.search(query, max_results=3)
-                    research_results.extend(results.get('results', []))
+                    results, latency = self._search(tavily_client, query)
+                    outcomes[query] = (results, latency, None)
                 except Exception as e:
-                    st.warning(f"Search failed for: {query}")
-        except Exception as e:
-            st.error(f"Tavily client initialization failed: {str(e)}")
-            return {
-                **state,
-                "research_data": "Research unavailable due to API error",
-                "current_agent": "strategy"
-            }
+                    outcomes[query] = ([], None, e)
+        
+        return self._merge_outcomes(search_queries, outcomes, cached_queries, started)
+    
+    async def _arun_searches(self, tavily_client: AsyncTavilyClient, search_queries: List[str],
+                             use_cache: bool = True) -> Tuple[List[Dict], Dict]:
+        """
+        Async variant of ``_run_searches``, fanning out with ``asyncio.gather``.
+        
+        Args:
+            tavily_client (AsyncTavilyClient): Initialized async Tavily client
+            search_queries (List[str]): Queries to run
+            use_cache (bool): Serve queries from the cache when possible
+        
+        Returns:
+            Tuple containing: merged results, per-query metrics
+        """
+        started = time.perf_counter()
+        outcomes, cached_queries = self._cached_searches(search_queries, use_cache)
+        pending = [query for query in search_queries if query not in outcomes]
+        
+        semaphore = asyncio.Semaphore(self.max_workers if self.concurrent else 1)
+        
+        async def bounded_search(query: str) -> Tuple[List[Dict], float]:
+            async with semaphore:
+                return await asyncio.wait_for(self._asearch(tavily_client, query), self.query_timeout)
+        
+        results = await asyncio.gather(*(bounded_search(query) for query in pending), return_exceptions=True)
+        for query, result in zip(pending, results):
+            if isinstance(result, asyncio.TimeoutError):
+                outcomes[query] = ([], None, f"timed out after {self.query_timeout}s")
+            elif isinstance(result, BaseException):
+                outcomes[query] = ([], None, result)
+            else:
+                outcomes[query] = (result[0], result[1], None)
+        
+        return self._merge_outcomes(search_queries, outcomes, cached_queries, started)
+    
+    def _build_messages(self, state: ThreadGenerationState, research_results: List[Dict],
+                        research_metrics: Dict) -> List[BaseMessage]:
+        """Build the synthesis prompt, reporting any failed searches."""
+        topic = state["topic"]
+        style = state["style"]
+        
+        # Reported from the node's thread so the run's event listener receives them
+        for query_metrics in research_metrics["queries"]:
+            if query_metrics["error"]:
+                report_notice("warning", f"Search failed for: {query_metrics['query']}")
+        
+        # Compact, deduplicated sources instead of the raw result dicts
+        research_context, context_stats = build_research_context(research_results, self.context_token_budget)
+        research_metrics["context"] = context_stats
         
         # Synthesize research with LLM
         synthesis_prompt = f"""
         Analyze this research data about "{topic}" and create a comprehensive summary:
         
-        Research Results: {research_results}
+        Research Results:
+        {research_context}
         
         Please provide:
         1. Key facts and statistics
@@ -81,13 +324,87 @@ class ResearchAgent:
         Focus on information that would work well for that style.
         """
         
-        research_summary = self.llm.invoke([
+        return [
             SystemMessage(content="You are an expert researcher who synthesizes information clearly and comprehensively."),
             HumanMessage(content=synthesis_prompt)
-        ]).content
+        ]
+    
+    def _process(self, state: ThreadGenerationState, research_summary: str,
+                 research_metrics: Dict) -> ThreadGenerationState:
+        """Cache and apply the research summary."""
+        # Only cache summaries built from a complete set of searches
+        if self.cache and not any(query["error"] for query in research_metrics["queries"]):
+            self.cache.set_research(state["topic"], state["style"], research_summary)
         
         return {
             **state,
             "research_data": research_summary,
+            "research_metrics": research_metrics,
             "current_agent": "strategy"
-        }
\ No newline at end of file
+        }
+    
+    def __call__(self, state: ThreadGenerationState) -> ThreadGenerationState:
+        """
+        Execute research phase of the workflow.
+        
+        Args:
+            state (ThreadGenerationState): Current workflow state
+        
+        Returns:
+            ThreadGenerationState: Updated state with research data
+        """
+        cached_state = self._cached_research(state)
+        if cached_state is not None:
+            return cached_state
+        
+        # Reuse the pooled Tavily client for this run's key
+        tavily_api_key = get_credential("tavily_api_key", self.tavily_api_key)
+        try:
+            tavily_client = self.search_client or client_pool.get(
+                ("tavily", fingerprint(tavily_api_key)),
+                lambda: rate_limited_search_client(TavilyClient(api_key=tavily_api_key), get_rate_limiter("tavily"))
+            )
+        except Exception as e:
+            return self._unavailable(state, e)
+        
+        research_results, research_metrics = self._run_searches(
+            tavily_client, self._search_queries(state["topic"]), self._use_cache(state)
+        )
+        
+        research_summary = self.llm.invoke(
+            self._build_messages(state, research_results, research_metrics)
+        ).content
+        return self._process(state, research_summary, research_metrics)
+    
+    async def acall(self, state: ThreadGenerationState) -> ThreadGenerationState:
+        """
+        Execute research phase of the workflow without blocking the event loop.
+        
+        Args:
+            state (ThreadGenerationState): Current workflow state
+        
+        Returns:
+            ThreadGenerationState: Updated state with research data
+        """
+        cached_state = self._cached_research(state)
+        if cached_state is not None:
+            return cached_state
+        
+        # Async clients hold connections bound to the event loop they were created on
+        tavily_api_key = get_credential("tavily_api_key", self.tavily_api_key)
+        try:
+            tavily_client = self.search_client or loop_client_pool.get(
+                ("tavily-async", fingerprint(tavily_api_key)),
+                lambda: rate_limited_search_client(AsyncTavilyClient(api_key=tavily_api_key), get_rate_limiter("tavily"))
+            )
+        except Exception as e:
+            return self._unavailable(state, e)
+        
+        research_results, research_metrics = await self._arun_searches(
+            tavily_client, self._search_queries(state["topic"]), self._use_cache(state)
+        )
+        
+        research_summary = (await self.llm.ainvoke(
+            self._build_messages(state, research_results, research_metrics)
+        )).content
+        return self._process(state, research_summary, research_metrics)
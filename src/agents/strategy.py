@@ -2,7 +2,9 @@
 Strategy Agent - Plans the thread structure and strategy.
 """
 
-from langchain_core.messages import HumanMessage, SystemMessage
+from typing import List
+
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
 
 from ..models.state import ThreadGenerationState
 
@@ -19,16 +21,8 @@ class StrategyAgent:
         """
         self.llm = llm
     
-    def __call__(self, state: ThreadGenerationState) -> ThreadGenerationState:
-        """
-        Execute strategy planning phase of the workflow.
-        
-        Args:
-            state (ThreadGenerationState): Current workflow state
-            
-        Returns:
-            ThreadGenerationState: Updated state with strategy plan
-        """
+    def _build_messages(self, state: ThreadGenerationState) -> List[BaseMessage]:
+        """Build the strategy planning prompt."""
         research_data = state["research_data"]
         topic = state["topic"]
         style = state["style"]
@@ -52,13 +46,41 @@ class StrategyAgent:
         Format as a detailed numbered plan for each tweet.
         """
         
-        strategy_plan = self.llm.invoke([
+        return [
             SystemMessage(content="You are a viral content strategist who understands social media psychology and engagement."),
             HumanMessage(content=strategy_prompt)
-        ]).content
-        
+        ]
+    
+    def _process(self, state: ThreadGenerationState, strategy_plan: str) -> ThreadGenerationState:
+        """Apply the model's strategy plan to the state."""
         return {
             **state,
             "strategy_plan": strategy_plan,
             "current_agent": "writer"
-        }
\ No newline at end of file
+        }
+    
+    def __call__(self, state: ThreadGenerationState) -> ThreadGenerationState:
+        """
+        Execute strategy planning phase of the workflow.
+        
+        Args:
+            state (ThreadGenerationState): Current workflow state
+            
+        Returns:
+            ThreadGenerationState: Updated state with strategy plan
+        """
+        strategy_plan = self.llm.invoke(self._build_messages(state)).content
+        return self._process(state, strategy_plan)
+    
+    async def acall(self, state: ThreadGenerationState) -> ThreadGenerationState:
+        """
+        Execute strategy planning phase of the workflow without blocking the event loop.
+        
+        Args:
+            state (ThreadGenerationState): Current workflow state
+            
+        Returns:
+            ThreadGenerationState: Updated state with strategy plan
+        """
+        strategy_plan = (await self.llm.ainvoke(self._build_messages(state))).content
+        return self._process(state, strategy_plan)
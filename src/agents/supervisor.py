@@ -2,39 +2,109 @@
 Supervisor Agent - Quality control and workflow decisions.
 """
 
-import re
-from langchain_core.messages import HumanMessage, SystemMessage
+from typing import Dict, List, Optional, Tuple
 
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
+
+from ..models.outputs import ThreadEvaluation, VariantRanking
 from ..models.state import ThreadGenerationState
+from ..utils.quality_rules import check_thread
+from ..utils.structured_output import ainvoke_structured, invoke_structured
+
+
+# Tweets scoring below this are rewritten in a targeted revision
+TWEET_REVISION_THRESHOLD = 7.0
+
+# A selected variant scoring below this goes back to the writer
+VARIANT_PASS_SCORE = 7.0
+
+# Completion caps for the evaluation JSON: a fixed part plus room for each tweet or variant entry
+MAX_EVALUATION_TOKENS = 80
+MAX_TOKENS_PER_ENTRY = 40
+
+
+def _clamp_score(score: float) -> float:
+    return min(10.0, max(1.0, score))
 
 
 class SupervisorAgent:
     """🎯 Quality control and workflow decisions"""
     
-    def __init__(self, llm):
+    def __init__(self, llm, pass_threshold: Optional[float] = None, structured_output: bool = True):
         """
         Initialize the Supervisor Agent.
         
         Args:
             llm: Language model instance
+            pass_threshold (Optional[float]): Local rule score at or above which a thread is
+                approved without an LLM evaluation; None always asks the LLM
+            structured_output (bool): Constrain evaluations with a JSON schema; turn off for models
+                without structured output support (replies are still parsed as JSON)
         """
         self.llm = llm
+        self.pass_threshold = pass_threshold
+        self.structured_output = structured_output
     
-    def __call__(self, state: ThreadGenerationState) -> ThreadGenerationState:
+    def _pre_gate(self, state: ThreadGenerationState) -> Tuple[Dict, Optional[ThreadGenerationState]]:
         """
-        Execute quality control phase of the workflow.
+        Check the thread against the local rules before spending an LLM call.
         
         Args:
             state (ThreadGenerationState): Current workflow state
-            
+        
         Returns:
-            ThreadGenerationState: Updated state with quality assessment
+            Tuple[Dict, Optional[ThreadGenerationState]]: The rule check, and the updated
+            state when the rules alone decide the outcome
         """
+        tweets = state["polished_tweets"]
+        iteration_count = state.get("iteration_count", 0)
+        gate = check_thread(tweets, state["num_tweets"], state["word_limit"])
+        
+        if gate["hard_failure"] and iteration_count < 2:
+            hard = [violation for violation in gate["violations"] if violation["hard"]]
+            tweet_feedback = [None] * len(tweets)
+            for violation in hard:
+                if violation["tweet"] is not None:
+                    tweet_feedback[violation["tweet"]] = violation["message"]
+            
+            # A wrong tweet count can only be fixed by rewriting the whole thread
+            failing = gate["failing_tweets"]
+            targeted = len(tweets) == state["num_tweets"] and 0 < len(failing) < len(tweets)
+            return gate, {
+                **state,
+                "quality_score": gate["score"],
+                "quality_feedback": "; ".join([violation["message"] for violation in hard] +
+                                              (state.get("parse_issues") or [])),
+                "tweet_scores": None,
+                "tweet_feedback": tweet_feedback,
+                "quality_gate": {**gate, "decision": "revise"},
+                "revision_targets": failing if targeted else None,
+                "needs_revision": True,
+                "iteration_count": iteration_count + 1,
+                "current_agent": "writer"
+            }
+        
+        if self.pass_threshold is not None and not gate["hard_failure"] and gate["score"] >= self.pass_threshold:
+            return gate, {
+                **state,
+                "quality_score": gate["score"],
+                "quality_feedback": None,
+                "tweet_scores": None,
+                "tweet_feedback": None,
+                "quality_gate": {**gate, "decision": "pass"},
+                "revision_targets": None,
+                "needs_revision": False,
+                "current_agent": "analytics"
+            }
+        
+        return gate, None
+    
+    def _build_messages(self, state: ThreadGenerationState) -> List[BaseMessage]:
+        """Build the quality evaluation prompt."""
         polished_tweets = state["polished_tweets"]
         topic = state["topic"]
         style = state["style"]
         word_limit = state["word_limit"]
-        iteration_count = state.get("iteration_count", 0)
         
         evaluation_prompt = f"""
         Evaluate this tweet thread for quality:
@@ -53,36 +123,278 @@ class SupervisorAgent:
         4. Flow and structure (1-10)
         5. Call-to-action effectiveness (1-10)
         
-        Provide an overall score (1-10) and brief feedback.
-        If score is below 7 and iteration count < 2, recommend revision.
+        Provide an overall score (1-10) and one sentence of feedback (under 25 words).
+        If score is below 7, recommend revision.
         
-        Format: SCORE: X.X | FEEDBACK: ... | REVISION_NEEDED: Yes/No
+        Then score each tweet on its own (1-10) with specific feedback (under 12 words).
+        
+        Reply with JSON only:
+        {{"score": X.X, "feedback": "...", "revision_needed": true/false, "tweets": [{{"tweet": 1, "score": X.X, "feedback": "..."}}]}}
         """
         
-        evaluation = self.llm.invoke([
+        return [
             SystemMessage(content="You are a social media expert who evaluates content quality objectively."),
             HumanMessage(content=evaluation_prompt)
-        ]).content
+        ]
+    
+    def _evaluation_tokens(self, entries: int) -> int:
+        return MAX_EVALUATION_TOKENS + MAX_TOKENS_PER_ENTRY * entries
+    
+    def _process(self, state: ThreadGenerationState, evaluation: Optional[ThreadEvaluation],
+                 gate: Dict) -> ThreadGenerationState:
+        """Apply the evaluation and decide whether the thread goes back to the writer."""
+        iteration_count = state.get("iteration_count", 0)
+        
+        num_tweets = len(state["polished_tweets"])
+        
+        if evaluation is None:
+            # Still unparseable after the repair retry: keep the local rule score rather than
+            # sending a thread nobody actually judged back for revision
+            return {
+                **state,
+                "quality_score": gate["score"],
+                "quality_feedback": None,
+                "tweet_scores": None,
+                "tweet_feedback": None,
+                "quality_gate": {**gate, "decision": "unparsed"},
+                "revision_targets": None,
+                "needs_revision": False,
+                "current_agent": "analytics"
+            }
         
-        # Parse evaluation
-        score_match = re.search(r'SCORE:\s*(\d+\.?\d*)', evaluation)
-        score = float(score_match.group(1)) if score_match else 7.0
+        needs_revision = evaluation.revision_needed
         
-        revision_match = re.search(r'REVISION_NEEDED:\s*(Yes|No)', evaluation, re.IGNORECASE)
-        needs_revision = revision_match.group(1).lower() == 'yes' if revision_match else False
+        # Per-tweet scores; tweets the model skipped count as passing
+        tweet_scores = [None] * num_tweets
+        tweet_feedback = [None] * num_tweets
+        for entry in evaluation.tweets:
+            index = entry.tweet - 1
+            if 0 <= index < num_tweets:
+                tweet_scores[index] = _clamp_score(entry.score)
+                tweet_feedback[index] = entry.feedback.strip() or None
+        
+        evaluation_state = {
+            **state,
+            "quality_score": _clamp_score(evaluation.score),
+            "quality_feedback": evaluation.feedback.strip() or None,
+            "tweet_scores": tweet_scores,
+            "tweet_feedback": tweet_feedback,
+            "quality_gate": {**gate, "decision": "llm"}
+        }
         
         if needs_revision and iteration_count < 2:
+            failing = [i for i, tweet_score in enumerate(tweet_scores)
+                       if tweet_score is not None and tweet_score < TWEET_REVISION_THRESHOLD]
             return {
-                **state,
-                "quality_score": score,
+                **evaluation_state,
+                # Without a usable per-tweet verdict the whole thread is rewritten
+                "revision_targets": failing if 0 < len(failing) < num_tweets else None,
                 "needs_revision": True,
                 "iteration_count": iteration_count + 1,
                 "current_agent": "writer"  # Send back to writer
             }
         else:
             return {
-                **state,
-                "quality_score": score,
+                **evaluation_state,
+                "revision_targets": None,
                 "needs_revision": False,
                 "current_agent": "analytics"
-            }
\ No newline at end of file
+            }
+    
+    def _variant_state(self, state: ThreadGenerationState, variant: Dict) -> ThreadGenerationState:
+        """State with a variant's tweets in place of the thread."""
+        return {
+            **state,
+            "draft_tweets": variant["draft_tweets"],
+            "polished_tweets": variant["polished_tweets"],
+            "parse_issues": variant.get("parse_issues")
+        }
+    
+    def _pre_rank(self, state: ThreadGenerationState) -> Tuple[List[Tuple[Dict, Dict]], Optional[Dict]]:
+        """
+        Check every variant against the local rules before ranking them.
+        
+        Args:
+            state (ThreadGenerationState): State holding the finished ``variants``
+        
+        Returns:
+            Tuple[List[Tuple[Dict, Dict]], Optional[Dict]]: Each variant with its rule check,
+            and the variant to evaluate on its own when fewer than two pass the hard rules
+        """
+        checked = [
+            (variant, check_thread(variant["polished_tweets"], state["num_tweets"], state["word_limit"]))
+            for variant in state["variants"]
+        ]
+        passing = [(variant, gate) for variant, gate in checked if not gate["hard_failure"]]
+        if len(passing) >= 2:
+            return passing, None
+        
+        # Nothing to compare: evaluate the passing variant, or the least broken one, like a single thread
+        variant, _ = passing[0] if passing else max(checked, key=lambda item: item[1]["score"])
+        return passing, variant
+    
+    def _build_ranking_messages(self, state: ThreadGenerationState,
+                                candidates: List[Tuple[Dict, Dict]]) -> List[BaseMessage]:
+        """Build the prompt that scores every candidate variant in one call."""
+        variants = "\n\n".join(
+            f"VARIANT {position}:\n" + "\n".join(f"{i}. {tweet}" for i, tweet in enumerate(variant["polished_tweets"], 1))
+            for position, (variant, _) in enumerate(candidates, 1)
+        )
+        
+        ranking_prompt = f"""
+        Compare these {len(candidates)} variants of a tweet thread:
+        
+        Topic: {state["topic"]}
+        Style: {state["style"]}
+        Word limit per tweet: {state["word_limit"]}
+        
+        {variants}
+        
+        Score each variant overall (1-10) on engagement potential, content quality,
+        style consistency, flow and call-to-action effectiveness, with specific
+        feedback (under 15 words).
+        
+        Reply with JSON only:
+        {{"variants": [{{"variant": 1, "score": X.X, "feedback": "..."}}]}}
+        """
+        
+        return [
+            SystemMessage(content="You are a social media expert who compares thread variants and evaluates content quality objectively."),
+            HumanMessage(content=ranking_prompt)
+        ]
+    
+    def _variant_metrics(self, state: ThreadGenerationState, selected: Dict, scores: Dict, decision: str) -> Dict:
+        return {
+            "count": len(state["variants"]),
+            "selected": selected["index"],
+            "temperatures": [variant["temperature"] for variant in state["variants"]],
+            # Variants that failed the hard rules were never scored
+            "scores": [scores.get(variant["index"]) for variant in state["variants"]],
+            "decision": decision
+        }
+    
+    def _process_ranking(self, state: ThreadGenerationState, candidates: List[Tuple[Dict, Dict]],
+                         ranking: Optional[VariantRanking]) -> ThreadGenerationState:
+        """Apply the variant scores, keep the best variant and decide whether it needs revision."""
+        iteration_count = state.get("iteration_count", 0)
+        
+        # Variants the model skipped, or every variant if the reply never parsed, keep their local rule score
+        scores = {variant["index"]: gate["score"] for variant, gate in candidates}
+        feedback = {}
+        for entry in (ranking.variants if ranking else []):
+            position = entry.variant - 1
+            if 0 <= position < len(candidates):
+                index = candidates[position][0]["index"]
+                scores[index] = _clamp_score(entry.score)
+                feedback[index] = entry.feedback.strip() or None
+        
+        best, gate = max(candidates, key=lambda item: scores[item[0]["index"]])
+        score = scores[best["index"]]
+        decision = "llm" if ranking else "unparsed"
+        evaluation_state = {
+            **self._variant_state(state, best),
+            "quality_score": score,
+            "quality_feedback": feedback.get(best["index"]),
+            "tweet_scores": None,
+            "tweet_feedback": None,
+            "quality_gate": {**gate, "decision": decision},
+            "revision_targets": None,
+            "variant_metrics": self._variant_metrics(state, best, scores, "ranked" if ranking else "unparsed")
+        }
+        
+        if ranking and score < VARIANT_PASS_SCORE and iteration_count < 2:
+            return {
+                **evaluation_state,
+                "needs_revision": True,
+                "iteration_count": iteration_count + 1,
+                "current_agent": "writer"
+            }
+        return {
+            **evaluation_state,
+            "needs_revision": False,
+            "current_agent": "analytics"
+        }
+    
+    def rank_variants(self, state: ThreadGenerationState) -> ThreadGenerationState:
+        """
+        Pick the best of the parallel variants in one batched evaluation.
+        
+        Args:
+            state (ThreadGenerationState): State holding the finished ``variants``
+        
+        Returns:
+            ThreadGenerationState: The best variant as the thread, with its quality assessment
+        """
+        candidates, single = self._pre_rank(state)
+        if single is not None:
+            result = self(self._variant_state(state, single))
+            return {**result, "variant_metrics": self._variant_metrics(
+                state, single, {single["index"]: result["quality_score"]}, "single")}
+        
+        ranking, _ = invoke_structured(
+            self.llm, self._build_ranking_messages(state, candidates), VariantRanking,
+            self._evaluation_tokens(len(candidates)), self.structured_output
+        )
+        return self._process_ranking(state, candidates, ranking)
+    
+    async def arank_variants(self, state: ThreadGenerationState) -> ThreadGenerationState:
+        """
+        Async variant of ``rank_variants``.
+        
+        Args:
+            state (ThreadGenerationState): State holding the finished ``variants``
+        
+        Returns:
+            ThreadGenerationState: The best variant as the thread, with its quality assessment
+        """
+        candidates, single = self._pre_rank(state)
+        if single is not None:
+            result = await self.acall(self._variant_state(state, single))
+            return {**result, "variant_metrics": self._variant_metrics(
+                state, single, {single["index"]: result["quality_score"]}, "single")}
+        
+        ranking, _ = await ainvoke_structured(
+            self.llm, self._build_ranking_messages(state, candidates), VariantRanking,
+            self._evaluation_tokens(len(candidates)), self.structured_output
+        )
+        return self._process_ranking(state, candidates, ranking)
+    
+    def __call__(self, state: ThreadGenerationState) -> ThreadGenerationState:
+        """
+        Execute quality control phase of the workflow.
+        
+        Args:
+            state (ThreadGenerationState): Current workflow state
+        
+        Returns:
+            ThreadGenerationState: Updated state with quality assessment
+        """
+        gate, decided = self._pre_gate(state)
+        if decided is not None:
+            return decided
+        
+        evaluation, _ = invoke_structured(
+            self.llm, self._build_messages(state), ThreadEvaluation,
+            self._evaluation_tokens(len(state["polished_tweets"])), self.structured_output
+        )
+        return self._process(state, evaluation, gate)
+    
+    async def acall(self, state: ThreadGenerationState) -> ThreadGenerationState:
+        """
+        Execute quality control phase of the workflow without blocking the event loop.
+        
+        Args:
+            state (ThreadGenerationState): Current workflow state
+        
+        Returns:
+            ThreadGenerationState: Updated state with quality assessment
+        """
+        gate, decided = self._pre_gate(state)
+        if decided is not None:
+            return decided
+        
+        evaluation, _ = await ainvoke_structured(
+            self.llm, self._build_messages(state), ThreadEvaluation,
+            self._evaluation_tokens(len(state["polished_tweets"])), self.structured_output
+        )
+        return self._process(state, evaluation, gate)
@@ -2,10 +2,13 @@
 Writer Agent - Creates compelling tweet content.
 """
 
-from langchain_core.messages import HumanMessage, SystemMessage
+from typing import Dict, List
+
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
 
 from ..models.state import ThreadGenerationState
-from ..utils.text_processing import extract_tweets_from_content
+from ..utils.research_context import estimate_tokens
+from ..utils.text_processing import extract_numbered_tweets, parse_tweets
 
 
 class WriterAgent:
@@ -20,16 +23,11 @@ class WriterAgent:
         """
         self.llm = llm
     
-    def __call__(self, state: ThreadGenerationState) -> ThreadGenerationState:
-        """
-        Execute writing phase of the workflow.
+    def _build_messages(self, state: ThreadGenerationState) -> List[BaseMessage]:
+        """Build the thread writing prompt, or the targeted revision prompt."""
+        if state.get("revision_targets"):
+            return self._build_revision_messages(state)
         
-        Args:
-            state (ThreadGenerationState): Current workflow state
-            
-        Returns:
-            ThreadGenerationState: Updated state with draft tweets
-        """
         strategy_plan = state["strategy_plan"]
         research_data = state["research_data"]
         topic = state["topic"]
@@ -57,16 +55,116 @@ class WriterAgent:
         Return ONLY the tweets, numbered 1-{num_tweets}, nothing else.
         """
         
-        draft_content = self.llm.invoke([
+        if state.get("needs_revision") and state.get("quality_feedback"):
+            writing_prompt += f"""
+        A reviewer rejected the previous draft with this feedback; address it:
+        {state["quality_feedback"]}
+        """
+        
+        return [
             SystemMessage(content=f"You are an expert {style} content writer who creates viral social media content."),
             HumanMessage(content=writing_prompt)
-        ]).content
+        ]
+    
+    def _build_revision_messages(self, state: ThreadGenerationState) -> List[BaseMessage]:
+        """Build a prompt that rewrites only the tweets the supervisor failed."""
+        tweets = state["polished_tweets"]
+        feedback = state.get("tweet_feedback") or [None] * len(tweets)
+        style = state["style"]
+        
+        revision_prompt = f"""
+        This {len(tweets)}-tweet thread about "{state["topic"]}" in {style} style needs some tweets rewritten.
+        
+        Full thread, for context:
+        {chr(10).join([f"{i+1}. {tweet}" for i, tweet in enumerate(tweets)])}
+        
+        Rewrite ONLY these tweets, following the reviewer's feedback:
+        {chr(10).join([f"{i+1}. {feedback[i] or 'Improve engagement and clarity'}" for i in state["revision_targets"]])}
+        
+        Overall feedback: {state.get("quality_feedback") or "None"}
+        
+        REQUIREMENTS:
+        - Each tweet max {state["word_limit"]} words
+        - Keep the flow with the tweets around it
+        - Include relevant emojis
+        
+        Return ONLY the rewritten tweets, each with its original number, nothing else.
+        """
         
-        # Extract individual tweets
-        tweets = extract_tweets_from_content(draft_content, num_tweets)
+        return [
+            SystemMessage(content=f"You are an expert {style} content writer who creates viral social media content."),
+            HumanMessage(content=revision_prompt)
+        ]
+    
+    def _process(self, state: ThreadGenerationState, draft_content: str) -> ThreadGenerationState:
+        """Extract the draft tweets from the model's output."""
+        targets = state.get("revision_targets")
         
-        return {
+        if targets:
+            # Splice rewritten tweets into the approved ones; a tweet the model skipped stays as it was
+            rewritten = extract_numbered_tweets(draft_content)
+            tweets = [rewritten.get(i + 1, tweet) if i in targets else tweet
+                      for i, tweet in enumerate(state["polished_tweets"])]
+            issues = [f"Writer: tweet {i + 1} was not rewritten" for i in targets if i + 1 not in rewritten]
+        else:
+            # Extract individual tweets
+            tweets, issues = parse_tweets(draft_content, state["num_tweets"])
+            tweets = tweets[:state["num_tweets"]]
+            issues = [f"Writer: {issue}" for issue in issues]
+        
+        updated_state = {
             **state,
             "draft_tweets": tweets,
+            "parse_issues": issues,
             "current_agent": "editor"
-        }
\ No newline at end of file
+        }
+        
+        if state.get("needs_revision"):
+            updated_state["revision_metrics"] = self._revision_metrics(state, targets)
+        return updated_state
+    
+    def _revision_metrics(self, state: ThreadGenerationState, targets: List[int]) -> Dict:
+        """Count this revision and the completion tokens a full rewrite would have spent on kept tweets."""
+        metrics = dict(state.get("revision_metrics") or {
+            "revisions": 0,
+            "targeted_revisions": 0,
+            "tweets_rewritten": 0,
+            "tweets_kept": 0,
+            "completion_tokens_saved": 0
+        })
+        tweets = state["polished_tweets"] or []
+        kept = [tweet for i, tweet in enumerate(tweets) if targets and i not in targets]
+        
+        metrics["revisions"] += 1
+        metrics["targeted_revisions"] += int(bool(targets))
+        metrics["tweets_rewritten"] += len(targets) if targets else state["num_tweets"]
+        metrics["tweets_kept"] += len(kept)
+        # Kept tweets are neither rewritten by the writer nor re-emitted by the editor
+        metrics["completion_tokens_saved"] += 2 * sum(estimate_tokens(tweet) for tweet in kept)
+        return metrics
+    
+    def __call__(self, state: ThreadGenerationState) -> ThreadGenerationState:
+        """
+        Execute writing phase of the workflow.
+        
+        Args:
+            state (ThreadGenerationState): Current workflow state
+            
+        Returns:
+            ThreadGenerationState: Updated state with draft tweets
+        """
+        draft_content = self.llm.invoke(self._build_messages(state)).content
+        return self._process(state, draft_content)
+    
+    async def acall(self, state: ThreadGenerationState) -> ThreadGenerationState:
+        """
+        Execute writing phase of the workflow without blocking the event loop.
+        
+        Args:
+            state (ThreadGenerationState): Current workflow state
+            
+        Returns:
+            ThreadGenerationState: Updated state with draft tweets
+        """
+        draft_content = (await self.llm.ainvoke(self._build_messages(state))).content
+        return self._process(state, draft_content)
@@ -3,6 +3,6 @@
 TweetCraft data models and state definitions
 """
 
-from .state import ThreadGenerationState
+from .state import ThreadGenerationState, create_initial_state
 
-__all__ = ["ThreadGenerationState"]
\ No newline at end of file
+__all__ = ["ThreadGenerationState", "create_initial_state"]
\ No newline at end of file
@@ -0,0 +1,53 @@
+"""
+Typed results for the agents that return structured output.
+
+These models double as the JSON schemas sent to the model, so every field
+is required and has no default (OpenAI strict mode rejects both).
+"""
+
+from typing import List
+
+from pydantic import BaseModel
+
+
+class TweetScore(BaseModel):
+    """Score and feedback for one tweet"""
+    tweet: int
+    score: float
+    feedback: str
+
+
+class ThreadEvaluation(BaseModel):
+    """Supervisor's verdict on a thread"""
+    score: float
+    feedback: str
+    revision_needed: bool
+    tweets: List[TweetScore]
+
+
+class VariantScore(BaseModel):
+    """Score and feedback for one thread variant"""
+    variant: int
+    score: float
+    feedback: str
+
+
+class VariantRanking(BaseModel):
+    """Supervisor's scores for every candidate variant"""
+    variants: List[VariantScore]
+
+
+class EngagementPrediction(BaseModel):
+    """Expected engagement for the thread's first tweet"""
+    likes: int
+    retweets: int
+    replies: int
+
+
+class AnalyticsInsights(BaseModel):
+    """Analytics agent's engagement insights"""
+    posting_times: List[str]
+    hashtags: List[str]
+    engagement_prediction: EngagementPrediction
+    target_audience: str
+    optimization_tips: List[str]
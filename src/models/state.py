@@ -2,7 +2,25 @@
 State definitions for the TweetCraft multi-agent system.
 """
 
-from typing import Dict, List, Optional, TypedDict
+from typing import Annotated, Dict, List, Optional, TypedDict
+
+
+def merge_variants(current: Optional[List[Dict]], update: Optional[List[Dict]]) -> List[Dict]:
+    """
+    Reducer for ``variants``: parallel branches each add their own variant.
+    
+    Nodes return the whole state, so a variant already present is replaced
+    rather than appended again.
+    
+    Args:
+        current (Optional[List[Dict]]): Variants so far
+        update (Optional[List[Dict]]): Variants written by a node
+    
+    Returns:
+        List[Dict]: Variants ordered by ``index``
+    """
+    merged = {variant["index"]: variant for variant in (current or []) + (update or [])}
+    return [merged[index] for index in sorted(merged)]
 
 
 class ThreadGenerationState(TypedDict):
@@ -20,10 +38,73 @@ class ThreadGenerationState(TypedDict):
     strategy_plan: Optional[str]
     draft_tweets: Optional[List[str]]
     polished_tweets: Optional[List[str]]
+    parse_issues: Optional[List[str]]
     analytics_insights: Optional[Dict]
+    speculative_analytics: Optional[Dict]
+    
+    # Parallel drafts in variant mode; the supervisor copies the best into polished_tweets
+    variants: Annotated[List[Dict], merge_variants]
+    
+    # Supervisor feedback; revision_targets holds the 0-based tweets a targeted revision rewrites
+    quality_feedback: Optional[str]
+    tweet_scores: Optional[List[float]]
+    tweet_feedback: Optional[List[str]]
+    revision_targets: Optional[List[int]]
+    quality_gate: Optional[Dict]
+    
+    # Run metrics
+    research_metrics: Optional[Dict]
+    speculation_metrics: Optional[Dict]
+    revision_metrics: Optional[Dict]
+    variant_metrics: Optional[Dict]
     
     # Workflow control
     current_agent: str
     quality_score: Optional[float]
     needs_revision: bool
-    iteration_count: int
\ No newline at end of file
+    iteration_count: int
+
+
+def create_initial_state(topic: str, style: str, num_tweets: int, word_limit: int,
+                         customizations: Optional[Dict] = None) -> ThreadGenerationState:
+    """
+    Build the state a workflow run starts from.
+    
+    Args:
+        topic (str): Thread topic
+        style (str): Thread style
+        num_tweets (int): Number of tweets in the thread
+        word_limit (int): Maximum words per tweet
+        customizations (Optional[Dict]): Advanced options from the sidebar or batch input
+    
+    Returns:
+        ThreadGenerationState: Initial workflow state
+    """
+    return {
+        "topic": topic,
+        "style": style,
+        "num_tweets": num_tweets,
+        "word_limit": word_limit,
+        "customizations": customizations or {},
+        "research_data": None,
+        "strategy_plan": None,
+        "draft_tweets": None,
+        "polished_tweets": None,
+        "parse_issues": None,
+        "analytics_insights": None,
+        "speculative_analytics": None,
+        "variants": [],
+        "quality_feedback": None,
+        "tweet_scores": None,
+        "tweet_feedback": None,
+        "revision_targets": None,
+        "quality_gate": None,
+        "research_metrics": None,
+        "speculation_metrics": None,
+        "revision_metrics": None,
+        "variant_metrics": None,
+        "current_agent": "research",
+        "quality_score": None,
+        "needs_revision": False,
+        "iteration_count": 0
+    }
\ No newline at end of file
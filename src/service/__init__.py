@@ -0,0 +1,7 @@
+"""
+TweetCraft HTTP generation service
+"""
+
+from .server import create_server
+
+__all__ = ["create_server"]
@@ -0,0 +1,278 @@
+"""
+Small HTTP service that runs thread generations as background jobs.
+
+Usage:
+    python -m src.service.server --port 8000 --workers 4 --max-queue 100
+
+Endpoints:
+    POST /jobs                 Submit a generation; returns 202 with the job ID, or 429 when the queue is full
+    GET  /jobs/<id>            Job status and, once finished, the final ThreadGenerationState
+    GET  /jobs/<id>/events     Progress events (``?since=N&wait=S`` long-polls; ``Accept: text/event-stream`` streams)
+    GET  /jobs/<id>/trace      Per-agent timings, tokens and cache hits, with every recorded span
+    GET  /history              Stored threads, newest first (``?q=&style=&since=&until=&before=&limit=``)
+    GET  /history/<id>         One stored thread with its full final state
+    GET  /metrics              Queue depth, job counters and rate limiter metrics
+    GET  /metrics/prometheus   The same gauges plus per-agent trace totals in Prometheus text format
+    GET  /healthz              Liveness check
+"""
+
+import argparse
+import json
+import os
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+from urllib.parse import parse_qs, urlsplit
+
+from ..models.state import create_initial_state
+from ..utils.credentials import credentials_config
+from ..utils.history import get_history_store
+from ..utils.rate_limit import rate_limit_metrics
+from ..utils.tracing import trace_metrics
+from ..workflow.batch import DEFAULT_NUM_TWEETS, DEFAULT_STYLE, DEFAULT_WORD_LIMIT
+from ..workflow.jobs import JobManager, QueueFullError
+
+
+# Longest a single events request may block waiting for progress
+MAX_WAIT_SECONDS = 30.0
+
+# Largest history page a request may ask for
+MAX_HISTORY_PAGE = 100
+
+
+class GenerationRequestHandler(BaseHTTPRequestHandler):
+    """Routes requests to the server's JobManager"""
+    
+    server_version = "TweetCraft/1.0"
+    
+    def _send_json(self, status: int, body: Dict, headers: Optional[Dict] = None):
+        payload = json.dumps(body, default=str).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+    
+    def _send_text(self, status: int, body: str, content_type: str = "text/plain; version=0.0.4"):
+        payload = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+    
+    def _route(self):
+        parts = urlsplit(self.path)
+        return [segment for segment in parts.path.split("/") if segment], parse_qs(parts.query)
+    
+    def do_POST(self):
+        segments, _ = self._route()
+        if segments != ["jobs"]:
+            self._send_json(404, {"error": "Not found"})
+            return
+        
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            self._send_json(400, {"error": "Request body must be JSON"})
+            return
+        
+        if not isinstance(body, dict) or not str(body.get("topic", "")).strip():
+            self._send_json(400, {"error": "A non-empty 'topic' is required"})
+            return
+        
+        try:
+            initial_state = create_initial_state(
+                body["topic"],
+                body.get("style", DEFAULT_STYLE),
+                int(body.get("num_tweets", DEFAULT_NUM_TWEETS)),
+                int(body.get("word_limit", DEFAULT_WORD_LIMIT)),
+                body.get("customizations")
+            )
+        except (TypeError, ValueError) as e:
+            self._send_json(400, {"error": str(e)})
+            return
+        
+        config = credentials_config(
+            body.get("openai_api_key") or self.server.openai_api_key,
+            body.get("tavily_api_key") or self.server.tavily_api_key
+        )
+        
+        try:
+            job = self.server.jobs.submit(
+                initial_state,
+                config,
+                speculative_analytics=bool(body.get("speculative_analytics", False))
+            )
+        except QueueFullError as e:
+            self._send_json(429, {"error": str(e)}, {"Retry-After": "5"})
+            return
+        
+        self._send_json(202, {"job_id": job.id, "status": job.status}, {"Location": f"/jobs/{job.id}"})
+    
+    def do_GET(self):
+        segments, query = self._route()
+        
+        if segments == ["healthz"]:
+            self._send_json(200, {"status": "ok"})
+            return
+        
+        if segments == ["metrics"]:
+            self._send_json(200, {**self.server.jobs.metrics(), "rate_limits": rate_limit_metrics()})
+            return
+        
+        if segments == ["metrics", "prometheus"]:
+            gauges = [f"# TYPE tweetcraft_jobs_{name} gauge\ntweetcraft_jobs_{name} {value}"
+                      for name, value in self.server.jobs.metrics().items()]
+            self._send_text(200, "\n".join(gauges) + "\n" + trace_metrics.prometheus_text())
+            return
+        
+        if segments and segments[0] == "history" and len(segments) <= 2:
+            self._send_history(segments[1:], query)
+            return
+        
+        if len(segments) in (2, 3) and segments[0] == "jobs":
+            job = self.server.jobs.get(segments[1])
+            if job is None:
+                self._send_json(404, {"error": "Unknown job"})
+            elif len(segments) == 2:
+                self._send_json(200, job.to_dict())
+            elif segments[2] == "events":
+                try:
+                    since = int(query.get("since", ["0"])[0])
+                    wait = float(query.get("wait", ["0"])[0])
+                except ValueError:
+                    self._send_json(400, {"error": "'since' must be an integer and 'wait' a number"})
+                    return
+                # ``not wait >= 0`` also rejects NaN
+                if since < 0 or not wait >= 0:
+                    self._send_json(400, {"error": "'since' and 'wait' must not be negative"})
+                    return
+                if "text/event-stream" in self.headers.get("Accept", ""):
+                    self._stream_events(job, since)
+                else:
+                    wait = min(wait, MAX_WAIT_SECONDS)
+                    events = job.events_since(since, timeout=wait)
+                    self._send_json(200, {"events": events, "next": since + len(events), "done": job.done})
+            elif segments[2] == "trace":
+                if job.trace is None:
+                    self._send_json(404, {"error": "Job has not started"})
+                else:
+                    self._send_json(200, job.trace.to_dict())
+            else:
+                self._send_json(404, {"error": "Not found"})
+            return
+        
+        self._send_json(404, {"error": "Not found"})
+    
+    def _send_history(self, segments, query):
+        """Serve a page of stored threads or a single stored thread."""
+        history = get_history_store()
+        if history is None:
+            self._send_json(404, {"error": "History is disabled"})
+            return
+        
+        try:
+            if segments:
+                thread = history.get(int(segments[0]))
+                if thread is None:
+                    self._send_json(404, {"error": "Unknown thread"})
+                else:
+                    self._send_json(200, thread)
+                return
+            
+            def param(name, convert=str):
+                return convert(query[name][0]) if name in query else None
+            
+            threads = history.search(
+                param("q"),
+                param("style"),
+                param("since", float),
+                param("until", float),
+                param("before", int),
+                min(param("limit", int) or 20, MAX_HISTORY_PAGE)
+            )
+        except ValueError as e:
+            self._send_json(400, {"error": str(e)})
+            return
+        
+        next_cursor = threads[-1]["id"] if threads else None
+        self._send_json(200, {"threads": threads, "next_before": next_cursor})
+    
+    def _stream_events(self, job, since: int):
+        """Send events as server-sent events until the job finishes."""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        
+        try:
+            while True:
+                events = job.events_since(since, timeout=MAX_WAIT_SECONDS)
+                for event in events:
+                    self.wfile.write(f"id: {event['seq']}\nevent: {event['type']}\ndata: {json.dumps(event)}\n\n".encode("utf-8"))
+                since += len(events)
+                self.wfile.flush()
+                if job.done and since >= len(job.events):
+                    return
+        except (BrokenPipeError, ConnectionResetError):
+            return
+    
+    def log_message(self, format, *args):
+        # Request paths carry no secrets, but keep the log quiet under load
+        if os.environ.get("TWEETCRAFT_SERVICE_ACCESS_LOG") == "1":
+            super().log_message(format, *args)
+
+
+def create_server(host: str = "127.0.0.1", port: int = 8000, jobs: Optional[JobManager] = None,
+                  openai_api_key: Optional[str] = None, tavily_api_key: Optional[str] = None) -> ThreadingHTTPServer:
+    """
+    Create the generation service.
+    
+    Args:
+        host (str): Interface to bind
+        port (int): Port to bind, 0 for any free port
+        jobs (Optional[JobManager]): Job manager, e.g. one built on a stand-in workflow for tests
+        openai_api_key (Optional[str]): Key used when a request doesn't supply one
+        tavily_api_key (Optional[str]): Key used when a request doesn't supply one
+    
+    Returns:
+        ThreadingHTTPServer: Server ready for ``serve_forever``
+    """
+    server = ThreadingHTTPServer((host, port), GenerationRequestHandler)
+    server.daemon_threads = True
+    server.jobs = jobs or JobManager()
+    server.openai_api_key = openai_api_key
+    server.tavily_api_key = tavily_api_key
+    return server
+
+
+def main():
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Run the TweetCraft generation service.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=4, help="Generations run at the same time")
+    parser.add_argument("--max-queue", type=int, default=100, help="Jobs allowed to wait before returning 429")
+    args = parser.parse_args()
+    
+    server = create_server(
+        args.host,
+        args.port,
+        JobManager(max_workers=args.workers, max_queue=args.max_queue),
+        os.environ.get("OPENAI_API_KEY"),
+        os.environ.get("TAVILY_API_KEY")
+    )
+    print(f"TweetCraft service listening on http://{args.host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -2,9 +2,17 @@
 TweetCraft UI components
 """
 
-from .main_ui import init_streamlit, render_header, render_api_keys, render_topic_input, render_agent_status
+from .main_ui import (
+    init_streamlit,
+    render_header,
+    render_api_keys,
+    render_topic_input,
+    render_agent_status,
+    render_live_output
+)
 from .sidebar import render_sidebar
-from .results import render_results, render_success_message
+from .results import render_results, render_success_message, render_timing_panel
+from .history import render_history
 
 __all__ = [
     "init_streamlit",
@@ -12,7 +20,10 @@ __all__ = [
     "render_api_keys",
     "render_topic_input",
     "render_agent_status",
+    "render_live_output",
     "render_sidebar",
     "render_results",
-    "render_success_message"
+    "render_success_message",
+    "render_timing_panel",
+    "render_history"
 ]
\ No newline at end of file
@@ -0,0 +1,73 @@
+"""
+History UI component for browsing and searching previously generated threads.
+"""
+
+import streamlit as st
+from datetime import datetime, time as day_time
+
+from ..utils.history import HistoryStore
+from .sidebar import THREAD_STYLES
+
+
+PAGE_SIZE = 10
+
+
+def render_history(store: HistoryStore):
+    """
+    Render a searchable, paginated list of stored threads.
+    
+    Pages are fetched by ID cursor; the cursors of earlier pages are kept in
+    session state so "Newer" can step back.
+    
+    Args:
+        store (HistoryStore): Thread history store
+    """
+    with st.expander("🕘 History"):
+        col1, col2, col3 = st.columns([3, 2, 2])
+        with col1:
+            query = st.text_input("Search topics, tweets and research", key="history_query")
+        with col2:
+            style = st.selectbox("Style", ["All styles"] + THREAD_STYLES, key="history_style")
+        with col3:
+            since = st.date_input("Since", value=None, key="history_since")
+        
+        # A new search starts again from the newest page
+        filters = (query, style, since)
+        if st.session_state.get("history_filters") != filters:
+            st.session_state["history_filters"] = filters
+            st.session_state["history_cursors"] = [None]
+        cursors = st.session_state["history_cursors"]
+        
+        threads = store.search(
+            query,
+            style if style != "All styles" else None,
+            datetime.combine(since, day_time()).timestamp() if since else None,
+            before_id=cursors[-1],
+            limit=PAGE_SIZE
+        )
+        
+        if not threads:
+            st.caption("No stored threads match.")
+        for thread in threads:
+            created = datetime.fromtimestamp(thread["created_at"]).strftime("%Y-%m-%d %H:%M")
+            score = f" | score {thread['quality_score']}" if thread["quality_score"] is not None else ""
+            with st.container(border=True):
+                st.markdown(f"**{thread['topic']}**")
+                st.caption(f"{created} | {thread['style']} | {len(thread['tweets'])} tweets{score}")
+                st.text_area(
+                    "Thread",
+                    "\n\n".join(f"{i}. {tweet}" for i, tweet in enumerate(thread["tweets"], 1)),
+                    height=150,
+                    key=f"history_thread_{thread['id']}",
+                    label_visibility="collapsed"
+                )
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            if len(cursors) > 1 and st.button("← Newer", key="history_newer", use_container_width=True):
+                cursors.pop()
+                st.rerun()
+        with col2:
+            if len(threads) == PAGE_SIZE and st.button("Older →", key="history_older", use_container_width=True):
+                cursors.append(threads[-1]["id"])
+                st.rerun()
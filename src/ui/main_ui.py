@@ -3,10 +3,9 @@ Main UI components for TweetCraft application.
 """
 
 import streamlit as st
-import time
-from typing import Tuple
+from typing import List, Optional, Tuple
 
-from ..utils.api_keys import validate_openai_api_key, validate_tavily_api_key
+from ..utils.api_keys import validate_api_keys
 
 
 def init_streamlit():
@@ -46,17 +45,7 @@ def render_api_keys() -> Tuple[str, str, bool]:
             help="Your OpenAI API key for GPT-4o",
             key="openai_key"
         )
-        
-        if openai_key:
-            with st.spinner("Validating OpenAI API key..."):
-                if validate_openai_api_key(openai_key):
-                    st.success("✅ Valid OpenAI API key")
-                    openai_valid = True
-                else:
-                    st.error("❌ Invalid OpenAI API key")
-                    openai_valid = False
-        else:
-            openai_valid = False
+        openai_status = st.empty()
     
     with col2:
         st.subheader("Tavily API Key")
@@ -67,17 +56,26 @@ def render_api_keys() -> Tuple[str, str, bool]:
             help="Your Tavily API key for web search",
             key="tavily_key"
         )
-        
-        if tavily_key:
-            with st.spinner("Validating Tavily API key..."):
-                if validate_tavily_api_key(tavily_key):
-                    st.success("✅ Valid Tavily API key")
-                    tavily_valid = True
-                else:
-                    st.error("❌ Invalid Tavily API key")
-                    tavily_valid = False
+        tavily_status = st.empty()
+    
+    # Both keys are checked in parallel; results are cached so reruns don't hit the network
+    if openai_key or tavily_key:
+        with st.spinner("Validating API keys..."):
+            openai_valid, tavily_valid = validate_api_keys(openai_key, tavily_key)
+    else:
+        openai_valid, tavily_valid = False, False
+    
+    if openai_key:
+        if openai_valid:
+            openai_status.success("✅ Valid OpenAI API key")
         else:
-            tavily_valid = False
+            openai_status.error("❌ Invalid OpenAI API key")
+    
+    if tavily_key:
+        if tavily_valid:
+            tavily_status.success("✅ Valid Tavily API key")
+        else:
+            tavily_status.error("❌ Invalid Tavily API key")
     
     return openai_key, tavily_key, openai_valid and tavily_valid
 
@@ -100,22 +98,28 @@ def render_topic_input() -> str:
     return topic
 
 
-def render_agent_status(current_agent: str, progress: int):
+AGENTS = {
+    "research": {"emoji": "🔍", "name": "Research Agent", "desc": "Gathering intelligence..."},
+    "strategy": {"emoji": "📋", "name": "Strategy Agent", "desc": "Planning thread structure..."},
+    "writer": {"emoji": "✍️", "name": "Writer Agent", "desc": "Crafting compelling content..."},
+    "editor": {"emoji": "✨", "name": "Editor Agent", "desc": "Polishing to perfection..."},
+    "supervisor": {"emoji": "🎯", "name": "Supervisor Agent", "desc": "Quality control check..."},
+    "analytics": {"emoji": "📊", "name": "Analytics Agent", "desc": "Optimizing for engagement..."}
+}
+
+AGENT_SEQUENCE = list(AGENTS.keys())
+
+
+def render_agent_status(current_agent: str, progress: float, completed_agents: Optional[List[str]] = None):
     """
     Render animated agent status.
     
     Args:
         current_agent (str): Currently active agent
-        progress (int): Progress percentage
+        progress (float): Progress percentage
+        completed_agents (Optional[List[str]]): Agents that have finished at least once
     """
-    agents = {
-        "research": {"emoji": "🔍", "name": "Research Agent", "desc": "Gathering intelligence..."},
-        "strategy": {"emoji": "📋", "name": "Strategy Agent", "desc": "Planning thread structure..."},
-        "writer": {"emoji": "✍️", "name": "Writer Agent", "desc": "Crafting compelling content..."},
-        "editor": {"emoji": "✨", "name": "Editor Agent", "desc": "Polishing to perfection..."},
-        "supervisor": {"emoji": "🎯", "name": "Supervisor Agent", "desc": "Quality control check..."},
-        "analytics": {"emoji": "📊", "name": "Analytics Agent", "desc": "Optimizing for engagement..."}
-    }
+    completed_agents = completed_agents or []
     
     col1, col2 = st.columns([1, 3])
     
@@ -123,20 +127,40 @@ def render_agent_status(current_agent: str, progress: int):
         st.progress(progress / 100)
     
     with col2:
-        if current_agent in agents:
-            agent_info = agents[current_agent]
+        if current_agent in AGENTS:
+            agent_info = AGENTS[current_agent]
             st.markdown(f"""
             **{agent_info['emoji']} {agent_info['name']}**  
             *{agent_info['desc']}*
             """)
         
         # Show all agents with status
-        status_cols = st.columns(6)
-        for i, (agent_key, agent_info) in enumerate(agents.items()):
+        status_cols = st.columns(len(AGENTS))
+        for i, (agent_key, agent_info) in enumerate(AGENTS.items()):
             with status_cols[i]:
                 if agent_key == current_agent:
                     st.markdown(f"🟢 {agent_info['emoji']}")
-                elif progress > (i * 16.67):
+                elif agent_key in completed_agents:
                     st.markdown(f"✅ {agent_info['emoji']}")
                 else:
-                    st.markdown(f"⚪ {agent_info['emoji']}")
\ No newline at end of file
+                    st.markdown(f"⚪ {agent_info['emoji']}")
+
+
+def render_live_output(agent: str, text: str, tweets: Optional[List[str]] = None):
+    """
+    Render an agent's output while it is still being generated.
+    
+    Args:
+        agent (str): Agent producing the output
+        text (str): Output received so far
+        tweets (Optional[List[str]]): Tweets already complete in that output
+    """
+    agent_info = AGENTS.get(agent, {"emoji": "🤖", "name": agent})
+    st.caption(f"{agent_info['emoji']} {agent_info['name']} is writing...")
+    if not tweets:
+        st.markdown(text)
+        return
+    
+    for i, tweet in enumerate(tweets, 1):
+        st.markdown(f"**{i}.** {tweet}")
+    st.caption(f"Writing tweet {len(tweets) + 1}...")
\ No newline at end of file
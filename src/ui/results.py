@@ -3,6 +3,7 @@ Results UI components for displaying generated tweet threads.
 """
 
 import streamlit as st
+from typing import Dict
 
 from ..models.state import ThreadGenerationState
 
@@ -18,11 +19,13 @@ def render_results(state: ThreadGenerationState):
         return
     
     tweets = state["polished_tweets"]
+    tweet_scores = state.get("tweet_scores") or [None] * len(tweets)
     
     st.header("🧵 Your Generated Thread")
     
     # Thread preview
     for i, tweet in enumerate(tweets, 1):
+        score = f" | score {tweet_scores[i - 1]:.1f}" if tweet_scores[i - 1] is not None else ""
         with st.container():
             st.markdown(f"""
             <div style="
@@ -35,7 +38,7 @@ def render_results(state: ThreadGenerationState):
                 <strong>Tweet {i}/{len(tweets)}</strong><br>
                 {tweet}<br>
                 <small style="color: #657786;">
-                    {len(tweet.split())} words | {len(tweet)} characters
+                    {len(tweet.split())} words | {len(tweet)} characters{score}
                 </small>
             </div>
             """, unsafe_allow_html=True)
@@ -55,18 +58,72 @@ def render_results(state: ThreadGenerationState):
             if "hashtags" in insights:
                 st.write("**Recommended Hashtags:**")
                 if isinstance(insights["hashtags"], list):
-                    st.write(" ".join([f"#{tag}" for tag in insights["hashtags"]]))
+                    st.write(" ".join([f"#{tag.lstrip('#')}" for tag in insights["hashtags"]]))
                 else:
                     st.write(insights["hashtags"])
         
         with col2:
             if "posting_times" in insights:
                 st.write("**Best Posting Times:**")
-                st.write(insights["posting_times"])
+                if isinstance(insights["posting_times"], list):
+                    st.write(", ".join(insights["posting_times"]))
+                else:
+                    st.write(insights["posting_times"])
         
         if "optimization_tips" in insights:
             st.write("**Optimization Tips:**")
-            st.write(insights["optimization_tips"])
+            if isinstance(insights["optimization_tips"], list):
+                st.markdown("\n".join(f"- {tip}" for tip in insights["optimization_tips"]))
+            else:
+                st.write(insights["optimization_tips"])
+    
+    # Revision summary
+    if state.get("revision_metrics"):
+        revisions = state["revision_metrics"]
+        st.caption(
+            f"✏️ {revisions['revisions']} revision(s), {revisions['tweets_rewritten']} tweet(s) rewritten, "
+            f"{revisions['tweets_kept']} kept (~{revisions['completion_tokens_saved']} completion tokens saved)"
+        )
+        if state.get("quality_feedback"):
+            st.caption(f"Supervisor feedback: {state['quality_feedback']}")
+    
+    # Variant selection
+    if state.get("variant_metrics"):
+        variant_metrics = state["variant_metrics"]
+        selected = variant_metrics["selected"]
+        scores = " / ".join(f"{score:.1f}" if score is not None else "failed rules" for score in variant_metrics["scores"])
+        st.caption(
+            f"🔀 Best of {variant_metrics['count']} variants: variant {selected + 1} "
+            f"(temperature {variant_metrics['temperatures'][selected]}), scores {scores}"
+        )
+        others = [variant for variant in state.get("variants") or [] if variant["index"] != selected]
+        if others:
+            with st.expander("🔀 Other variants"):
+                for variant in others:
+                    st.markdown(f"**Variant {variant['index'] + 1}** (temperature {variant['temperature']})")
+                    st.text("\n\n".join(f"{i}. {tweet}" for i, tweet in enumerate(variant["polished_tweets"], 1)))
+    
+    # Research timings
+    if state.get("research_metrics"):
+        metrics = state["research_metrics"]
+        with st.expander(f"🔍 Research timings ({metrics['wall_time']:.2f}s, {metrics['mode']})"):
+            if metrics["mode"] == "similar":
+                st.write(f"♻️ Reused research for \"{metrics['similar_topic']}\" "
+                         f"(similarity {metrics['similarity']:.2f})")
+            for query in metrics["queries"]:
+                if query["error"]:
+                    st.write(f"❌ {query['query']}: {query['error']}")
+                elif query["cached"]:
+                    st.write(f"💾 {query['query']}: cached, {query['num_results']} results")
+                else:
+                    st.write(f"✅ {query['query']}: {query['latency']:.2f}s, {query['num_results']} results")
+            if "context" in metrics:
+                context = metrics["context"]
+                st.write(
+                    f"🧹 {context['included_results']}/{context['unique_results']} unique sources "
+                    f"({context['raw_results']} raw) in {context['context_tokens']} tokens, "
+                    f"{context['tokens_saved']} prompt tokens saved"
+                )
 
 
 def render_success_message(quality_score: float):
@@ -76,4 +133,33 @@ def render_success_message(quality_score: float):
     Args:
         quality_score (float): Quality score from supervisor agent
     """
-    st.success(f"✅ Thread generated successfully! Quality Score: {quality_score}/10")
\ No newline at end of file
+    st.success(f"✅ Thread generated successfully! Quality Score: {quality_score}/10")
+
+
+def render_timing_panel(summary: Dict):
+    """
+    Render per-agent timing, token and cache statistics for a run.
+    
+    Args:
+        summary (Dict): Run trace summary from ``RunTrace.summary``
+    """
+    with st.expander(f"⏱️ Run timings ({summary['wall_time']:.1f}s, "
+                     f"{summary['prompt_tokens'] + summary['completion_tokens']} tokens, "
+                     f"~${summary['cost']:.4f})"):
+        rows = []
+        for agent, stats in summary["agents"].items():
+            rows.append({
+                "Agent": agent,
+                "Wall time (s)": round(stats["wall_time"], 2),
+                "LLM calls": stats["llm_calls"],
+                "LLM time (s)": round(stats["llm_seconds"], 2),
+                "Prompt tokens": stats["prompt_tokens"],
+                "Completion tokens": stats["completion_tokens"],
+                "Est. cost ($)": round(stats["cost"], 5),
+                "Cache hits": stats["cache_hits"],
+                "Retries": stats["retries"],
+                "Output repairs": stats["repairs"],
+                "Searches": stats["searches"],
+                "Model": ", ".join(stats["models"])
+            })
+        st.dataframe(rows, use_container_width=True, hide_index=True)
\ No newline at end of file
@@ -5,6 +5,17 @@ Sidebar UI components for TweetCraft customization panel.
 import streamlit as st
 from typing import Dict, Tuple
 
+from ..utils.model_routing import AGENTS, ROUTABLE_MODELS, get_model_routes
+from ..workflow.variants import MAX_VARIANTS
+
+
+THREAD_STYLES = [
+    "Professional & Informative",
+    "Casual & Conversational",
+    "Humorous & Entertaining",
+    "Thought-provoking & Deep"
+]
+
 
 def render_sidebar() -> Tuple[int, str, int, Dict]:
     """
@@ -28,12 +39,7 @@ def render_sidebar() -> Tuple[int, str, int, Dict]:
         # Style selection
         style = st.selectbox(
             "Thread Style",
-            [
-                "Professional & Informative",
-                "Casual & Conversational", 
-                "Humorous & Entertaining",
-                "Thought-provoking & Deep"
-            ],
+            THREAD_STYLES,
             help="Choose the tone and style"
         )
         
@@ -51,11 +57,63 @@ def render_sidebar() -> Tuple[int, str, int, Dict]:
             include_hashtags = st.checkbox("Include hashtag suggestions", value=True)
             include_analytics = st.checkbox("Generate engagement insights", value=True)
             max_iterations = st.slider("Max revision iterations", 1, 3, 2)
+            speculative_analytics = st.checkbox(
+                "Speculative analytics",
+                value=True,
+                help="Run analytics alongside the quality check; the result is discarded if a revision is needed"
+            )
+            variants = st.slider(
+                "Thread variants",
+                1, MAX_VARIANTS, 1,
+                help="Write several drafts in parallel and keep the best; spends more tokens but skips most revision passes"
+            )
+            variant_concurrency = st.slider(
+                "Parallel variant branches",
+                1, MAX_VARIANTS, 3,
+                disabled=variants == 1,
+                help="How many variants are written at the same time"
+            )
+            show_timings = st.checkbox(
+                "Show timing panel",
+                value=False,
+                help="Show per-agent latency, tokens and cache hits after each run"
+            )
+            bypass_cache = st.checkbox(
+                "Force fresh research",
+                value=False,
+                help="Skip cached search results and research summaries"
+            )
+            reuse_similar_research = st.checkbox(
+                "Reuse research from similar topics",
+                value=True,
+                help="Reuse recent research for a reworded topic, e.g. \"the future of AI in healthcare\" after \"AI in healthcare\""
+            )
+        
+        # Model routing; defaults come from TWEETCRAFT_MODEL_ROUTES
+        with st.expander("🧭 Model Routing"):
+            routes = get_model_routes()
+            models = {}
+            for agent in AGENTS:
+                route = routes[agent]
+                options = ROUTABLE_MODELS if route.model in ROUTABLE_MODELS else [route.model] + ROUTABLE_MODELS
+                models[agent] = st.selectbox(
+                    f"{agent.capitalize()} model",
+                    options,
+                    index=options.index(route.model),
+                    help=f"Temperature {route.temperature}" + (f", {route.timeout:g}s timeout" if route.timeout else "")
+                )
         
         customizations = {
             "include_hashtags": include_hashtags,
             "include_analytics": include_analytics,
-            "max_iterations": max_iterations
+            "max_iterations": max_iterations,
+            "speculative_analytics": speculative_analytics,
+            "variants": variants,
+            "variant_concurrency": variant_concurrency,
+            "show_timings": show_timings,
+            "bypass_cache": bypass_cache,
+            "reuse_similar_research": reuse_similar_research,
+            "models": models
         }
         
         return num_tweets, style, word_limit, customizations
\ No newline at end of file
@@ -2,13 +2,28 @@
 TweetCraft utility functions
 """
 
-from .api_keys import validate_openai_api_key, validate_tavily_api_key
-from .text_processing import extract_tweets_from_content, count_words, count_characters
+from .api_keys import (
+    validate_openai_api_key,
+    validate_tavily_api_key,
+    validate_api_keys,
+    invalidate_api_key,
+    invalidate_on_auth_error
+)
+from .text_processing import (
+    extract_tweets_from_content,
+    extract_numbered_tweets,
+    count_words,
+    count_characters
+)
 
 __all__ = [
     "validate_openai_api_key",
     "validate_tavily_api_key", 
+    "validate_api_keys",
+    "invalidate_api_key",
+    "invalidate_on_auth_error",
     "extract_tweets_from_content",
+    "extract_numbered_tweets",
     "count_words",
     "count_characters"
 ]
\ No newline at end of file
@@ -1,21 +1,102 @@
 """
 API key validation utilities for TweetCraft.
+
+The OpenAI, Tavily and requests clients are imported on first use, so
+loading this module stays off the page's first paint.
 """
 
-import openai
-from tavily import TavilyClient
+import hashlib
+import hmac
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Tuple
 
 
-def validate_openai_api_key(api_key: str) -> bool:
+TAVILY_USAGE_URL = "https://api.tavily.com/usage"
+
+# How long a validation result is trusted before the key is checked again
+VALID_KEY_TTL = 15 * 60
+INVALID_KEY_TTL = 60
+
+# Per-process salt so cached fingerprints can't be matched against known keys
+_SALT = os.urandom(16)
+_validation_cache: Dict[str, Tuple[bool, float]] = {}
+_validation_lock = threading.Lock()
+
+
+def _fingerprint(provider: str, api_key: str) -> str:
+    """Salted hash identifying a key without keeping the key itself."""
+    return hmac.new(_SALT, f"{provider}:{api_key}".encode("utf-8"), hashlib.sha256).hexdigest()
+
+
+def _cached_validation(provider: str, api_key: str, check) -> bool:
     """
-    Validate OpenAI API key by attempting to list models.
+    Run a validation check at most once per TTL for a given key.
     
     Args:
-        api_key (str): The OpenAI API key to validate
-        
+        provider (str): Provider name used to namespace the key
+        api_key (str): The API key to validate
+        check: Callable performing the actual network validation
+    
     Returns:
         bool: True if valid, False otherwise
     """
+    fingerprint = _fingerprint(provider, api_key)
+    now = time.time()
+    
+    with _validation_lock:
+        cached = _validation_cache.get(fingerprint)
+    if cached and cached[1] > now:
+        return cached[0]
+    
+    valid = check(api_key)
+    ttl = VALID_KEY_TTL if valid else INVALID_KEY_TTL
+    with _validation_lock:
+        _validation_cache[fingerprint] = (valid, now + ttl)
+    return valid
+
+
+def invalidate_api_key(provider: str, api_key: str):
+    """
+    Drop a cached validation result so the key is checked again.
+    
+    Args:
+        provider (str): ``"openai"`` or ``"tavily"``
+        api_key (str): The API key to forget
+    """
+    with _validation_lock:
+        _validation_cache.pop(_fingerprint(provider, api_key), None)
+
+
+def invalidate_on_auth_error(error: Exception, openai_api_key: str, tavily_api_key: str) -> bool:
+    """
+    Invalidate the cached validation of whichever key an error rejects.
+    
+    Args:
+        error (Exception): Error raised during a run
+        openai_api_key (str): OpenAI API key used for the run
+        tavily_api_key (str): Tavily API key used for the run
+    
+    Returns:
+        bool: True if the error was an authentication failure
+    """
+    import openai
+    from tavily.errors import InvalidAPIKeyError
+    
+    if isinstance(error, openai.AuthenticationError):
+        invalidate_api_key("openai", openai_api_key)
+        return True
+    if isinstance(error, InvalidAPIKeyError):
+        invalidate_api_key("tavily", tavily_api_key)
+        return True
+    return False
+
+
+def _check_openai_api_key(api_key: str) -> bool:
+    import openai
+    
     try:
         client = openai.OpenAI(api_key=api_key)
         client.models.list()
@@ -26,20 +107,67 @@ def validate_openai_api_key(api_key: str) -> bool:
         return False
 
 
+def _check_tavily_api_key(api_key: str) -> bool:
+    import requests
+    
+    # The usage endpoint authenticates the key without spending search credits
+    try:
+        response = requests.get(
+            TAVILY_USAGE_URL,
+            headers={"Authorization": f"Bearer {api_key}"},
+            timeout=10
+        )
+        return response.status_code == 200
+    except Exception:
+        return False
+
+
+def validate_openai_api_key(api_key: str) -> bool:
+    """
+    Validate OpenAI API key by attempting to list models.
+    
+    Results are cached per key for a few minutes.
+    
+    Args:
+        api_key (str): The OpenAI API key to validate
+    
+    Returns:
+        bool: True if valid, False otherwise
+    """
+    return _cached_validation("openai", api_key, _check_openai_api_key)
+
+
 def validate_tavily_api_key(api_key: str) -> bool:
     """
-    Validate Tavily API key by performing a test search.
+    Validate Tavily API key against the account usage endpoint.
+    
+    Results are cached per key for a few minutes.
     
     Args:
         api_key (str): The Tavily API key to validate
-        
+    
     Returns:
         bool: True if valid, False otherwise
     """
-    try:
-        client = TavilyClient(api_key=api_key)
-        # Test with a simple search
-        result = client.search("test", max_results=1)
-        return True
-    except Exception:
-        return False
\ No newline at end of file
+    return _cached_validation("tavily", api_key, _check_tavily_api_key)
+
+
+def validate_api_keys(openai_api_key: str, tavily_api_key: str) -> Tuple[bool, bool]:
+    """
+    Validate both API keys concurrently.
+    
+    Empty keys are reported as invalid without a network call.
+    
+    Args:
+        openai_api_key (str): The OpenAI API key to validate
+        tavily_api_key (str): The Tavily API key to validate
+    
+    Returns:
+        Tuple containing: openai_valid, tavily_valid
+    """
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        openai_future = executor.submit(validate_openai_api_key, openai_api_key) if openai_api_key else None
+        tavily_future = executor.submit(validate_tavily_api_key, tavily_api_key) if tavily_api_key else None
+        openai_valid = openai_future.result() if openai_future else False
+        tavily_valid = tavily_future.result() if tavily_future else False
+    return openai_valid, tavily_valid
\ No newline at end of file
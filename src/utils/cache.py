@@ -0,0 +1,208 @@
+"""
+SQLite-backed key/value cache shared across Streamlit sessions and processes.
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "tweetcraft")
+
+
+def get_cache_dir() -> str:
+    """
+    Resolve the on-disk cache directory.
+    
+    Returns:
+        str: ``TWEETCRAFT_CACHE_DIR`` if set, otherwise ``~/.cache/tweetcraft``
+    """
+    cache_dir = os.environ.get("TWEETCRAFT_CACHE_DIR", DEFAULT_CACHE_DIR)
+    os.makedirs(cache_dir, exist_ok=True)
+    return cache_dir
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize free text so trivially different inputs share a cache key.
+    
+    Args:
+        text (str): Topic or query text
+        
+    Returns:
+        str: Lowercased text with collapsed whitespace and no surrounding punctuation
+    """
+    text = re.sub(r'\s+', ' ', text.lower()).strip()
+    return text.strip(' .,;:!?"\'')
+
+
+def hash_key(*parts: str) -> str:
+    """Build a fixed-length cache key from one or more strings."""
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+class SQLiteCache:
+    """
+    JSON value cache with TTL expiry and LRU eviction over a single namespace.
+    
+    Each thread gets its own connection and the database runs in WAL mode,
+    so several sessions and processes can read and write the same file.
+    """
+    
+    def __init__(self, path: str, namespace: str, ttl_seconds: float, max_entries: int):
+        """
+        Initialize the cache.
+        
+        Args:
+            path (str): SQLite database file
+            namespace (str): Logical partition within the file
+            ttl_seconds (float): Entry lifetime in seconds
+            max_entries (int): Maximum entries kept in this namespace
+        """
+        self.path = path
+        self.namespace = namespace
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        
+        conn = self._connect()
+        with conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS cache_entries (
+                    namespace TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL,
+                    PRIMARY KEY (namespace, key)
+                )
+            """)
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_cache_entries_lru ON cache_entries (namespace, accessed_at)"
+            )
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+    
+    def _count(self, hit: bool):
+        with self._stats_lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+    
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Look up a value, refreshing its LRU position on a hit.
+        
+        Args:
+            key (str): Cache key
+            
+        Returns:
+            Optional[Any]: Cached value, or None if missing or expired
+        """
+        conn = self._connect()
+        now = time.time()
+        row = conn.execute(
+            "SELECT value, created_at FROM cache_entries WHERE namespace = ? AND key = ?",
+            (self.namespace, key)
+        ).fetchone()
+        
+        if row is None:
+            self._count(False)
+            return None
+        
+        value, created_at = row
+        if now - created_at > self.ttl_seconds:
+            conn.execute(
+                "DELETE FROM cache_entries WHERE namespace = ? AND key = ?",
+                (self.namespace, key)
+            )
+            self._count(False)
+            return None
+        
+        conn.execute(
+            "UPDATE cache_entries SET accessed_at = ? WHERE namespace = ? AND key = ?",
+            (now, self.namespace, key)
+        )
+        self._count(True)
+        return json.loads(value)
+    
+    def set(self, key: str, value: Any):
+        """
+        Store a value and evict expired and least recently used entries.
+        
+        Args:
+            key (str): Cache key
+            value (Any): JSON-serializable value
+        """
+        conn = self._connect()
+        now = time.time()
+        payload = json.dumps(value)
+        
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO cache_entries (namespace, key, value, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (self.namespace, key, payload, now, now)
+            )
+            conn.execute(
+                "DELETE FROM cache_entries WHERE namespace = ? AND created_at < ?",
+                (self.namespace, now - self.ttl_seconds)
+            )
+            conn.execute("""
+                DELETE FROM cache_entries WHERE namespace = ? AND key IN (
+                    SELECT key FROM cache_entries WHERE namespace = ?
+                    ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                )
+            """, (self.namespace, self.namespace, self.max_entries))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+    
+    def delete(self, key: str):
+        """Remove a single entry."""
+        self._connect().execute(
+            "DELETE FROM cache_entries WHERE namespace = ? AND key = ?",
+            (self.namespace, key)
+        )
+    
+    def clear(self):
+        """Remove every entry in this namespace."""
+        self._connect().execute("DELETE FROM cache_entries WHERE namespace = ?", (self.namespace,))
+    
+    def stats(self) -> Dict:
+        """
+        Report hit/miss counters for this process and the current entry count.
+        
+        Returns:
+            Dict: hits, misses, hit_rate and entries
+        """
+        entries = self._connect().execute(
+            "SELECT COUNT(*) FROM cache_entries WHERE namespace = ?", (self.namespace,)
+        ).fetchone()[0]
+        with self._stats_lock:
+            hits, misses = self.hits, self.misses
+        total = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / total if total else 0.0,
+            "entries": entries
+        }
@@ -0,0 +1,373 @@
+"""
+SQLite checkpoint store for resumable workflow runs.
+
+Every completed node's state is saved under the run ID (LangGraph's
+``thread_id``), so a run that fails or is interrupted can continue from its
+last completed node instead of starting over. Old runs are removed by age and
+by a cap on the number of runs kept.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, AsyncIterator, Dict, Iterator, Optional, Sequence
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+    get_checkpoint_metadata
+)
+
+from .cache import get_cache_dir
+from .credentials import CREDENTIAL_KEYS
+from .tracing import record_span
+
+
+# Minimum seconds between retention sweeps triggered by writes
+PRUNE_INTERVAL_SECONDS = 60.0
+
+
+class SQLiteCheckpointSaver(BaseCheckpointSaver):
+    """
+    LangGraph checkpointer backed by a SQLite file.
+    
+    Like ``SQLiteCache``, each thread gets its own connection and the database
+    runs in WAL mode so several sessions and processes can share the file.
+    Time spent saving is counted so checkpointing overhead can be reported.
+    """
+    
+    def __init__(self, path: str, ttl_seconds: float = 24 * 3600, max_runs: int = 500, serde=None):
+        """
+        Initialize the store.
+        
+        Args:
+            path (str): SQLite database file
+            ttl_seconds (float): Runs untouched for longer than this are deleted
+            max_runs (int): Most recently updated runs kept; older ones are deleted
+            serde: Serializer, LangGraph's default if omitted
+        """
+        super().__init__(serde=serde)
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_runs = max_runs
+        self.puts = 0
+        self.put_seconds = 0.0
+        self.write_batches = 0
+        self.write_seconds = 0.0
+        self._last_prune = 0.0
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        
+        conn = self._connect()
+        with conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS checkpoints (
+                    thread_id TEXT NOT NULL,
+                    checkpoint_ns TEXT NOT NULL,
+                    checkpoint_id TEXT NOT NULL,
+                    parent_checkpoint_id TEXT,
+                    checkpoint_type TEXT NOT NULL,
+                    checkpoint BLOB NOT NULL,
+                    metadata_type TEXT NOT NULL,
+                    metadata BLOB NOT NULL,
+                    created_at REAL NOT NULL,
+                    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS checkpoint_writes (
+                    thread_id TEXT NOT NULL,
+                    checkpoint_ns TEXT NOT NULL,
+                    checkpoint_id TEXT NOT NULL,
+                    task_id TEXT NOT NULL,
+                    idx INTEGER NOT NULL,
+                    channel TEXT NOT NULL,
+                    value_type TEXT NOT NULL,
+                    value BLOB NOT NULL,
+                    task_path TEXT NOT NULL,
+                    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_checkpoints_created ON checkpoints (thread_id, created_at)")
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+    
+    def _tuple(self, row, conn: sqlite3.Connection) -> CheckpointTuple:
+        thread_id, checkpoint_ns, checkpoint_id, parent_id, checkpoint_type, checkpoint, metadata_type, metadata = row
+        writes = conn.execute(
+            "SELECT task_id, channel, value_type, value FROM checkpoint_writes "
+            "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ? ORDER BY task_id, idx",
+            (thread_id, checkpoint_ns, checkpoint_id)
+        ).fetchall()
+        
+        def config(checkpoint_id: str) -> RunnableConfig:
+            return {"configurable": {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns,
+                                     "checkpoint_id": checkpoint_id}}
+        
+        return CheckpointTuple(
+            config=config(checkpoint_id),
+            checkpoint=self.serde.loads_typed((checkpoint_type, checkpoint)),
+            metadata=self.serde.loads_typed((metadata_type, metadata)),
+            parent_config=config(parent_id) if parent_id else None,
+            pending_writes=[(task_id, channel, self.serde.loads_typed((value_type, value)))
+                            for task_id, channel, value_type, value in writes]
+        )
+    
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        """
+        Fetch a checkpoint, the latest for the run unless the config names one.
+        
+        Args:
+            config (RunnableConfig): Config with ``thread_id`` and optionally ``checkpoint_id``
+        
+        Returns:
+            Optional[CheckpointTuple]: The checkpoint, or None if the run has none
+        """
+        conn = self._connect()
+        configurable = config["configurable"]
+        query = ("SELECT thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, checkpoint_type, "
+                 "checkpoint, metadata_type, metadata FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ?")
+        params = [configurable["thread_id"], configurable.get("checkpoint_ns", "")]
+        
+        checkpoint_id = get_checkpoint_id(config)
+        if checkpoint_id:
+            query += " AND checkpoint_id = ?"
+            params.append(checkpoint_id)
+        else:
+            query += " ORDER BY checkpoint_id DESC LIMIT 1"
+        
+        row = conn.execute(query, params).fetchone()
+        return self._tuple(row, conn) if row else None
+    
+    def list(self, config: Optional[RunnableConfig], *, filter: Optional[Dict[str, Any]] = None,
+             before: Optional[RunnableConfig] = None, limit: Optional[int] = None) -> Iterator[CheckpointTuple]:
+        """
+        List checkpoints, newest first.
+        
+        Args:
+            config (Optional[RunnableConfig]): Restrict to one run (and namespace or checkpoint)
+            filter (Optional[Dict[str, Any]]): Metadata values that must match
+            before (Optional[RunnableConfig]): Only checkpoints older than this one
+            limit (Optional[int]): Maximum checkpoints returned
+        
+        Returns:
+            Iterator[CheckpointTuple]: Matching checkpoints
+        """
+        conn = self._connect()
+        query = ("SELECT thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, checkpoint_type, "
+                 "checkpoint, metadata_type, metadata FROM checkpoints WHERE 1 = 1")
+        params = []
+        
+        if config:
+            configurable = config["configurable"]
+            query += " AND thread_id = ?"
+            params.append(configurable["thread_id"])
+            if configurable.get("checkpoint_ns") is not None:
+                query += " AND checkpoint_ns = ?"
+                params.append(configurable["checkpoint_ns"])
+            if get_checkpoint_id(config):
+                query += " AND checkpoint_id = ?"
+                params.append(get_checkpoint_id(config))
+        if before and get_checkpoint_id(before):
+            query += " AND checkpoint_id < ?"
+            params.append(get_checkpoint_id(before))
+        query += " ORDER BY checkpoint_id DESC"
+        
+        remaining = limit
+        for row in conn.execute(query, params).fetchall():
+            if remaining is not None and remaining <= 0:
+                return
+            checkpoint = self._tuple(row, conn)
+            if filter and any(checkpoint.metadata.get(key) != value for key, value in filter.items()):
+                continue
+            if remaining is not None:
+                remaining -= 1
+            yield checkpoint
+    
+    def put(self, config: RunnableConfig, checkpoint: Checkpoint, metadata: CheckpointMetadata,
+            new_versions: ChannelVersions) -> RunnableConfig:
+        """
+        Save a checkpoint, then run a retention sweep if one is due.
+        
+        Args:
+            config (RunnableConfig): Config of the parent checkpoint
+            checkpoint (Checkpoint): Checkpoint to save
+            metadata (CheckpointMetadata): Checkpoint metadata
+            new_versions (ChannelVersions): Channel versions written by this step
+        
+        Returns:
+            RunnableConfig: Config pointing at the saved checkpoint
+        """
+        started = time.perf_counter()
+        configurable = config["configurable"]
+        thread_id = configurable["thread_id"]
+        checkpoint_ns = configurable.get("checkpoint_ns", "")
+        checkpoint_type, checkpoint_blob = self.serde.dumps_typed(checkpoint)
+        # LangGraph copies the run's configurable values into the metadata, API keys included
+        metadata = {key: value for key, value in get_checkpoint_metadata(config, metadata).items()
+                    if key not in CREDENTIAL_KEYS}
+        metadata_type, metadata_blob = self.serde.dumps_typed(metadata)
+        
+        self._connect().execute(
+            "INSERT OR REPLACE INTO checkpoints (thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, "
+            "checkpoint_type, checkpoint, metadata_type, metadata, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (thread_id, checkpoint_ns, checkpoint["id"], configurable.get("checkpoint_id"),
+             checkpoint_type, checkpoint_blob, metadata_type, metadata_blob, time.time())
+        )
+        
+        duration = time.perf_counter() - started
+        with self._stats_lock:
+            self.puts += 1
+            self.put_seconds += duration
+        record_span("checkpoint", duration=duration, bytes=len(checkpoint_blob))
+        
+        if time.time() - self._last_prune >= PRUNE_INTERVAL_SECONDS:
+            self.prune()
+        
+        return {"configurable": {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns,
+                                 "checkpoint_id": checkpoint["id"]}}
+    
+    def put_writes(self, config: RunnableConfig, writes: Sequence[tuple], task_id: str, task_path: str = ""):
+        """
+        Save the pending writes of a task that finished within a step.
+        
+        Args:
+            config (RunnableConfig): Config of the checkpoint the writes belong to
+            writes (Sequence[tuple]): ``(channel, value)`` pairs
+            task_id (str): Task that produced the writes
+            task_path (str): Path of that task
+        """
+        started = time.perf_counter()
+        configurable = config["configurable"]
+        rows = []
+        for idx, (channel, value) in enumerate(writes):
+            value_type, value_blob = self.serde.dumps_typed(value)
+            rows.append((configurable["thread_id"], configurable.get("checkpoint_ns", ""), configurable["checkpoint_id"],
+                         task_id, WRITES_IDX_MAP.get(channel, idx), channel, value_type, value_blob, task_path))
+        
+        # Special channels (errors, interrupts) replace earlier writes; regular ones are written once
+        verb = "INSERT OR REPLACE" if all(channel in WRITES_IDX_MAP for channel, _ in writes) else "INSERT OR IGNORE"
+        conn = self._connect()
+        with conn:
+            conn.executemany(
+                f"{verb} INTO checkpoint_writes (thread_id, checkpoint_ns, checkpoint_id, task_id, idx, "
+                "channel, value_type, value, task_path) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+        
+        with self._stats_lock:
+            self.write_batches += 1
+            self.write_seconds += time.perf_counter() - started
+    
+    def delete_thread(self, thread_id: str):
+        """Delete every checkpoint and write of a run."""
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM checkpoints WHERE thread_id = ?", (thread_id,))
+            conn.execute("DELETE FROM checkpoint_writes WHERE thread_id = ?", (thread_id,))
+    
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return self.get_tuple(config)
+    
+    async def alist(self, config: Optional[RunnableConfig], *, filter: Optional[Dict[str, Any]] = None,
+                    before: Optional[RunnableConfig] = None, limit: Optional[int] = None) -> AsyncIterator[CheckpointTuple]:
+        for checkpoint in self.list(config, filter=filter, before=before, limit=limit):
+            yield checkpoint
+    
+    async def aput(self, config: RunnableConfig, checkpoint: Checkpoint, metadata: CheckpointMetadata,
+                   new_versions: ChannelVersions) -> RunnableConfig:
+        return self.put(config, checkpoint, metadata, new_versions)
+    
+    async def aput_writes(self, config: RunnableConfig, writes: Sequence[tuple], task_id: str, task_path: str = ""):
+        return self.put_writes(config, writes, task_id, task_path)
+    
+    async def adelete_thread(self, thread_id: str):
+        return self.delete_thread(thread_id)
+    
+    def prune(self) -> int:
+        """
+        Apply the retention policy.
+        
+        Returns:
+            int: Number of runs deleted
+        """
+        self._last_prune = time.time()
+        conn = self._connect()
+        expired = conn.execute("""
+            SELECT thread_id FROM checkpoints GROUP BY thread_id
+            HAVING MAX(created_at) < ?
+            UNION
+            SELECT thread_id FROM (
+                SELECT thread_id, MAX(created_at) AS updated_at FROM checkpoints
+                GROUP BY thread_id ORDER BY updated_at DESC LIMIT -1 OFFSET ?
+            )
+        """, (time.time() - self.ttl_seconds, self.max_runs)).fetchall()
+        
+        for (thread_id,) in expired:
+            self.delete_thread(thread_id)
+        return len(expired)
+    
+    def stats(self) -> Dict:
+        """
+        Report stored runs and time spent saving in this process.
+        
+        Returns:
+            Dict: runs, checkpoints, puts, put time, write batches and write time
+        """
+        runs, checkpoints = self._connect().execute(
+            "SELECT COUNT(DISTINCT thread_id), COUNT(*) FROM checkpoints"
+        ).fetchone()
+        with self._stats_lock:
+            return {
+                "runs": runs,
+                "checkpoints": checkpoints,
+                "puts": self.puts,
+                "put_seconds_total": self.put_seconds,
+                "put_seconds_avg": self.put_seconds / self.puts if self.puts else 0.0,
+                "write_batches": self.write_batches,
+                "write_seconds_total": self.write_seconds
+            }
+
+
+_default_saver = None
+_default_saver_lock = threading.Lock()
+
+
+def get_checkpointer() -> Optional[SQLiteCheckpointSaver]:
+    """
+    Return the process-wide checkpoint store.
+    
+    Configured through ``TWEETCRAFT_CHECKPOINTS`` (set to ``0`` to disable),
+    ``TWEETCRAFT_CHECKPOINT_TTL`` and ``TWEETCRAFT_CHECKPOINT_MAX_RUNS``.
+    
+    Returns:
+        Optional[SQLiteCheckpointSaver]: Shared store, or None when disabled
+    """
+    global _default_saver
+    
+    if os.environ.get("TWEETCRAFT_CHECKPOINTS", "1") == "0":
+        return None
+    
+    with _default_saver_lock:
+        if _default_saver is None:
+            _default_saver = SQLiteCheckpointSaver(
+                os.path.join(get_cache_dir(), "checkpoints.sqlite3"),
+                ttl_seconds=float(os.environ.get("TWEETCRAFT_CHECKPOINT_TTL", 24 * 3600)),
+                max_runs=int(os.environ.get("TWEETCRAFT_CHECKPOINT_MAX_RUNS", 500))
+            )
+        return _default_saver
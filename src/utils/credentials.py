@@ -0,0 +1,222 @@
+"""
+Per-invocation credentials and pooled API clients.
+
+Compiled workflows are shared across sessions, so API keys travel in the
+runnable config (``config["configurable"]``) of each run instead of being
+captured when the graph is built.
+"""
+
+import asyncio
+import hashlib
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+
+# Configurable keys that hold secrets and must never be persisted
+CREDENTIAL_KEYS = ("openai_api_key", "tavily_api_key")
+
+
+def get_credential(name: str, default: Optional[str] = None) -> Optional[str]:
+    """
+    Read a credential from the config of the currently running workflow.
+    
+    Args:
+        name (str): Configurable key, e.g. ``"openai_api_key"``
+        default (Optional[str]): Value used outside a run or when the key is absent
+    
+    Returns:
+        Optional[str]: The credential
+    """
+    # Imported here so building a run config doesn't load langchain_core
+    from langchain_core.runnables.config import ensure_config
+    
+    return ensure_config().get("configurable", {}).get(name) or default
+
+
+def credentials_config(openai_api_key: str, tavily_api_key: str, **configurable) -> Dict:
+    """
+    Build the runnable config that carries credentials into a workflow run.
+    
+    Args:
+        openai_api_key (str): OpenAI API key
+        tavily_api_key (str): Tavily API key
+        **configurable: Additional configurable values
+    
+    Returns:
+        Dict: Config to pass to ``stream``/``invoke``
+    """
+    return {
+        "configurable": {
+            "openai_api_key": openai_api_key,
+            "tavily_api_key": tavily_api_key,
+            **configurable
+        }
+    }
+
+
+def fingerprint(secret: Optional[str]) -> str:
+    """Stable, non-reversible identifier for a secret."""
+    return hashlib.sha256((secret or "").encode("utf-8")).hexdigest()
+
+
+class ClientPool:
+    """Bounded LRU of API clients so connections are reused across runs"""
+    
+    def __init__(self, max_size: int = 32, on_evict: Optional[Callable[[Any], None]] = None):
+        """
+        Initialize the pool.
+        
+        Args:
+            max_size (int): Maximum clients kept alive
+            on_evict (Optional[Callable[[Any], None]]): Called with each client dropped by the LRU
+        """
+        self.max_size = max_size
+        self.on_evict = on_evict
+        self._clients = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """
+        Return the client for a key, creating it on first use.
+        
+        Args:
+            key (Hashable): Pool key, which must not contain raw secrets
+            factory (Callable[[], Any]): Builds the client on a miss
+        
+        Returns:
+            Any: Pooled client
+        """
+        with self._lock:
+            if key in self._clients:
+                self._clients.move_to_end(key)
+                return self._clients[key]
+        
+        client = factory()
+        evicted = []
+        with self._lock:
+            client = self._clients.setdefault(key, client)
+            self._clients.move_to_end(key)
+            while len(self._clients) > self.max_size:
+                evicted.append(self._clients.popitem(last=False)[1])
+        if self.on_evict is not None:
+            for stale in evicted:
+                self.on_evict(stale)
+        return client
+
+
+client_pool = ClientPool()
+
+
+# Close tasks for evicted async clients, referenced until they finish
+_closing = set()
+
+
+def _close_async_client(client: Any):
+    """Close an evicted async client on the running loop its connections belong to."""
+    close = getattr(client, "close", None)
+    if close is None or not asyncio.iscoroutinefunction(close):
+        return
+    task = asyncio.get_running_loop().create_task(close())
+    _closing.add(task)
+    task.add_done_callback(_closing.discard)
+
+
+class LoopClientPool:
+    """
+    Client pools scoped to the running event loop.
+    
+    Async clients hold connections bound to the loop they were first used
+    on, so each loop gets its own LRU. A loop's pool is dropped once the loop
+    is closed or garbage collected, and clients evicted from a live loop's
+    pool are closed on that loop.
+    """
+    
+    def __init__(self, max_size: int = 8):
+        """
+        Initialize the pools.
+        
+        Args:
+            max_size (int): Maximum clients kept alive per loop
+        """
+        self.max_size = max_size
+        self._pools = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+    
+    def get(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """
+        Return the running loop's client for a key, creating it on first use.
+        
+        Must be called from a coroutine.
+        
+        Args:
+            key (Hashable): Pool key, which must not contain raw secrets
+            factory (Callable[[], Any]): Builds the client on a miss
+        
+        Returns:
+            Any: Pooled client
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            # Clients of a closed loop can't be used or closed any more
+            for closed in [other for other in self._pools.keys() if other.is_closed()]:
+                del self._pools[closed]
+            pool = self._pools.get(loop)
+            if pool is None:
+                pool = self._pools[loop] = ClientPool(self.max_size, on_evict=_close_async_client)
+        return pool.get(key, factory)
+
+
+loop_client_pool = LoopClientPool()
+
+
+class PooledChatModel:
+    """
+    Chat model facade that picks a pooled ``ChatOpenAI`` client per run.
+    
+    The OpenAI key comes from the run's config, falling back to the key given
+    at construction.
+    """
+    
+    def __init__(self, model: str, temperature: float, api_key: Optional[str] = None, **client_kwargs):
+        """
+        Initialize the facade.
+        
+        Args:
+            model (str): OpenAI model name
+            temperature (float): Sampling temperature
+            api_key (Optional[str]): Default OpenAI API key
+            **client_kwargs: Extra ``ChatOpenAI`` arguments
+        """
+        self.model_name = model
+        self.temperature = temperature
+        self.api_key = api_key
+        self.client_kwargs = client_kwargs
+    
+    def client(self):
+        """Return the ``ChatOpenAI`` client for the current run's key."""
+        from langchain_openai import ChatOpenAI
+        
+        api_key = get_credential("openai_api_key", self.api_key)
+        key = ("openai", fingerprint(api_key), self.model_name, self.temperature,
+               tuple(sorted(self.client_kwargs.items())))
+        return client_pool.get(key, lambda: ChatOpenAI(
+            model=self.model_name,
+            api_key=api_key,
+            temperature=self.temperature,
+            **self.client_kwargs
+        ))
+    
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.client(), name)
+    
+    def invoke(self, messages: List, config: Optional[Dict] = None, **kwargs):
+        """Invoke the pooled client for the current run."""
+        return self.client().invoke(messages, config, **kwargs)
+    
+    async def ainvoke(self, messages: List, config: Optional[Dict] = None, **kwargs):
+        """Async variant of ``invoke``."""
+        return await self.client().ainvoke(messages, config, **kwargs)
@@ -0,0 +1,62 @@
+"""
+Events reported by agents while a workflow runs.
+
+Agents run on worker threads, away from whoever is showing the run, so they
+report notices (a failed search, an unavailable client) to the listener
+registered for the current run instead of calling a UI directly.
+"""
+
+import contextvars
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+
+from .tracing import current_agent
+
+
+# Called as ``listener(event_type, **payload)``
+EventListener = Callable[..., None]
+
+_current_listener = contextvars.ContextVar("tweetcraft_event_listener", default=None)
+
+
+@contextmanager
+def event_listener(listener: EventListener) -> Iterator[EventListener]:
+    """
+    Deliver events reported in this context to a listener.
+    
+    Args:
+        listener (EventListener): Receives each event as ``listener(event_type, **payload)``
+    
+    Yields:
+        EventListener: The registered listener
+    """
+    token = _current_listener.set(listener)
+    try:
+        yield listener
+    finally:
+        _current_listener.reset(token)
+
+
+def report_event(event_type: str, **payload):
+    """
+    Send an event to the current run's listener; without one it is dropped.
+    
+    Args:
+        event_type (str): Event type, e.g. ``"notice"``
+        **payload: Event fields
+    """
+    listener: Optional[EventListener] = _current_listener.get()
+    if listener is not None:
+        listener(event_type, **payload)
+
+
+def report_notice(level: str, message: str):
+    """
+    Report a message meant for the person watching the run.
+    
+    Args:
+        level (str): ``"info"``, ``"warning"`` or ``"error"``
+        message (str): Message text
+    """
+    if _current_listener.get() is not None:
+        report_event("notice", level=level, message=message, agent=current_agent())
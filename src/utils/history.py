@@ -0,0 +1,311 @@
+"""
+Local history of generated threads with full-text search.
+
+Every finished run is appended to a SQLite table, and an FTS5 index over
+topic, tweets and research keeps text lookup fast. Listings are paged by
+row ID (keyset pagination) rather than OFFSET, so browsing stays quick
+however many threads are stored.
+
+Usage:
+    python -m src.utils.history search "remote work" --style "Casual & Conversational" --since 2026-01-01
+    python -m src.utils.history show 42
+"""
+
+import argparse
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from .cache import get_cache_dir
+
+
+# Columns returned by ``search``; the full state is only loaded by ``get``
+_SUMMARY_COLUMNS = ", ".join(
+    f"threads.{column}"
+    for column in ("id", "created_at", "run_id", "source", "topic", "style", "num_tweets", "quality_score", "tweets")
+)
+
+
+def _match_query(text: str) -> Optional[str]:
+    """
+    Turn free text into an FTS5 query that matches every word as a prefix.
+    
+    Args:
+        text (str): Search text as typed by the user
+    
+    Returns:
+        Optional[str]: FTS5 MATCH expression, or None when the text has no words
+    """
+    words = re.findall(r"\w+", text.lower())
+    if not words:
+        return None
+    return " ".join(f'"{word}"*' for word in words)
+
+
+def _summary(row) -> Dict:
+    thread_id, created_at, run_id, source, topic, style, num_tweets, quality_score, tweets = row
+    return {
+        "id": thread_id,
+        "created_at": created_at,
+        "run_id": run_id,
+        "source": source,
+        "topic": topic,
+        "style": style,
+        "num_tweets": num_tweets,
+        "quality_score": quality_score,
+        "tweets": json.loads(tweets)
+    }
+
+
+class HistoryStore:
+    """
+    Append-only store of final workflow states.
+    
+    Each thread gets its own connection and the database runs in WAL mode,
+    so sessions, batch workers and the service can share one file.
+    """
+    
+    def __init__(self, path: str):
+        """
+        Initialize the store.
+        
+        Args:
+            path (str): SQLite database file
+        """
+        self.path = path
+        self._local = threading.local()
+        
+        conn = self._connect()
+        with conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS threads (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    created_at REAL NOT NULL,
+                    run_id TEXT,
+                    source TEXT NOT NULL,
+                    topic TEXT NOT NULL,
+                    style TEXT NOT NULL,
+                    num_tweets INTEGER NOT NULL,
+                    quality_score REAL,
+                    tweets TEXT NOT NULL,
+                    tweets_text TEXT NOT NULL,
+                    research TEXT NOT NULL,
+                    state TEXT NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_threads_style ON threads (style, id)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_threads_created ON threads (created_at)")
+            # External-content index: the text lives once, in ``threads``, and triggers keep the index in step
+            conn.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS threads_fts USING fts5(
+                    topic, tweets_text, research, content='threads', content_rowid='id'
+                )
+            """)
+            conn.execute("""
+                CREATE TRIGGER IF NOT EXISTS threads_fts_insert AFTER INSERT ON threads BEGIN
+                    INSERT INTO threads_fts (rowid, topic, tweets_text, research)
+                    VALUES (new.id, new.topic, new.tweets_text, new.research);
+                END
+            """)
+            conn.execute("""
+                CREATE TRIGGER IF NOT EXISTS threads_fts_delete AFTER DELETE ON threads BEGIN
+                    INSERT INTO threads_fts (threads_fts, rowid, topic, tweets_text, research)
+                    VALUES ('delete', old.id, old.topic, old.tweets_text, old.research);
+                END
+            """)
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+    
+    def save(self, state: Dict, run_id: Optional[str] = None, source: str = "app") -> int:
+        """
+        Append a finished run.
+        
+        Args:
+            state (Dict): Final ThreadGenerationState
+            run_id (Optional[str]): Job, record or session run ID
+            source (str): Where the run came from (``app``, ``batch`` or ``service``)
+        
+        Returns:
+            int: ID of the stored thread
+        """
+        tweets = state.get("polished_tweets") or []
+        cursor = self._connect().execute(
+            """
+            INSERT INTO threads (created_at, run_id, source, topic, style, num_tweets, quality_score,
+                                 tweets, tweets_text, research, state)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                time.time(),
+                run_id,
+                source,
+                state.get("topic", ""),
+                state.get("style", ""),
+                state.get("num_tweets") or len(tweets),
+                state.get("quality_score"),
+                json.dumps(tweets),
+                "\n".join(tweets),
+                state.get("research_data") or "",
+                json.dumps(state, default=str)
+            )
+        )
+        return cursor.lastrowid
+    
+    def search(self, query: Optional[str] = None, style: Optional[str] = None,
+               since: Optional[float] = None, until: Optional[float] = None,
+               before_id: Optional[int] = None, limit: int = 20) -> List[Dict]:
+        """
+        List stored threads, newest first.
+        
+        Args:
+            query (Optional[str]): Words to find in the topic, tweets or research
+            style (Optional[str]): Only threads in this style
+            since (Optional[float]): Only threads created at or after this Unix time
+            until (Optional[float]): Only threads created before this Unix time
+            before_id (Optional[int]): Page cursor; pass the last ``id`` of the previous page
+            limit (int): Page size
+        
+        Returns:
+            List[Dict]: Thread summaries (no research or full state)
+        """
+        # With a text query the FTS index drives the scan, walking matches newest first,
+        # so the page stops as soon as it is full instead of probing every stored thread
+        match = _match_query(query or "")
+        if match is None:
+            sql = f"SELECT {_SUMMARY_COLUMNS} FROM threads"
+            id_column, conditions, params = "threads.id", [], []
+        else:
+            sql = f"SELECT {_SUMMARY_COLUMNS} FROM threads_fts CROSS JOIN threads ON threads.id = threads_fts.rowid"
+            id_column, conditions, params = "threads_fts.rowid", ["threads_fts MATCH ?"], [match]
+        
+        if before_id is not None:
+            conditions.append(f"{id_column} < ?")
+            params.append(before_id)
+        if style:
+            conditions.append("threads.style = ?")
+            params.append(style)
+        if since is not None:
+            conditions.append("threads.created_at >= ?")
+            params.append(since)
+        if until is not None:
+            conditions.append("threads.created_at < ?")
+            params.append(until)
+        
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += f" ORDER BY {id_column} DESC LIMIT ?"
+        params.append(limit)
+        
+        return [_summary(row) for row in self._connect().execute(sql, params)]
+    
+    def get(self, thread_id: int) -> Optional[Dict]:
+        """
+        Load one stored thread with its full final state.
+        
+        Args:
+            thread_id (int): Stored thread ID
+        
+        Returns:
+            Optional[Dict]: Summary plus ``state``, or None if unknown
+        """
+        row = self._connect().execute(
+            f"SELECT {_SUMMARY_COLUMNS}, threads.state FROM threads WHERE threads.id = ?", (thread_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        return {**_summary(row[:-1]), "state": json.loads(row[-1])}
+    
+    def delete(self, thread_id: int):
+        """Remove a stored thread and its index entry."""
+        self._connect().execute("DELETE FROM threads WHERE id = ?", (thread_id,))
+    
+    def stats(self) -> Dict:
+        """
+        Report how many threads are stored.
+        
+        Returns:
+            Dict: threads and the Unix time of the newest one
+        """
+        count, newest = self._connect().execute("SELECT COUNT(*), MAX(created_at) FROM threads").fetchone()
+        return {"threads": count, "newest": newest}
+
+
+_default_store = None
+_default_store_lock = threading.Lock()
+
+
+def get_history_store() -> Optional[HistoryStore]:
+    """
+    Return the process-wide history store.
+    
+    Configured through ``TWEETCRAFT_HISTORY`` (set to ``0`` to disable).
+    
+    Returns:
+        Optional[HistoryStore]: Shared store, or None when disabled
+    """
+    global _default_store
+    
+    if os.environ.get("TWEETCRAFT_HISTORY", "1") == "0":
+        return None
+    
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = HistoryStore(os.path.join(get_cache_dir(), "history.sqlite3"))
+        return _default_store
+
+
+def _timestamp(date: Optional[str]) -> Optional[float]:
+    return datetime.fromisoformat(date).timestamp() if date else None
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Search previously generated threads.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    
+    search = commands.add_parser("search", help="List matching threads as JSON lines, newest first")
+    search.add_argument("query", nargs="?", help="Words to find in the topic, tweets or research")
+    search.add_argument("--style", help="Only threads in this style")
+    search.add_argument("--since", help="Only threads created on or after this ISO date")
+    search.add_argument("--until", help="Only threads created before this ISO date")
+    search.add_argument("--before", type=int, help="Page cursor: the last ID of the previous page")
+    search.add_argument("--limit", type=int, default=20)
+    
+    show = commands.add_parser("show", help="Print one thread's full final state as JSON")
+    show.add_argument("id", type=int)
+    args = parser.parse_args(argv)
+    
+    store = get_history_store()
+    if store is None:
+        parser.error("History is disabled (TWEETCRAFT_HISTORY=0)")
+    
+    if args.command == "show":
+        thread = store.get(args.id)
+        if thread is None:
+            print(f"No thread with ID {args.id}", file=sys.stderr)
+            return 1
+        print(json.dumps(thread, indent=2))
+        return 0
+    
+    for thread in store.search(args.query, args.style, _timestamp(args.since), _timestamp(args.until),
+                               args.before, args.limit):
+        print(json.dumps(thread))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,212 @@
+"""
+Exact-match response cache placed in front of the chat model.
+"""
+
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from langchain_core.messages import BaseMessage, message_to_dict, messages_from_dict
+
+from .cache import SQLiteCache, get_cache_dir, hash_key
+from .credentials import fingerprint, get_credential
+from .tracing import annotate_span
+
+
+class LLMResponseCache:
+    """Two-tier response store: a bounded in-memory LRU over a SQLite cache"""
+    
+    def __init__(self, disk_cache: Optional[SQLiteCache] = None, max_memory_entries: int = 512):
+        """
+        Initialize the response cache.
+        
+        Args:
+            disk_cache (Optional[SQLiteCache]): Persistent tier, or None for memory only
+            max_memory_entries (int): Maximum responses kept in memory
+        """
+        self.disk_cache = disk_cache
+        self.max_memory_entries = max_memory_entries
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def _remember(self, key: str, value: Dict):
+        with self._lock:
+            self._memory[key] = value
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_memory_entries:
+                self._memory.popitem(last=False)
+    
+    def get(self, key: str) -> Optional[Dict]:
+        """
+        Look up a serialized response, promoting disk hits into memory.
+        
+        Args:
+            key (str): Cache key
+        
+        Returns:
+            Optional[Dict]: Serialized message, or None on a miss
+        """
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return self._memory[key]
+        
+        value = self.disk_cache.get(key) if self.disk_cache else None
+        if value is not None:
+            self._remember(key, value)
+            with self._lock:
+                self.disk_hits += 1
+            return value
+        
+        with self._lock:
+            self.misses += 1
+        return None
+    
+    def set(self, key: str, value: Dict):
+        """Store a serialized response in both tiers."""
+        self._remember(key, value)
+        if self.disk_cache:
+            self.disk_cache.set(key, value)
+    
+    def stats(self) -> Dict:
+        """
+        Report cache counters.
+        
+        Returns:
+            Dict: memory_hits, disk_hits, misses, hit_rate and memory_entries
+        """
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            total = hits + self.misses
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": hits / total if total else 0.0,
+                "memory_entries": len(self._memory)
+            }
+
+
+class CachedChatModel:
+    """
+    Wraps a chat model so identical requests are answered from cache.
+    
+    Responses are keyed on model, temperature, call options, a fingerprint of
+    the run's OpenAI key (so sessions with different keys never share
+    completions) and a hash of the message list. Calls with ``temperature > 0`` are only cached when
+    ``cache_nondeterministic`` is set, since their output is expected to vary.
+    Anything other than ``invoke``/``ainvoke`` is delegated to the wrapped model.
+    """
+    
+    def __init__(self, llm, cache: LLMResponseCache, cache_nondeterministic: bool = False):
+        """
+        Initialize the wrapper.
+        
+        Args:
+            llm: Language model instance
+            cache (LLMResponseCache): Response store
+            cache_nondeterministic (bool): Also cache calls made with temperature > 0
+        """
+        self.llm = llm
+        self.cache = cache
+        self.cache_nondeterministic = cache_nondeterministic
+    
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.llm, name)
+    
+    def _cache_key(self, messages: List[BaseMessage], config: Optional[Dict], kwargs: Dict) -> Optional[str]:
+        """Build the cache key, or return None when the call must not be cached."""
+        temperature = kwargs.get("temperature", getattr(self.llm, "temperature", None))
+        if temperature and not self.cache_nondeterministic:
+            return None
+        
+        model = getattr(self.llm, "model_name", None) or type(self.llm).__name__
+        serialized = json.dumps([message_to_dict(message) for message in messages], sort_keys=True)
+        options = json.dumps(kwargs, sort_keys=True, default=str)
+        # An explicit config wins over the one of the run this call is part of
+        api_key = (config or {}).get("configurable", {}).get("openai_api_key") or get_credential("openai_api_key")
+        account = fingerprint(api_key)
+        return hash_key(model, str(temperature), options, account, serialized)
+    
+    def invoke(self, messages: List[BaseMessage], config: Optional[Dict] = None, **kwargs) -> BaseMessage:
+        """
+        Invoke the model, serving exact repeats from cache.
+        
+        Args:
+            messages (List[BaseMessage]): Prompt messages
+            config (Optional[Dict]): Runnable config passed through to the model
+            **kwargs: Call options passed through to the model
+        
+        Returns:
+            BaseMessage: Model response
+        """
+        key = self._cache_key(messages, config, kwargs)
+        if key is None:
+            return self.llm.invoke(messages, config, **kwargs)
+        
+        cached = self.cache.get(key)
+        if cached is not None:
+            annotate_span(cache_hit=True)
+            return messages_from_dict([cached])[0]
+        
+        response = self.llm.invoke(messages, config, **kwargs)
+        self.cache.set(key, message_to_dict(response))
+        return response
+    
+    async def ainvoke(self, messages: List[BaseMessage], config: Optional[Dict] = None, **kwargs) -> BaseMessage:
+        """Async variant of ``invoke``."""
+        key = self._cache_key(messages, config, kwargs)
+        if key is None:
+            return await self.llm.ainvoke(messages, config, **kwargs)
+        
+        cached = self.cache.get(key)
+        if cached is not None:
+            annotate_span(cache_hit=True)
+            return messages_from_dict([cached])[0]
+        
+        response = await self.llm.ainvoke(messages, config, **kwargs)
+        self.cache.set(key, message_to_dict(response))
+        return response
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> Optional[LLMResponseCache]:
+    """
+    Return the process-wide LLM response cache.
+    
+    Configured through ``TWEETCRAFT_LLM_CACHE`` (set to ``0`` to disable),
+    ``TWEETCRAFT_LLM_CACHE_TTL``, ``TWEETCRAFT_LLM_CACHE_MAX_ENTRIES`` and
+    ``TWEETCRAFT_LLM_CACHE_MEMORY_ENTRIES``.
+    
+    Returns:
+        Optional[LLMResponseCache]: Shared cache, or None when disabled
+    """
+    global _default_cache
+    
+    if os.environ.get("TWEETCRAFT_LLM_CACHE", "1") == "0":
+        return None
+    
+    with _default_cache_lock:
+        if _default_cache is None:
+            disk_cache = SQLiteCache(
+                os.path.join(get_cache_dir(), "llm.sqlite3"),
+                "llm",
+                ttl_seconds=float(os.environ.get("TWEETCRAFT_LLM_CACHE_TTL", 7 * 24 * 3600)),
+                max_entries=int(os.environ.get("TWEETCRAFT_LLM_CACHE_MAX_ENTRIES", 20000))
+            )
+            _default_cache = LLMResponseCache(
+                disk_cache,
+                max_memory_entries=int(os.environ.get("TWEETCRAFT_LLM_CACHE_MEMORY_ENTRIES", 512))
+            )
+        return _default_cache
\ No newline at end of file
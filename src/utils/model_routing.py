@@ -0,0 +1,149 @@
+"""
+Per-agent model routing.
+
+Each agent gets its own model, temperature and request timeout, so cheap
+structured steps (supervisor scoring, analytics JSON) can run on a smaller,
+faster model than the writing steps. Routes come from ``DEFAULT_MODEL_ROUTES``,
+overridden by a JSON file or inline JSON in ``TWEETCRAFT_MODEL_ROUTES``:
+    
+    {"default": {"model": "gpt-4o"}, "supervisor": {"model": "gpt-4o-mini", "temperature": 0.2, "timeout": 20}}
+"""
+
+import json
+import os
+from typing import Dict, NamedTuple, Optional
+
+
+AGENTS = ("research", "strategy", "writer", "editor", "supervisor", "analytics")
+
+# Models offered in the sidebar; any OpenAI chat model name works in a routes file
+ROUTABLE_MODELS = ["gpt-4o", "gpt-4o-mini", "gpt-4.1", "gpt-4.1-mini", "gpt-4.1-nano"]
+
+# USD per million (prompt, completion) tokens, used for the cost estimates in traces
+MODEL_PRICES = {
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4.1": (2.00, 8.00),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1-nano": (0.10, 0.40)
+}
+
+
+class ModelRoute(NamedTuple):
+    """Model settings for one agent"""
+    model: str
+    temperature: float
+    timeout: Optional[float] = None
+
+
+DEFAULT_ROUTE = ModelRoute("gpt-4o", 0.7)
+
+# Scoring and analytics produce short structured output, so they run on the small model
+DEFAULT_MODEL_ROUTES = {
+    **{agent: DEFAULT_ROUTE for agent in AGENTS},
+    "supervisor": ModelRoute("gpt-4o-mini", 0.2, 30),
+    "analytics": ModelRoute("gpt-4o-mini", 0.3, 30)
+}
+
+
+def parse_model_routes(spec: Dict, base: Optional[Dict[str, ModelRoute]] = None) -> Dict[str, ModelRoute]:
+    """
+    Apply a routes specification on top of existing routes.
+    
+    Args:
+        spec (Dict): Mapping of agent name (or ``"default"``, applied to every agent
+            first) to ``model``, ``temperature`` and ``timeout`` overrides
+        base (Optional[Dict[str, ModelRoute]]): Routes to override, defaults to ``DEFAULT_MODEL_ROUTES``
+    
+    Returns:
+        Dict[str, ModelRoute]: Route for every agent
+    
+    Raises:
+        ValueError: If the spec names an unknown agent or route field
+    """
+    routes = dict(base or DEFAULT_MODEL_ROUTES)
+    unknown = set(spec) - set(AGENTS) - {"default"}
+    if unknown:
+        raise ValueError(f"Unknown agents in model routes: {', '.join(sorted(unknown))}")
+    
+    for name in ["default"] + [agent for agent in AGENTS if agent in spec]:
+        overrides = spec.get(name)
+        if not overrides:
+            continue
+        fields = set(overrides) - set(ModelRoute._fields)
+        if fields:
+            raise ValueError(f"Unknown model route fields for {name}: {', '.join(sorted(fields))}")
+        for agent in (AGENTS if name == "default" else [name]):
+            routes[agent] = routes[agent]._replace(**overrides)
+    return routes
+
+
+def load_model_routes(source: str, base: Optional[Dict[str, ModelRoute]] = None) -> Dict[str, ModelRoute]:
+    """
+    Read a routes specification from a JSON file or an inline JSON object.
+    
+    Args:
+        source (str): Path to a JSON file, or JSON text starting with ``{``
+        base (Optional[Dict[str, ModelRoute]]): Routes to override, defaults to ``DEFAULT_MODEL_ROUTES``
+    
+    Returns:
+        Dict[str, ModelRoute]: Route for every agent
+    """
+    source = source.strip()
+    if not source.startswith("{"):
+        with open(source, "r", encoding="utf-8") as f:
+            source = f.read()
+    return parse_model_routes(json.loads(source), base)
+
+
+def get_model_routes() -> Dict[str, ModelRoute]:
+    """
+    Return the routes configured through ``TWEETCRAFT_MODEL_ROUTES``.
+    
+    Returns:
+        Dict[str, ModelRoute]: Route for every agent
+    """
+    configured = os.environ.get("TWEETCRAFT_MODEL_ROUTES", "").strip()
+    if not configured:
+        return dict(DEFAULT_MODEL_ROUTES)
+    return load_model_routes(configured)
+
+
+def with_models(routes: Dict[str, ModelRoute], models: Optional[Dict[str, str]]) -> Dict[str, ModelRoute]:
+    """
+    Swap the model of some agents, keeping their temperature and timeout.
+    
+    Args:
+        routes (Dict[str, ModelRoute]): Current routes
+        models (Optional[Dict[str, str]]): Agent name to model name
+    
+    Returns:
+        Dict[str, ModelRoute]: Updated routes
+    """
+    return {
+        agent: route._replace(model=(models or {}).get(agent) or route.model)
+        for agent, route in routes.items()
+    }
+
+
+def estimate_cost(model: Optional[str], prompt_tokens: int, completion_tokens: int) -> float:
+    """
+    Estimate the USD cost of an LLM call.
+    
+    Args:
+        model (Optional[str]): Model name as reported by the client
+        prompt_tokens (int): Prompt tokens
+        completion_tokens (int): Completion tokens
+    
+    Returns:
+        float: Estimated cost, 0.0 for models without a known price
+    """
+    prices = MODEL_PRICES.get(model or "")
+    if prices is None:
+        # Dated snapshots, e.g. "gpt-4o-mini-2024-07-18", are priced like their base model
+        matches = [name for name in MODEL_PRICES if (model or "").startswith(name + "-")]
+        if not matches:
+            return 0.0
+        prices = MODEL_PRICES[max(matches, key=len)]
+    prompt_price, completion_price = prices
+    return (prompt_tokens * prompt_price + completion_tokens * completion_price) / 1_000_000
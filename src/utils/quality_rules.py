@@ -0,0 +1,94 @@
+"""
+Deterministic quality rules for tweet threads.
+
+Mechanical failures (wrong tweet count, empty, over-long or duplicated tweets)
+are caught locally so the supervisor can send a thread back for revision
+without spending an LLM call on it.
+"""
+
+import re
+from typing import Dict, List, Optional
+
+from .text_processing import count_characters, count_words
+
+
+# Hard platform limit on tweet length
+TWEET_CHAR_LIMIT = 280
+
+# Word-set overlap above which two tweets count as duplicates
+DUPLICATE_SIMILARITY = 0.8
+
+HARD_RULE_PENALTY = 3.0
+SOFT_RULE_PENALTY = 0.5
+
+_EMOJI = re.compile("[\U0001F300-\U0001FAFF☀-➿]")
+_CALL_TO_ACTION = re.compile(r"\?|\b(follow|share|comment|reply|retweet|repost|subscribe|join|try|read|learn|check out)\b",
+                             re.IGNORECASE)
+
+
+def _words(text: str) -> set:
+    return set(re.findall(r"\w+", text.lower()))
+
+
+def _violation(rule: str, message: str, tweet: Optional[int] = None, hard: bool = True) -> Dict:
+    return {"rule": rule, "message": message, "tweet": tweet, "hard": hard}
+
+
+def check_thread(tweets: List[str], num_tweets: int, word_limit: int) -> Dict:
+    """
+    Score a thread against the local rules.
+    
+    Hard rules (count, empty, word limit, character limit, duplicates) mean
+    the thread must be revised; soft rules (emojis, closing call to action)
+    only lower the score.
+    
+    Args:
+        tweets (List[str]): Polished tweets
+        num_tweets (int): Requested number of tweets
+        word_limit (int): Maximum words per tweet
+    
+    Returns:
+        Dict: ``score`` (0-10), ``violations``, ``hard_failure`` and the 0-based
+        ``failing_tweets`` that broke a per-tweet hard rule
+    """
+    violations = []
+    
+    if len(tweets) != num_tweets:
+        violations.append(_violation("count", f"Thread has {len(tweets)} tweets, expected {num_tweets}"))
+    
+    seen = []
+    for i, tweet in enumerate(tweets):
+        if not tweet.strip():
+            violations.append(_violation("empty", "Tweet is empty", i))
+            continue
+        
+        words = count_words(tweet)
+        if words > word_limit:
+            violations.append(_violation("word_limit", f"Tweet has {words} words, limit is {word_limit}", i))
+        
+        characters = count_characters(tweet)
+        if characters > TWEET_CHAR_LIMIT:
+            violations.append(_violation("char_limit", f"Tweet has {characters} characters, limit is {TWEET_CHAR_LIMIT}", i))
+        
+        word_set = _words(tweet)
+        for j, other in seen:
+            overlap = len(word_set & other) / max(1, len(word_set | other))
+            if overlap >= DUPLICATE_SIMILARITY:
+                violations.append(_violation("duplicate", f"Tweet repeats tweet {j + 1}", i))
+                break
+        seen.append((i, word_set))
+    
+    if tweets and not any(_EMOJI.search(tweet) for tweet in tweets):
+        violations.append(_violation("emoji", "Thread has no emojis", hard=False))
+    if tweets and not _CALL_TO_ACTION.search(tweets[-1]):
+        violations.append(_violation("call_to_action", "Last tweet has no call to action", len(tweets) - 1, hard=False))
+    
+    hard = [violation for violation in violations if violation["hard"]]
+    penalty = HARD_RULE_PENALTY * len(hard) + SOFT_RULE_PENALTY * (len(violations) - len(hard))
+    
+    return {
+        "score": max(0.0, 10.0 - penalty),
+        "violations": violations,
+        "hard_failure": bool(hard),
+        "failing_tweets": sorted({violation["tweet"] for violation in hard if violation["tweet"] is not None})
+    }
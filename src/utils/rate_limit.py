@@ -0,0 +1,398 @@
+"""
+Process-wide rate limiting and retry with backoff for OpenAI and Tavily calls.
+
+Every agent's LLM calls and every search share one limiter per provider, so
+concurrent sessions queue locally instead of bursting into provider 429s.
+"""
+
+import asyncio
+import os
+import random
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from .research_context import estimate_tokens
+from .tracing import increment_span
+
+
+# Retry hint in a provider's error message, e.g. "retry after 12 seconds" or "try again in 500ms"
+_RETRY_HINT = re.compile(
+    r"(?:retry|try again)\s+(?:after|in)\s+(\d+(?:\.\d+)?)\s*(ms|milliseconds?|s|secs?|seconds?)?\b",
+    re.IGNORECASE
+)
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at a per-minute rate"""
+    
+    def __init__(self, per_minute: float, capacity: Optional[float] = None):
+        """
+        Initialize the bucket.
+        
+        Args:
+            per_minute (float): Refill rate per minute
+            capacity (Optional[float]): Burst size, defaults to one minute's worth
+        """
+        self.rate = per_minute / 60.0
+        self.capacity = capacity or per_minute
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+    
+    def reserve(self, amount: float, now: float) -> float:
+        """
+        Take ``amount`` from the bucket, going into debt if needed.
+        
+        Must be called under the owner's lock. Requests larger than the
+        capacity are clamped so they can't wait forever.
+        
+        Returns:
+            float: Seconds the caller must wait before proceeding
+        """
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= min(amount, self.capacity)
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+
+class ProviderLimiter:
+    """Requests/min and tokens/min limits plus throttling metrics for one provider"""
+    
+    def __init__(self, name: str, requests_per_minute: float, tokens_per_minute: Optional[float] = None):
+        """
+        Initialize the limiter.
+        
+        Args:
+            name (str): Provider name, used in metrics
+            requests_per_minute (float): Request budget
+            tokens_per_minute (Optional[float]): Token budget, or None for providers billed per request
+        """
+        self.name = name
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.calls = 0
+        self.throttled = 0
+        self.queue_seconds = 0.0
+        self.max_queue_seconds = 0.0
+        self.rate_limit_errors = 0
+        self.retries = 0
+        self._lock = threading.Lock()
+    
+    def reserve(self, tokens: int = 0) -> float:
+        """
+        Reserve capacity for one call.
+        
+        Args:
+            tokens (int): Estimated tokens the call will consume
+        
+        Returns:
+            float: Seconds to wait before making the call
+        """
+        with self._lock:
+            now = time.monotonic()
+            delay = self.requests.reserve(1, now)
+            if self.tokens is not None and tokens:
+                delay = max(delay, self.tokens.reserve(tokens, now))
+            self.calls += 1
+            if delay > 0:
+                self.throttled += 1
+                self.queue_seconds += delay
+                self.max_queue_seconds = max(self.max_queue_seconds, delay)
+            return delay
+    
+    def acquire(self, tokens: int = 0) -> float:
+        """Block until the call may proceed, returning the seconds waited."""
+        delay = self.reserve(tokens)
+        if delay > 0:
+            time.sleep(delay)
+        increment_span(queue_seconds=delay)
+        return delay
+    
+    async def aacquire(self, tokens: int = 0) -> float:
+        """Wait without blocking the event loop until the call may proceed."""
+        delay = self.reserve(tokens)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        increment_span(queue_seconds=delay)
+        return delay
+    
+    def record_rate_limit(self, retried: bool):
+        """Count a provider 429 and whether it will be retried."""
+        with self._lock:
+            self.rate_limit_errors += 1
+            if retried:
+                self.retries += 1
+        if retried:
+            increment_span(retries=1)
+    
+    def metrics(self) -> Dict:
+        """
+        Report throttling metrics.
+        
+        Returns:
+            Dict: Call, throttling, queueing delay and 429 counters
+        """
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "throttled": self.throttled,
+                "throttle_rate": self.throttled / self.calls if self.calls else 0.0,
+                "queue_seconds_total": self.queue_seconds,
+                "queue_seconds_avg": self.queue_seconds / self.calls if self.calls else 0.0,
+                "queue_seconds_max": self.max_queue_seconds,
+                "rate_limit_errors": self.rate_limit_errors,
+                "retries": self.retries
+            }
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """Whether an error is a provider 429."""
+    import openai
+    from tavily.errors import UsageLimitExceededError
+    
+    return isinstance(error, (openai.RateLimitError, UsageLimitExceededError))
+
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """
+    Read the server's requested delay from a provider error.
+    
+    OpenAI errors carry the response and its ``Retry-After`` headers. Tavily
+    errors have no response: the hint is read from their ``retry_after_seconds``
+    attribute (keyless limit errors) or from a "retry after N seconds" style
+    message; without either, callers fall back to plain backoff.
+    
+    Args:
+        error (Exception): Provider error
+    
+    Returns:
+        Optional[float]: Seconds to wait, or None if the server didn't say
+    """
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000
+        if headers.get("retry-after"):
+            return float(headers["retry-after"])
+        if getattr(error, "retry_after_seconds", None) is not None:
+            return float(error.retry_after_seconds)
+    except (TypeError, ValueError):
+        pass
+    
+    match = _RETRY_HINT.search(str(error))
+    if match:
+        return float(match.group(1)) / (1000 if match.group(2) and match.group(2).startswith("m") else 1)
+    return None
+
+
+def backoff_delay(attempt: int, retry_after: Optional[float] = None,
+                  base: float = 1.0, cap: float = 60.0) -> float:
+    """
+    Exponential backoff with full jitter, never shorter than ``retry_after``.
+    
+    Args:
+        attempt (int): Zero-based retry attempt
+        retry_after (Optional[float]): Server-requested delay
+        base (float): Delay scale for the first retry
+        cap (float): Maximum delay
+    
+    Returns:
+        float: Seconds to wait
+    """
+    delay = random.uniform(0, min(cap, base * (2 ** attempt)))
+    if retry_after is not None:
+        delay = max(delay, min(retry_after, cap))
+    return delay
+
+
+def _message_tokens(messages: List, max_completion_tokens: int) -> int:
+    """Estimated tokens a chat call will consume, prompt plus completion."""
+    prompt = "\n".join(str(getattr(message, "content", message)) for message in messages)
+    return estimate_tokens(prompt) + max_completion_tokens
+
+
+class RateLimitedChatModel:
+    """
+    Wraps a chat model with the shared limiter and retries 429s with backoff.
+    
+    Anything other than ``invoke``/``ainvoke`` is delegated to the wrapped model.
+    """
+    
+    def __init__(self, llm, limiter: ProviderLimiter, max_retries: int = 5,
+                 expected_completion_tokens: int = 600):
+        """
+        Initialize the wrapper.
+        
+        Args:
+            llm: Language model instance
+            limiter (ProviderLimiter): Shared OpenAI limiter
+            max_retries (int): Retries after a 429 before giving up
+            expected_completion_tokens (int): Completion tokens assumed when reserving the token budget
+        """
+        self.llm = llm
+        self.limiter = limiter
+        self.max_retries = max_retries
+        self.expected_completion_tokens = expected_completion_tokens
+    
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.llm, name)
+    
+    def _expected_tokens(self, messages: List, kwargs: Dict) -> int:
+        return _message_tokens(messages, kwargs.get("max_tokens") or self.expected_completion_tokens)
+    
+    def invoke(self, messages: List, config: Optional[Dict] = None, **kwargs):
+        """Invoke the model once the shared budget allows, retrying 429s."""
+        tokens = self._expected_tokens(messages, kwargs)
+        for attempt in range(self.max_retries + 1):
+            self.limiter.acquire(tokens)
+            try:
+                return self.llm.invoke(messages, config, **kwargs)
+            except Exception as e:
+                if not is_rate_limit_error(e) or attempt == self.max_retries:
+                    if is_rate_limit_error(e):
+                        self.limiter.record_rate_limit(retried=False)
+                    raise
+                self.limiter.record_rate_limit(retried=True)
+                time.sleep(backoff_delay(attempt, retry_after_seconds(e)))
+    
+    async def ainvoke(self, messages: List, config: Optional[Dict] = None, **kwargs):
+        """Async variant of ``invoke``."""
+        tokens = self._expected_tokens(messages, kwargs)
+        for attempt in range(self.max_retries + 1):
+            await self.limiter.aacquire(tokens)
+            try:
+                return await self.llm.ainvoke(messages, config, **kwargs)
+            except Exception as e:
+                if not is_rate_limit_error(e) or attempt == self.max_retries:
+                    if is_rate_limit_error(e):
+                        self.limiter.record_rate_limit(retried=False)
+                    raise
+                self.limiter.record_rate_limit(retried=True)
+                await asyncio.sleep(backoff_delay(attempt, retry_after_seconds(e)))
+
+
+class RateLimitedSearchClient:
+    """Wraps a synchronous Tavily-compatible client with the shared limiter"""
+    
+    def __init__(self, client, limiter: ProviderLimiter, max_retries: int = 3):
+        """
+        Initialize the wrapper.
+        
+        Args:
+            client: Search client with a Tavily-compatible ``search``
+            limiter (ProviderLimiter): Shared Tavily limiter
+            max_retries (int): Retries after a 429 before giving up
+        """
+        self.client = client
+        self.limiter = limiter
+        self.max_retries = max_retries
+    
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.client, name)
+    
+    def search(self, query: str, **kwargs) -> Dict:
+        """Search once the shared budget allows, retrying 429s."""
+        for attempt in range(self.max_retries + 1):
+            self.limiter.acquire()
+            try:
+                return self.client.search(query, **kwargs)
+            except Exception as e:
+                if not is_rate_limit_error(e) or attempt == self.max_retries:
+                    if is_rate_limit_error(e):
+                        self.limiter.record_rate_limit(retried=False)
+                    raise
+                self.limiter.record_rate_limit(retried=True)
+                time.sleep(backoff_delay(attempt, retry_after_seconds(e)))
+
+
+class AsyncRateLimitedSearchClient(RateLimitedSearchClient):
+    """Wraps an async Tavily-compatible client with the shared limiter"""
+    
+    async def search(self, query: str, **kwargs) -> Dict:
+        """Search once the shared budget allows, retrying 429s."""
+        for attempt in range(self.max_retries + 1):
+            await self.limiter.aacquire()
+            try:
+                return await self.client.search(query, **kwargs)
+            except Exception as e:
+                if not is_rate_limit_error(e) or attempt == self.max_retries:
+                    if is_rate_limit_error(e):
+                        self.limiter.record_rate_limit(retried=False)
+                    raise
+                self.limiter.record_rate_limit(retried=True)
+                await asyncio.sleep(backoff_delay(attempt, retry_after_seconds(e)))
+
+
+def rate_limited_search_client(client, limiter: Optional[ProviderLimiter]):
+    """
+    Wrap a search client with the limiter, keeping it sync or async as it was.
+    
+    Args:
+        client: Search client with a Tavily-compatible ``search``
+        limiter (Optional[ProviderLimiter]): Shared limiter, or None to leave the client as is
+    
+    Returns:
+        Wrapped client
+    """
+    if limiter is None:
+        return client
+    if asyncio.iscoroutinefunction(client.search):
+        return AsyncRateLimitedSearchClient(client, limiter)
+    return RateLimitedSearchClient(client, limiter)
+
+
+# Defaults sit well under typical tier limits; raise them to match your account
+_LIMIT_DEFAULTS = {
+    "openai": {"rpm": 500, "tpm": 300000},
+    "tavily": {"rpm": 100, "tpm": None}
+}
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(provider: str) -> Optional[ProviderLimiter]:
+    """
+    Return the process-wide limiter for a provider.
+    
+    Configured through ``TWEETCRAFT_RATE_LIMIT`` (set to ``0`` to disable),
+    ``TWEETCRAFT_<PROVIDER>_RPM`` and ``TWEETCRAFT_OPENAI_TPM``.
+    
+    Args:
+        provider (str): ``"openai"`` or ``"tavily"``
+    
+    Returns:
+        Optional[ProviderLimiter]: Shared limiter, or None when disabled
+    """
+    if os.environ.get("TWEETCRAFT_RATE_LIMIT", "1") == "0":
+        return None
+    
+    with _limiters_lock:
+        if provider not in _limiters:
+            defaults = _LIMIT_DEFAULTS[provider]
+            prefix = f"TWEETCRAFT_{provider.upper()}"
+            tpm = os.environ.get(f"{prefix}_TPM", defaults["tpm"])
+            _limiters[provider] = ProviderLimiter(
+                provider,
+                requests_per_minute=float(os.environ.get(f"{prefix}_RPM", defaults["rpm"])),
+                tokens_per_minute=float(tpm) if tpm else None
+            )
+        return _limiters[provider]
+
+
+def rate_limit_metrics() -> Dict:
+    """
+    Report metrics for every limiter created so far.
+    
+    Returns:
+        Dict: Provider name to limiter metrics
+    """
+    with _limiters_lock:
+        limiters = dict(_limiters)
+    return {provider: limiter.metrics() for provider, limiter in limiters.items()}
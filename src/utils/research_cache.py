@@ -0,0 +1,120 @@
+"""
+Persistent cache for Tavily search results and synthesized research.
+"""
+
+import os
+import threading
+from typing import Dict, List, Optional
+
+from .cache import SQLiteCache, get_cache_dir, hash_key, normalize_text
+from .topic_index import TopicIndex
+
+
+class ResearchCache:
+    """
+    Caches raw results per search query and research summaries per (topic, style),
+    with a similarity index so reworded topics can reuse a summary too
+    """
+    
+    def __init__(self, path: str, ttl_seconds: float = 6 * 3600, max_entries: int = 5000,
+                 similar_topic_threshold: Optional[float] = 0.6, max_topics: int = 100000):
+        """
+        Initialize the research cache.
+        
+        Args:
+            path (str): SQLite database file
+            ttl_seconds (float): Lifetime of cached searches and summaries
+            max_entries (int): Maximum entries kept for each of searches and summaries
+            similar_topic_threshold (Optional[float]): Similarity (0-1) at which a reworded topic
+                reuses another topic's summary; None disables the similarity index
+            max_topics (int): Maximum topics kept in the similarity index
+        """
+        self.searches = SQLiteCache(path, "search", ttl_seconds, max_entries)
+        self.research = SQLiteCache(path, "research", ttl_seconds, max_entries)
+        self.topics = None
+        if similar_topic_threshold is not None:
+            self.topics = TopicIndex(path, ttl_seconds, max_topics, similar_topic_threshold)
+    
+    def get_search(self, query: str) -> Optional[List[Dict]]:
+        """Return cached results for a search query."""
+        return self.searches.get(hash_key(normalize_text(query)))
+    
+    def set_search(self, query: str, results: List[Dict]):
+        """Store results for a search query."""
+        self.searches.set(hash_key(normalize_text(query)), results)
+    
+    def get_research(self, topic: str, style: str) -> Optional[str]:
+        """Return a cached research summary for a topic and style."""
+        return self.research.get(hash_key(normalize_text(topic), style))
+    
+    def set_research(self, topic: str, style: str, research_data: str):
+        """Store a research summary for a topic and style."""
+        self.research.set(hash_key(normalize_text(topic), style), research_data)
+        if self.topics is not None:
+            self.topics.add(topic, style, research_data)
+    
+    def find_similar_research(self, topic: str, style: str) -> Optional[Dict]:
+        """
+        Find a fresh summary researched for a near-duplicate topic.
+        
+        Args:
+            topic (str): Topic to research
+            style (str): Thread style
+        
+        Returns:
+            Optional[Dict]: Matched ``topic``, its ``research`` and the ``similarity``, or None
+        """
+        if self.topics is None:
+            return None
+        return self.topics.find(topic, style)
+    
+    def stats(self) -> Dict:
+        """
+        Report cache counters.
+        
+        Returns:
+            Dict: Stats for the ``search`` and ``research`` namespaces and the similarity index
+        """
+        stats = {
+            "search": self.searches.stats(),
+            "research": self.research.stats()
+        }
+        if self.topics is not None:
+            stats["similar_topics"] = self.topics.stats()
+        return stats
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_research_cache() -> Optional[ResearchCache]:
+    """
+    Return the process-wide research cache.
+    
+    Configured through ``TWEETCRAFT_RESEARCH_CACHE`` (set to ``0`` to disable),
+    ``TWEETCRAFT_RESEARCH_CACHE_TTL``, ``TWEETCRAFT_RESEARCH_CACHE_MAX_ENTRIES``,
+    ``TWEETCRAFT_SIMILAR_TOPICS`` (set to ``0`` to disable reuse across reworded topics),
+    ``TWEETCRAFT_SIMILAR_TOPIC_THRESHOLD`` and ``TWEETCRAFT_SIMILAR_TOPIC_MAX_ENTRIES``.
+    
+    Returns:
+        Optional[ResearchCache]: Shared cache, or None when disabled
+    """
+    global _default_cache
+    
+    if os.environ.get("TWEETCRAFT_RESEARCH_CACHE", "1") == "0":
+        return None
+    
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = ResearchCache(
+                os.path.join(get_cache_dir(), "research.sqlite3"),
+                ttl_seconds=float(os.environ.get("TWEETCRAFT_RESEARCH_CACHE_TTL", 6 * 3600)),
+                max_entries=int(os.environ.get("TWEETCRAFT_RESEARCH_CACHE_MAX_ENTRIES", 5000)),
+                similar_topic_threshold=(
+                    float(os.environ.get("TWEETCRAFT_SIMILAR_TOPIC_THRESHOLD", 0.6))
+                    if os.environ.get("TWEETCRAFT_SIMILAR_TOPICS", "1") != "0" else None
+                ),
+                max_topics=int(os.environ.get("TWEETCRAFT_SIMILAR_TOPIC_MAX_ENTRIES", 100000))
+            )
+        return _default_cache
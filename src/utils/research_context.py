@@ -0,0 +1,118 @@
+"""
+Research normalization: turns raw search results into a compact prompt context.
+"""
+
+import hashlib
+import re
+from functools import lru_cache
+from typing import Dict, List, Tuple
+from urllib.parse import urlsplit, urlunsplit
+
+
+@lru_cache(maxsize=1)
+def _get_encoding():
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("o200k_base")
+    except Exception:
+        return None
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of prompt tokens in a text.
+    
+    Uses tiktoken when its encoding is available and roughly four characters
+    per token otherwise.
+    
+    Args:
+        text (str): Text to measure
+        
+    Returns:
+        int: Token count
+    """
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return (len(text) + 3) // 4
+
+
+def _normalize_url(url: str) -> str:
+    """Canonical form of a URL for deduplication."""
+    parts = urlsplit(url.strip())
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip('/'), parts.query, ''))
+
+
+def _content_hash(content: str) -> str:
+    """Hash of whitespace- and case-normalized content."""
+    return hashlib.sha1(re.sub(r'\s+', ' ', content.lower()).strip().encode("utf-8")).hexdigest()
+
+
+def _trim(text: str, max_chars: int) -> str:
+    """Trim text to a word boundary."""
+    text = re.sub(r'\s+', ' ', text).strip()
+    if len(text) <= max_chars:
+        return text
+    return text[:max_chars].rsplit(' ', 1)[0] + "…"
+
+
+def build_research_context(results: List[Dict], token_budget: int = 1500,
+                           max_content_chars: int = 600) -> Tuple[str, Dict]:
+    """
+    Deduplicate, rank and trim search results into a prompt context.
+    
+    Results are deduplicated by URL and by content, ordered by relevance score
+    and added until the token budget is used up. Only title, URL and trimmed
+    content are kept.
+    
+    Args:
+        results (List[Dict]): Raw Tavily results
+        token_budget (int): Maximum tokens for the context
+        max_content_chars (int): Maximum characters of content per result
+        
+    Returns:
+        Tuple containing: context text, normalization stats
+    """
+    seen_urls = set()
+    seen_content = set()
+    unique = []
+    
+    for result in results:
+        url = _normalize_url(result.get("url", ""))
+        content = result.get("content", "") or ""
+        digest = _content_hash(content)
+        if (url and url in seen_urls) or (content and digest in seen_content):
+            continue
+        seen_urls.add(url)
+        seen_content.add(digest)
+        unique.append(result)
+    
+    # sorted() is stable, so equal scores keep query order
+    ranked = sorted(unique, key=lambda result: result.get("score") or 0.0, reverse=True)
+    
+    entries = []
+    used_tokens = 0
+    for result in ranked:
+        entry = (
+            f"[{len(entries) + 1}] {result.get('title', '').strip()} ({result.get('url', '')})\n"
+            f"{_trim(result.get('content', '') or '', max_content_chars)}"
+        )
+        entry_tokens = estimate_tokens(entry)
+        if used_tokens + entry_tokens > token_budget:
+            continue
+        entries.append(entry)
+        used_tokens += entry_tokens
+    
+    context = "\n\n".join(entries)
+    raw_tokens = estimate_tokens(str(results))
+    context_tokens = estimate_tokens(context)
+    
+    stats = {
+        "raw_results": len(results),
+        "unique_results": len(unique),
+        "included_results": len(entries),
+        "raw_tokens": raw_tokens,
+        "context_tokens": context_tokens,
+        "tokens_saved": max(raw_tokens - context_tokens, 0)
+    }
+    return context, stats
@@ -0,0 +1,144 @@
+"""
+Schema-constrained LLM calls with a single bounded repair retry.
+
+The schema travels as an OpenAI ``response_format`` call option, so it passes
+through the cache, rate limiter and instrumentation wrappers like any other
+option. Replies are still validated locally, since stand-in models and
+truncated completions can break the contract.
+"""
+
+import functools
+import re
+from typing import Dict, List, Optional, Tuple, Type, TypeVar
+
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
+from langchain_core.utils.function_calling import convert_to_openai_function
+from pydantic import BaseModel, ValidationError
+
+from .tracing import annotate_span, span
+
+
+Model = TypeVar("Model", bound=BaseModel)
+
+_FENCE = re.compile(r"^\s*```(?:json)?\s*(.*?)\s*```\s*$", re.DOTALL)
+
+
+@functools.lru_cache(maxsize=None)
+def response_format(schema: Type[BaseModel]) -> Dict:
+    """
+    Build the strict JSON schema ``response_format`` for a result model.
+    
+    Args:
+        schema (Type[BaseModel]): Result model
+    
+    Returns:
+        Dict: OpenAI ``response_format`` call option
+    """
+    function = convert_to_openai_function(schema, strict=True)
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": function["name"],
+            "description": function.get("description", ""),
+            "schema": function["parameters"],
+            "strict": True
+        }
+    }
+
+
+def parse_output(schema: Type[Model], text: str) -> Model:
+    """
+    Validate a JSON reply against a result model.
+    
+    Args:
+        schema (Type[Model]): Result model
+        text (str): Model reply, optionally wrapped in a code fence
+    
+    Returns:
+        Model: Parsed result
+    
+    Raises:
+        ValueError: If the reply is not valid JSON for the schema
+    """
+    fenced = _FENCE.match(text)
+    return schema.model_validate_json(fenced.group(1) if fenced else text.strip())
+
+
+def _call_options(schema: Type[BaseModel], max_tokens: int, constrained: bool) -> Dict:
+    options = {"max_tokens": max_tokens}
+    if constrained:
+        options["response_format"] = response_format(schema)
+    return options
+
+
+def _repair_messages(messages: List[BaseMessage], reply: str, error: Exception) -> List[BaseMessage]:
+    """Ask once more, showing the model its invalid reply and what was wrong with it."""
+    if isinstance(error, ValidationError):
+        problems = "; ".join(f"{'.'.join(map(str, issue['loc']))}: {issue['msg']}" for issue in error.errors()[:5])
+    else:
+        problems = str(error)
+    return messages + [
+        AIMessage(content=reply),
+        HumanMessage(content=f"That reply was not valid JSON for the requested format ({problems}). "
+                             f"Reply again with only the JSON object, keeping every text field short.")
+    ]
+
+
+def _result(schema: Type[Model], reply: str) -> Tuple[Optional[Model], Optional[Exception]]:
+    try:
+        return parse_output(schema, reply), None
+    except ValueError as e:
+        return None, e
+
+
+def invoke_structured(llm, messages: List[BaseMessage], schema: Type[Model], max_tokens: int,
+                      constrained: bool = True) -> Tuple[Optional[Model], str]:
+    """
+    Call the model for a structured result, repairing an invalid reply at most once.
+    
+    Args:
+        llm: Chat model (or wrapper)
+        messages (List[BaseMessage]): Prompt messages, which should describe the JSON shape
+        schema (Type[Model]): Result model
+        max_tokens (int): Completion token cap for each attempt
+        constrained (bool): Send the schema as ``response_format``; turn off for models
+            without structured output support
+    
+    Returns:
+        Tuple[Optional[Model], str]: Parsed result (None if both attempts failed) and the last reply
+    """
+    options = _call_options(schema, max_tokens, constrained)
+    with span("structured", schema=schema.__name__):
+        reply = llm.invoke(messages, **options).content
+        result, error = _result(schema, reply)
+        if error is not None:
+            reply = llm.invoke(_repair_messages(messages, reply, error), **options).content
+            result, error = _result(schema, reply)
+            annotate_span(repaired=error is None, failed=error is not None)
+        return result, reply
+
+
+async def ainvoke_structured(llm, messages: List[BaseMessage], schema: Type[Model], max_tokens: int,
+                             constrained: bool = True) -> Tuple[Optional[Model], str]:
+    """
+    Async variant of ``invoke_structured``.
+    
+    Args:
+        llm: Chat model (or wrapper)
+        messages (List[BaseMessage]): Prompt messages, which should describe the JSON shape
+        schema (Type[Model]): Result model
+        max_tokens (int): Completion token cap for each attempt
+        constrained (bool): Send the schema as ``response_format``
+    
+    Returns:
+        Tuple[Optional[Model], str]: Parsed result (None if both attempts failed) and the last reply
+    """
+    options = _call_options(schema, max_tokens, constrained)
+    with span("structured", schema=schema.__name__):
+        reply = (await llm.ainvoke(messages, **options)).content
+        result, error = _result(schema, reply)
+        if error is not None:
+            reply = (await llm.ainvoke(_repair_messages(messages, reply, error), **options)).content
+            result, error = _result(schema, reply)
+            annotate_span(repaired=error is None, failed=error is not None)
+        return result, reply
@@ -3,40 +3,215 @@ Text processing utilities for tweet extraction and formatting.
 """
 
 import re
-from typing import List
+from typing import Dict, List, Optional, Tuple
+
+
+# A line that opens a tweet: "3.", "3)", "3/", "3/8", "Tweet 3:" or "**3.**", with the text after it.
+# Markers are only recognized at the start of a line.
+_TWEET_MARKER = re.compile(
+    r'^\s*[*_#>]*\s*'
+    r'(?:tweet\s*(?P<tweet>\d{1,3})(?:\s*/\s*\d{1,3})?\s*[*_]*\s*[.:)\-–]?'
+    r'|(?P<number>\d{1,3})(?:\s*/\s*(?P<total>\d{1,3})|\.(?!\d)|\s*[):/]))'
+    r'[*_]*\s*(?P<text>.*)$',
+    re.IGNORECASE
+)
+
+# Text after the last tweet that still belongs to it: hashtags, mentions and links
+_TWEET_TAIL = re.compile(r'^\s*(?:(?:[#@]\w+|https?://\S+)\s*)*$')
+
+
+class TweetStreamParser:
+    """
+    Splits model output into numbered tweets as it streams in.
+    
+    Feed chunks as they arrive; each tweet is returned as soon as the next
+    one starts, and the last one on ``close``. Lines without a number continue
+    the current tweet, so multi-line tweets are kept whole; the last tweet ends
+    at a blank line followed by anything other than hashtags, mentions or
+    links, so closing remarks from the model aren't published. Problems such as a
+    wrong count or gaps in the numbering are collected in ``issues`` rather
+    than papered over.
+    """
+    
+    def __init__(self, expected_count: Optional[int] = None, sequential: bool = True):
+        """
+        Initialize the parser.
+        
+        Args:
+            expected_count (Optional[int]): Number of tweets the output should contain
+            sequential (bool): Only start a new tweet on a number higher than the last one,
+                so numbered lists inside a tweet stay part of it. Disable for targeted
+                revisions, which return an arbitrary subset of tweet numbers.
+        """
+        self.expected_count = expected_count
+        self.sequential = sequential
+        self.numbered = {}
+        # Numbers of the completed tweets in the order they were written, repeats included
+        self.completed_numbers = []
+        self.issues = []
+        self._buffer = ""
+        self._current = None
+        self._closed = False
+    
+    @property
+    def tweets(self) -> List[str]:
+        """Completed tweets in the order they were written."""
+        return list(self.numbered.values())
+    
+    def feed(self, chunk: str) -> List[str]:
+        """
+        Add streamed text.
+        
+        Args:
+            chunk (str): Next piece of model output
+        
+        Returns:
+            List[str]: Tweets completed by this chunk
+        """
+        self._buffer += chunk
+        *lines, self._buffer = self._buffer.split('\n')
+        completed = []
+        for line in lines:
+            completed += self._line(line)
+        
+        # The current tweet is done as soon as the next one visibly starts, even mid-line
+        if self._current is not None and self._starts_tweet(self._buffer):
+            completed += self._finish()
+        return completed
+    
+    def close(self) -> List[str]:
+        """
+        Finish parsing and check the result.
+        
+        Returns:
+            List[str]: The final tweet, if one was still open
+        """
+        if self._closed:
+            return []
+        self._closed = True
+        
+        completed = self._line(self._buffer)
+        self._buffer = ""
+        completed += self._finish(last=True)
+        
+        if not self.numbered:
+            self.issues.append("No numbered tweets found")
+        elif self.expected_count is not None and len(self.numbered) != self.expected_count:
+            self.issues.append(f"Found {len(self.numbered)} tweets, expected {self.expected_count}")
+        return completed
+    
+    def _last_number(self) -> int:
+        return self._current[0] if self._current is not None else max(self.numbered, default=0)
+    
+    def _opens_tweet(self, match: re.Match) -> bool:
+        """Whether a marker starts a new tweet rather than continuing the current one."""
+        number = int(match.group("tweet") or match.group("number"))
+        last = self._last_number()
+        if match.group("total"):
+            # A bare "N/M" is as likely to be a rating ("10/10") as a marker, so it has to fit the thread
+            if number > int(match.group("total")) or (self.sequential and number != last + 1):
+                return False
+        return not self.sequential or number > last
+    
+    def _starts_tweet(self, partial_line: str) -> bool:
+        match = _TWEET_MARKER.match(partial_line)
+        return bool(match and match.group("text") and self._opens_tweet(match))
+    
+    def _line(self, line: str) -> List[str]:
+        match = _TWEET_MARKER.match(line)
+        if match and self._opens_tweet(match):
+            number = int(match.group("tweet") or match.group("number"))
+            last = self._last_number()
+            completed = self._finish()
+            if self.sequential and number != last + 1:
+                self.issues.append(f"Tweet {number} follows tweet {last}")
+            self._current = (number, [match.group("text")])
+            return completed
+        
+        if self._current is not None:
+            self._current[1].append(line)
+        return []
+    
+    def _finish(self, last: bool = False) -> List[str]:
+        if self._current is None:
+            return []
+        number, lines = self._current
+        self._current = None
+        
+        if last:
+            lines = self._without_closing_remarks(lines)
+        text = '\n'.join(line.rstrip() for line in lines).strip().strip('*').strip()
+        if not text:
+            self.issues.append(f"Tweet {number} is empty")
+            return []
+        if number in self.numbered:
+            self.issues.append(f"Tweet {number} appears more than once")
+        self.numbered[number] = text
+        self.completed_numbers.append(number)
+        return [text]
+    
+    @staticmethod
+    def _without_closing_remarks(lines: List[str]) -> List[str]:
+        """Cut the last tweet at the first blank line followed by text that isn't part of a tweet."""
+        for index in range(1, len(lines)):
+            if lines[index].strip() or not lines[index - 1].strip():
+                continue
+            if not all(_TWEET_TAIL.match(line) for line in lines[index + 1:]):
+                return lines[:index]
+        return lines
+
+
+def parse_tweets(content: str, expected_count: Optional[int] = None) -> Tuple[List[str], List[str]]:
+    """
+    Parse complete model output into tweets.
+    
+    Args:
+        content (str): The content containing numbered tweets
+        expected_count (Optional[int]): Expected number of tweets
+    
+    Returns:
+        Tuple[List[str], List[str]]: The tweets, and any problems found while parsing
+    """
+    parser = TweetStreamParser(expected_count)
+    parser.feed(content)
+    parser.close()
+    return parser.tweets, parser.issues
 
 
 def extract_tweets_from_content(content: str, expected_count: int) -> List[str]:
     """
     Extract individual tweets from AI-generated content.
     
+    Malformed output yields fewer tweets rather than guessed ones; use
+    ``parse_tweets`` to find out what was wrong with it.
+    
     Args:
         content (str): The content containing numbered tweets
         expected_count (int): Expected number of tweets
-        
+    
     Returns:
         List[str]: List of extracted tweet texts
     """
-    lines = content.strip().split('\n')
-    tweets = []
-    
-    for line in lines:
-        line = line.strip()
-        if line and (line[0].isdigit() or line.startswith('Tweet')):
-            # Remove numbering and clean up
-            tweet = re.sub(r'^\d+\.?\s*', '', line)
-            tweet = re.sub(r'^Tweet\s*\d+:?\s*', '', tweet, flags=re.IGNORECASE)
-            if tweet:
-                tweets.append(tweet.strip())
-    
-    # Ensure we have the right number of tweets
-    if len(tweets) != expected_count:
-        # Fallback: split content more aggressively
-        all_text = content.replace('\n', ' ')
-        sentences = [s.strip() for s in all_text.split('.') if s.strip()]
-        tweets = sentences[:expected_count]
-    
-    return tweets[:expected_count]
+    return parse_tweets(content, expected_count)[0][:expected_count]
+
+
+def extract_numbered_tweets(content: str) -> Dict[int, str]:
+    """
+    Extract tweets keyed by the number the model gave them.
+    
+    Used for targeted revisions, where the model returns only some tweets of
+    a thread under their original numbers.
+    
+    Args:
+        content (str): The content containing numbered tweets
+    
+    Returns:
+        Dict[int, str]: Tweet text by 1-based tweet number
+    """
+    parser = TweetStreamParser(sequential=False)
+    parser.feed(content)
+    parser.close()
+    return parser.numbered
 
 
 def count_words(text: str) -> int:
@@ -0,0 +1,370 @@
+"""
+Near-duplicate topic index for reusing research across similar topics.
+
+Topics are reduced to content-word sets and summarized as MinHash
+signatures. Each LSH band keeps its keys in a sorted NumPy array, so a
+lookup is a binary search per band followed by vectorized signature
+scoring of the few candidates that share a band. Recent additions sit in a
+small unsorted tail that is scanned directly and merged in periodically;
+pruned entries are masked out and compacted away once they make up half
+the arrays.
+"""
+
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional, Set
+
+import numpy as np
+
+from .cache import normalize_text
+
+
+# 20 bands of 3 rows: topics at similarity 0.6 share a band over 99% of the time, at 0.2 only 15%
+BANDS = 20
+ROWS_PER_BAND = 3
+NUM_PERMUTATIONS = BANDS * ROWS_PER_BAND
+
+# Unsorted entries allowed before they are merged into the sorted bands
+MERGE_THRESHOLD = 2048
+
+# Words that change the phrasing of a topic but not what needs researching
+STOPWORDS = {
+    "a", "an", "the", "and", "or", "of", "in", "on", "for", "to", "with", "about", "how", "why",
+    "what", "is", "are", "its", "it", "this", "that", "future", "role", "impact", "rise", "state",
+    "guide", "intro", "introduction", "overview", "explained", "vs", "versus"
+}
+
+_rng = np.random.default_rng(20240611)
+_HASH_A = _rng.integers(1, 2 ** 63, size=NUM_PERMUTATIONS, dtype=np.uint64) | np.uint64(1)
+_HASH_B = _rng.integers(0, 2 ** 63, size=NUM_PERMUTATIONS, dtype=np.uint64)
+_BAND_MIX = _rng.integers(1, 2 ** 63, size=ROWS_PER_BAND, dtype=np.uint64) | np.uint64(1)
+
+
+def topic_terms(topic: str) -> Set[str]:
+    """
+    Reduce a topic to the content words that identify it.
+    
+    Args:
+        topic (str): Topic text
+    
+    Returns:
+        Set[str]: Lowercased words without stopwords or a plural ``s``
+    """
+    terms = set()
+    for word in re.findall(r"\w+", normalize_text(topic)):
+        if word in STOPWORDS:
+            continue
+        if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        terms.add(word)
+    return terms
+
+
+def minhash(terms: Set[str]) -> np.ndarray:
+    """
+    MinHash signature of a term set.
+    
+    Args:
+        terms (Set[str]): Non-empty term set
+    
+    Returns:
+        np.ndarray: ``NUM_PERMUTATIONS`` uint32 values
+    """
+    hashes = np.array(
+        [int.from_bytes(hashlib.blake2b(term.encode("utf-8"), digest_size=8).digest(), "little") for term in terms],
+        dtype=np.uint64
+    )
+    # Multiply-shift hashing; uint64 arithmetic wraps, which is the point
+    permuted = (np.outer(hashes, _HASH_A) + _HASH_B) >> np.uint64(32)
+    return permuted.min(axis=0).astype(np.uint32)
+
+
+def _band_keys(signatures: np.ndarray) -> np.ndarray:
+    """Collapse each band of ``ROWS_PER_BAND`` signature values into one uint64 key."""
+    bands = signatures.reshape(*signatures.shape[:-1], BANDS, ROWS_PER_BAND).astype(np.uint64)
+    return (bands * _BAND_MIX).sum(axis=-1)
+
+
+class TopicIndex:
+    """
+    Persistent MinHash/LSH index of researched topics.
+    
+    Entries live in SQLite so every process shares them; each process keeps
+    the signatures in memory and picks up other processes' additions on its
+    next lookup.
+    """
+    
+    def __init__(self, path: str, ttl_seconds: float = 6 * 3600, max_entries: int = 100000,
+                 threshold: float = 0.6):
+        """
+        Initialize the index.
+        
+        Args:
+            path (str): SQLite database file
+            ttl_seconds (float): Age after which an entry's research is no longer reused
+            max_entries (int): Maximum entries kept (oldest are pruned first)
+            threshold (float): Estimated Jaccard similarity at which two topics count as the same
+        """
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self.lookups = 0
+        self.hits = 0
+        self.lookup_seconds = 0.0
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._last_prune = 0.0
+        self._reset()
+        
+        conn = self._connect()
+        with conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS topic_index (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    topic TEXT NOT NULL,
+                    style TEXT NOT NULL,
+                    signature BLOB NOT NULL,
+                    research TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_topic_index_created ON topic_index (created_at)")
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+    
+    def _reset(self):
+        """Drop the in-memory arrays so the next lookup reloads every entry."""
+        self._size = 0
+        self._sorted_size = 0
+        self._removed = 0
+        self._ids = np.empty(0, dtype=np.int64)
+        self._live = np.empty(0, dtype=bool)
+        self._created = np.empty(0, dtype=np.float64)
+        self._styles = np.empty(0, dtype=object)
+        self._signatures = np.empty((0, NUM_PERMUTATIONS), dtype=np.uint32)
+        self._band_keys = np.empty((BANDS, 0), dtype=np.uint64)
+        self._band_rows = np.empty((BANDS, 0), dtype=np.int32)
+        self._loaded_id = 0
+    
+    def _grow(self, needed: int):
+        """Double the per-entry array capacity until ``needed`` entries fit. Caller holds the lock."""
+        capacity = max(len(self._ids), 1024)
+        while capacity < needed:
+            capacity *= 2
+        if capacity == len(self._ids):
+            return
+        
+        def resized(array: np.ndarray) -> np.ndarray:
+            grown = np.zeros((capacity,) + array.shape[1:], dtype=array.dtype)
+            grown[:self._size] = array[:self._size]
+            return grown
+        
+        self._ids = resized(self._ids)
+        self._live = resized(self._live)
+        self._created = resized(self._created)
+        self._styles = resized(self._styles)
+        self._signatures = resized(self._signatures)
+    
+    def _merge(self):
+        """Merge the unsorted tail into the sorted band arrays. Caller holds the lock."""
+        rows = np.arange(self._sorted_size, self._size, dtype=np.int32)
+        keys = _band_keys(self._signatures[self._sorted_size:self._size]).T
+        order = np.argsort(keys, axis=1)
+        keys = np.take_along_axis(keys, order, axis=1)
+        rows = rows[order]
+        
+        merged_keys = np.empty((BANDS, self._size), dtype=np.uint64)
+        merged_rows = np.empty((BANDS, self._size), dtype=np.int32)
+        for band in range(BANDS):
+            positions = np.searchsorted(self._band_keys[band], keys[band])
+            merged_keys[band] = np.insert(self._band_keys[band], positions, keys[band])
+            merged_rows[band] = np.insert(self._band_rows[band], positions, rows[band])
+        self._band_keys, self._band_rows = merged_keys, merged_rows
+        self._sorted_size = self._size
+    
+    def _remove(self, removed: np.ndarray):
+        """
+        Mask out deleted rows, compacting once they are half the arrays. Caller holds the lock.
+        
+        Args:
+            removed (np.ndarray): Boolean mask over the loaded rows
+        """
+        removed &= self._live[:self._size]
+        self._live[:self._size] &= ~removed
+        self._removed += int(removed.sum())
+        if self._removed * 2 < self._size:
+            return
+        
+        # Rebuild the bands from the live rows already in memory rather than reloading them
+        keep = np.flatnonzero(self._live[:self._size])
+        self._ids = self._ids[keep]
+        self._live = self._live[keep]
+        self._created = self._created[keep]
+        self._styles = self._styles[keep]
+        self._signatures = self._signatures[keep]
+        self._size = len(keep)
+        self._sorted_size = 0
+        self._removed = 0
+        self._band_keys = np.empty((BANDS, 0), dtype=np.uint64)
+        self._band_rows = np.empty((BANDS, 0), dtype=np.int32)
+        self._merge()
+    
+    def _refresh(self):
+        """Load entries added since the last lookup, by this or any other process. Caller holds the lock."""
+        rows = self._connect().execute(
+            "SELECT id, style, signature, created_at FROM topic_index WHERE id > ? ORDER BY id",
+            (self._loaded_id,)
+        ).fetchall()
+        if not rows:
+            return
+        
+        start, end = self._size, self._size + len(rows)
+        self._grow(end)
+        self._ids[start:end] = [row[0] for row in rows]
+        self._live[start:end] = True
+        self._styles[start:end] = [row[1] for row in rows]
+        self._created[start:end] = [row[3] for row in rows]
+        self._signatures[start:end] = np.frombuffer(
+            b"".join(row[2] for row in rows), dtype=np.uint32
+        ).reshape(len(rows), NUM_PERMUTATIONS)
+        self._size = end
+        self._loaded_id = rows[-1][0]
+        
+        if self._size - self._sorted_size >= MERGE_THRESHOLD:
+            self._merge()
+    
+    def _candidates(self, signature: np.ndarray) -> np.ndarray:
+        """Rows sharing at least one whole band with ``signature``. Caller holds the lock."""
+        keys = _band_keys(signature)
+        matches = []
+        for band in range(BANDS):
+            sorted_keys = self._band_keys[band]
+            low = np.searchsorted(sorted_keys, keys[band], side="left")
+            high = np.searchsorted(sorted_keys, keys[band], side="right")
+            matches.append(self._band_rows[band, low:high])
+        
+        tail = _band_keys(self._signatures[self._sorted_size:self._size])
+        matches.append(self._sorted_size + np.flatnonzero((tail == keys).any(axis=1)))
+        return np.unique(np.concatenate(matches))
+    
+    def add(self, topic: str, style: str, research: str):
+        """
+        Index a topic's research.
+        
+        Args:
+            topic (str): Researched topic
+            style (str): Thread style the research was synthesized for
+            research (str): Research summary
+        """
+        terms = topic_terms(topic)
+        if not terms:
+            return
+        
+        now = time.time()
+        self._connect().execute(
+            "INSERT INTO topic_index (topic, style, signature, research, created_at) VALUES (?, ?, ?, ?, ?)",
+            (topic, style, minhash(terms).tobytes(), research, now)
+        )
+        if now - self._last_prune >= 60:
+            self.prune()
+    
+    def find(self, topic: str, style: str) -> Optional[Dict]:
+        """
+        Find fresh research for the most similar indexed topic.
+        
+        Args:
+            topic (str): New topic
+            style (str): Thread style; only research for the same style is returned
+        
+        Returns:
+            Optional[Dict]: ``topic``, ``research`` and estimated ``similarity`` of the
+            best match at or above the threshold, or None
+        """
+        terms = topic_terms(topic)
+        if not terms:
+            return None
+        
+        started = time.perf_counter()
+        signature = minhash(terms)
+        match = None
+        with self._lock:
+            self._refresh()
+            candidates = self._candidates(signature)
+            candidates = candidates[
+                self._live[candidates] & (self._styles[candidates] == style) &
+                (self._created[candidates] >= time.time() - self.ttl_seconds)
+            ]
+            if len(candidates):
+                similarities = (self._signatures[candidates] == signature).mean(axis=1)
+                best = int(np.argmax(similarities))
+                if similarities[best] >= self.threshold:
+                    match = (int(self._ids[candidates[best]]), float(similarities[best]))
+        
+        if match is not None:
+            entry_id, similarity = match
+            row = self._connect().execute(
+                "SELECT topic, research FROM topic_index WHERE id = ?", (entry_id,)
+            ).fetchone()
+            match = {"topic": row[0], "research": row[1], "similarity": similarity} if row else None
+        
+        with self._lock:
+            self.lookups += 1
+            self.hits += match is not None
+            self.lookup_seconds += time.perf_counter() - started
+        return match
+    
+    def prune(self):
+        """Remove expired entries and the oldest beyond ``max_entries``."""
+        now = time.time()
+        self._last_prune = now
+        cutoff = now - self.ttl_seconds
+        conn = self._connect()
+        deleted = conn.execute("DELETE FROM topic_index WHERE created_at < ?", (cutoff,)).rowcount
+        
+        # Everything at or below the newest id past the cap goes, which the in-memory rows can mirror
+        boundary = conn.execute(
+            "SELECT id FROM topic_index ORDER BY id DESC LIMIT 1 OFFSET ?", (self.max_entries,)
+        ).fetchone()
+        boundary_id = boundary[0] if boundary else 0
+        if boundary:
+            deleted += conn.execute("DELETE FROM topic_index WHERE id <= ?", (boundary_id,)).rowcount
+        
+        if deleted:
+            with self._lock:
+                self._remove((self._created[:self._size] < cutoff) | (self._ids[:self._size] <= boundary_id))
+    
+    def clear(self):
+        """Remove every entry."""
+        self._connect().execute("DELETE FROM topic_index")
+        with self._lock:
+            self._reset()
+    
+    def stats(self) -> Dict:
+        """
+        Report lookup counters for this process and the current entry count.
+        
+        Returns:
+            Dict: entries, lookups, hits, hit_rate and avg_lookup_ms
+        """
+        entries = self._connect().execute("SELECT COUNT(*) FROM topic_index").fetchone()[0]
+        with self._lock:
+            lookups, hits, seconds = self.lookups, self.hits, self.lookup_seconds
+        return {
+            "entries": entries,
+            "lookups": lookups,
+            "hits": hits,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "avg_lookup_ms": seconds / lookups * 1000 if lookups else 0.0
+        }
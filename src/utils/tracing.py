@@ -0,0 +1,332 @@
+"""
+Per-run instrumentation: timing, token usage, cache hits and retries for every
+agent, LLM call and search, exportable as JSONL or Prometheus text.
+"""
+
+import contextvars
+import json
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+from .model_routing import estimate_cost
+
+
+_current_trace = contextvars.ContextVar("tweetcraft_trace", default=None)
+_current_span = contextvars.ContextVar("tweetcraft_span", default=None)
+
+
+class RunTrace:
+    """Spans recorded during one workflow run"""
+    
+    def __init__(self, run_id: Optional[str] = None):
+        """
+        Initialize the trace.
+        
+        Args:
+            run_id (Optional[str]): Run identifier, generated if omitted
+        """
+        self.run_id = run_id or uuid.uuid4().hex
+        self.started_at = time.time()
+        self.finished_at = None
+        self.spans = []
+        self._lock = threading.Lock()
+    
+    def add(self, span: Dict):
+        with self._lock:
+            self.spans.append(span)
+    
+    def summary(self) -> Dict:
+        """
+        Aggregate spans per agent.
+        
+        Returns:
+            Dict: Run totals (tokens, estimated cost, checkpoint saves) and, per agent, wall time, LLM calls,
+            tokens, estimated cost, cache hits, retries, structured output repairs and searches
+        """
+        agents = {}
+        with self._lock:
+            spans = list(self.spans)
+        
+        checkpoint_spans = [span for span in spans if span["kind"] == "checkpoint"]
+        for span in spans:
+            if span["kind"] == "checkpoint":
+                continue
+            agent = agents.setdefault(span.get("agent") or "unknown", {
+                "wall_time": 0.0,
+                "llm_calls": 0,
+                "llm_seconds": 0.0,
+                "prompt_tokens": 0,
+                "completion_tokens": 0,
+                "cost": 0.0,
+                "cache_hits": 0,
+                "retries": 0,
+                "repairs": 0,
+                "parse_failures": 0,
+                "searches": 0,
+                "search_seconds": 0.0,
+                "models": []
+            })
+            if span["kind"] == "node":
+                agent["wall_time"] += span["duration"]
+            elif span["kind"] == "llm":
+                agent["llm_calls"] += 1
+                agent["llm_seconds"] += span["duration"]
+                agent["prompt_tokens"] += span.get("prompt_tokens", 0)
+                agent["completion_tokens"] += span.get("completion_tokens", 0)
+                agent["cost"] += estimate_cost(
+                    span.get("model"), span.get("prompt_tokens", 0), span.get("completion_tokens", 0)
+                )
+                agent["cache_hits"] += int(bool(span.get("cache_hit")))
+                agent["retries"] += span.get("retries", 0)
+                if span.get("model") and span["model"] not in agent["models"]:
+                    agent["models"].append(span["model"])
+            elif span["kind"] == "structured":
+                agent["repairs"] += int(bool(span.get("repaired")))
+                agent["parse_failures"] += int(bool(span.get("failed")))
+            elif span["kind"] == "search":
+                agent["searches"] += 1
+                agent["search_seconds"] += span.get("duration") or 0.0
+        
+        end = self.finished_at or time.time()
+        return {
+            "run_id": self.run_id,
+            "wall_time": end - self.started_at,
+            "prompt_tokens": sum(agent["prompt_tokens"] for agent in agents.values()),
+            "completion_tokens": sum(agent["completion_tokens"] for agent in agents.values()),
+            "cost": sum(agent["cost"] for agent in agents.values()),
+            "checkpoints": len(checkpoint_spans),
+            "checkpoint_seconds": sum(span["duration"] for span in checkpoint_spans),
+            "agents": agents
+        }
+    
+    def to_dict(self) -> Dict:
+        """Full trace including every span."""
+        with self._lock:
+            spans = list(self.spans)
+        return {
+            "run_id": self.run_id,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "spans": spans,
+            "summary": self.summary()
+        }
+
+
+class TraceMetrics:
+    """Process-wide totals over finished traces, rendered as Prometheus text"""
+    
+    def __init__(self):
+        self.runs = 0
+        self.agent_seconds = {}
+        self.agent_calls = {}
+        self.tokens = {}
+        self.costs = {}
+        self.cache_hits = {}
+        self.retries = {}
+        self.search_seconds = 0.0
+        self.searches = 0
+        self._lock = threading.Lock()
+    
+    def record(self, trace: RunTrace):
+        """Fold a finished trace into the totals."""
+        with self._lock:
+            self.runs += 1
+            for agent, stats in trace.summary()["agents"].items():
+                if stats["wall_time"]:
+                    self.agent_seconds[agent] = self.agent_seconds.get(agent, 0.0) + stats["wall_time"]
+                    self.agent_calls[agent] = self.agent_calls.get(agent, 0) + 1
+                # Token totals are attributed to the agent's first model when it used several
+                model = stats["models"][0] if stats["models"] else "unknown"
+                for kind in ("prompt", "completion"):
+                    key = (agent, model, kind)
+                    self.tokens[key] = self.tokens.get(key, 0) + stats[f"{kind}_tokens"]
+                self.costs[(agent, model)] = self.costs.get((agent, model), 0.0) + stats["cost"]
+                self.cache_hits[agent] = self.cache_hits.get(agent, 0) + stats["cache_hits"]
+                self.retries[agent] = self.retries.get(agent, 0) + stats["retries"]
+                self.searches += stats["searches"]
+                self.search_seconds += stats["search_seconds"]
+    
+    def prometheus_text(self) -> str:
+        """
+        Render the totals in the Prometheus text exposition format.
+        
+        Returns:
+            str: Exposition text
+        """
+        with self._lock:
+            lines = [
+                "# TYPE tweetcraft_runs_total counter",
+                f"tweetcraft_runs_total {self.runs}",
+                "# TYPE tweetcraft_agent_duration_seconds summary"
+            ]
+            for agent, seconds in sorted(self.agent_seconds.items()):
+                lines.append(f'tweetcraft_agent_duration_seconds_sum{{agent="{agent}"}} {seconds:.6f}')
+                lines.append(f'tweetcraft_agent_duration_seconds_count{{agent="{agent}"}} {self.agent_calls[agent]}')
+            lines.append("# TYPE tweetcraft_llm_tokens_total counter")
+            for (agent, model, kind), count in sorted(self.tokens.items()):
+                lines.append(f'tweetcraft_llm_tokens_total{{agent="{agent}",model="{model}",type="{kind}"}} {count}')
+            lines.append("# TYPE tweetcraft_llm_cost_usd_total counter")
+            for (agent, model), cost in sorted(self.costs.items()):
+                lines.append(f'tweetcraft_llm_cost_usd_total{{agent="{agent}",model="{model}"}} {cost:.6f}')
+            lines.append("# TYPE tweetcraft_llm_cache_hits_total counter")
+            for agent, count in sorted(self.cache_hits.items()):
+                lines.append(f'tweetcraft_llm_cache_hits_total{{agent="{agent}"}} {count}')
+            lines.append("# TYPE tweetcraft_llm_retries_total counter")
+            for agent, count in sorted(self.retries.items()):
+                lines.append(f'tweetcraft_llm_retries_total{{agent="{agent}"}} {count}')
+            lines += [
+                "# TYPE tweetcraft_search_duration_seconds summary",
+                f"tweetcraft_search_duration_seconds_sum {self.search_seconds:.6f}",
+                f"tweetcraft_search_duration_seconds_count {self.searches}"
+            ]
+        return "\n".join(lines) + "\n"
+
+
+trace_metrics = TraceMetrics()
+
+
+@contextmanager
+def trace_run(run_id: Optional[str] = None) -> Iterator[RunTrace]:
+    """
+    Record every span in this context into a new trace.
+    
+    The finished trace is also added to the process-wide ``trace_metrics``.
+    
+    Args:
+        run_id (Optional[str]): Run identifier
+    
+    Yields:
+        RunTrace: The trace being recorded
+    """
+    trace = RunTrace(run_id)
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _current_trace.reset(token)
+        trace.finished_at = time.time()
+        trace_metrics.record(trace)
+
+
+def current_trace() -> Optional[RunTrace]:
+    """The trace being recorded in this context, if any."""
+    return _current_trace.get()
+
+
+def current_agent() -> Optional[str]:
+    """Name of the graph node currently executing, if any."""
+    # Imported here so starting a trace doesn't load langchain_core
+    from langchain_core.runnables.config import ensure_config
+    
+    return ensure_config().get("metadata", {}).get("langgraph_node")
+
+
+@contextmanager
+def span(kind: str, **attributes) -> Iterator[Dict]:
+    """
+    Time a block as a span of the current trace.
+    
+    Code running inside the block can add to the span with ``annotate_span``.
+    Outside a trace the span is timed but discarded.
+    
+    Args:
+        kind (str): ``"node"``, ``"llm"``, ``"structured"``, ``"search"`` or ``"checkpoint"``
+        **attributes: Initial span attributes
+    
+    Yields:
+        Dict: The span record
+    """
+    record = {"kind": kind, "agent": current_agent(), **attributes}
+    token = _current_span.set(record)
+    started = time.perf_counter()
+    try:
+        yield record
+    except Exception as e:
+        record["error"] = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        record["duration"] = time.perf_counter() - started
+        _current_span.reset(token)
+        trace = _current_trace.get()
+        if trace is not None:
+            trace.add(record)
+
+
+def record_span(kind: str, **attributes):
+    """Add an already measured span (with its own ``duration``) to the current trace."""
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.add({"kind": kind, "agent": current_agent(), **attributes})
+
+
+def annotate_span(**attributes):
+    """Set attributes on the innermost open span."""
+    record = _current_span.get()
+    if record is not None:
+        record.update(attributes)
+
+
+def increment_span(**amounts: float):
+    """Add to numeric attributes on the innermost open span."""
+    record = _current_span.get()
+    if record is not None:
+        for name, amount in amounts.items():
+            record[name] = record.get(name, 0) + amount
+
+
+class InstrumentedChatModel:
+    """
+    Wraps a chat model and records an ``llm`` span for every call.
+    
+    Anything other than ``invoke``/``ainvoke`` is delegated to the wrapped model.
+    """
+    
+    def __init__(self, llm):
+        """
+        Initialize the wrapper.
+        
+        Args:
+            llm: Language model instance
+        """
+        self.llm = llm
+    
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.llm, name)
+    
+    def _record_usage(self, record: Dict, response):
+        record.setdefault("cache_hit", False)
+        # Cached responses carry the original call's usage, but cost nothing now
+        usage = {} if record["cache_hit"] else (getattr(response, "usage_metadata", None) or {})
+        record["prompt_tokens"] = usage.get("input_tokens", 0)
+        record["completion_tokens"] = usage.get("output_tokens", 0)
+    
+    def invoke(self, messages: List, config: Optional[Dict] = None, **kwargs):
+        """Invoke the model inside an ``llm`` span."""
+        with span("llm", model=getattr(self.llm, "model_name", None)) as record:
+            response = self.llm.invoke(messages, config, **kwargs)
+            self._record_usage(record, response)
+            return response
+    
+    async def ainvoke(self, messages: List, config: Optional[Dict] = None, **kwargs):
+        """Async variant of ``invoke``."""
+        with span("llm", model=getattr(self.llm, "model_name", None)) as record:
+            response = await self.llm.ainvoke(messages, config, **kwargs)
+            self._record_usage(record, response)
+            return response
+
+
+def write_trace_jsonl(trace: RunTrace, path: str):
+    """
+    Append a trace to a JSONL file.
+    
+    Args:
+        trace (RunTrace): Finished trace
+        path (str): Output file
+    """
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(trace.to_dict(), default=str) + "\n")
@@ -1,7 +1,24 @@
 """
 TweetCraft workflow management
+
+Exports are resolved on first access: building a workflow pulls in
+LangGraph, the agents and the API clients, which the UI only needs once a
+generation starts.
 """
 
-from .thread_workflow import create_thread_workflow
+import importlib
+
+_EXPORTS = {
+    "create_thread_workflow": ".thread_workflow",
+    "WorkflowRegistry": ".registry",
+    "get_thread_workflow": ".registry",
+    "workflow_registry": ".registry"
+}
+
+__all__ = list(_EXPORTS)
+
 
-__all__ = ["create_thread_workflow"]
\ No newline at end of file
+def __getattr__(name: str):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
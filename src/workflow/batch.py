@@ -0,0 +1,409 @@
+"""
+Headless batch generation: runs the workflow over topics read from JSONL.
+
+Usage:
+    python -m src.workflow.batch topics.jsonl threads.jsonl --concurrency 8
+    python -m src.workflow.batch topics.jsonl threads.jsonl --async --concurrency 200
+
+Each input line is a JSON object with ``topic`` and optionally ``id``,
+``style``, ``num_tweets``, ``word_limit`` and ``customizations``. Results are
+appended to the output file as each run finishes, and records already
+completed there are skipped, so an interrupted batch can be resumed by
+running the same command again.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from ..models.state import create_initial_state, merge_variants
+from ..utils.credentials import credentials_config
+from ..utils.history import get_history_store
+from ..utils.model_routing import get_model_routes, load_model_routes
+from ..utils.tracing import trace_run
+from .registry import get_thread_workflow
+from .variants import variant_run_config
+
+
+DEFAULT_STYLE = "Professional & Informative"
+DEFAULT_NUM_TWEETS = 5
+DEFAULT_WORD_LIMIT = 35
+
+# Final state keys written to the output file
+RESULT_KEYS = [
+    "research_data",
+    "strategy_plan",
+    "polished_tweets",
+    "analytics_insights",
+    "quality_score",
+    "quality_feedback",
+    "tweet_scores",
+    "iteration_count",
+    "research_metrics",
+    "speculation_metrics",
+    "revision_metrics",
+    "variant_metrics"
+]
+
+
+def record_id(record: Dict) -> str:
+    """
+    Identify an input record, using its ``id`` or a hash of its parameters.
+    
+    Args:
+        record (Dict): Input record
+    
+    Returns:
+        str: Record ID
+    """
+    if record.get("id") is not None:
+        return str(record["id"])
+    canonical = json.dumps(record, sort_keys=True)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+
+
+def read_records(path: str) -> List[Dict]:
+    """Read input records from a JSONL file, skipping blank lines."""
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def completed_ids(path: str) -> Set[str]:
+    """
+    Collect the IDs of records that already succeeded in an output file.
+    
+    Args:
+        path (str): Output JSONL file
+    
+    Returns:
+        Set[str]: IDs to skip
+    """
+    done = set()
+    if not os.path.exists(path):
+        return done
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                result = json.loads(line)
+            except ValueError:
+                # A line cut short by an interrupted write
+                continue
+            if result.get("status") == "ok":
+                done.add(result["id"])
+    return done
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile, or None for an empty list."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def _initial_state(record: Dict):
+    return create_initial_state(
+        record["topic"],
+        record.get("style", DEFAULT_STYLE),
+        int(record.get("num_tweets", DEFAULT_NUM_TWEETS)),
+        int(record.get("word_limit", DEFAULT_WORD_LIMIT)),
+        record.get("customizations")
+    )
+
+
+def _node_latencies(trace) -> Dict[str, List[float]]:
+    """Per-agent node durations from the trace, so parallel nodes are each timed on their own."""
+    latencies = {}
+    for span in list(trace.spans):
+        if span["kind"] == "node":
+            latencies.setdefault(span.get("agent") or "unknown", []).append(span["duration"])
+    return latencies
+
+
+class _RunTimer:
+    """
+    Collects a run's final state from streamed updates and its timings from the trace.
+    """
+    
+    def __init__(self, record: Dict):
+        self.record = record
+        self.final_state = {}
+        self.started = time.perf_counter()
+    
+    def start(self, initial_state: Dict) -> Dict:
+        self.final_state = dict(initial_state)
+        return initial_state
+    
+    def update(self, update: Dict):
+        for values in update.values():
+            values = dict(values or {})
+            if "variants" in values:
+                values["variants"] = merge_variants(self.final_state.get("variants"), values["variants"])
+            self.final_state.update(values)
+    
+    def save_history(self):
+        history = get_history_store()
+        if history is not None:
+            history.save(self.final_state, run_id=record_id(self.record), source="batch")
+    
+    def result(self, trace, error: Optional[Exception] = None) -> Dict:
+        output = {
+            "id": record_id(self.record),
+            "status": "ok" if error is None else "error",
+            "input": self.record,
+            "latency": time.perf_counter() - self.started,
+            "agent_latencies": _node_latencies(trace),
+            "trace": trace.summary()
+        }
+        if error is None:
+            output["result"] = {key: self.final_state.get(key) for key in RESULT_KEYS}
+        else:
+            output["error"] = f"{type(error).__name__}: {error}"
+        return output
+
+
+def run_record(workflow, record: Dict, config: Dict) -> Dict:
+    """
+    Generate one thread and time each agent.
+    
+    Args:
+        workflow: Compiled LangGraph workflow
+        record (Dict): Input record
+        config (Dict): Runnable config carrying credentials
+    
+    Returns:
+        Dict: Output record with status, result, timings and trace summary
+    """
+    timer = _RunTimer(record)
+    with trace_run(record_id(record)) as trace:
+        try:
+            # A malformed record (no topic, non-numeric sizes) fails on its own
+            initial_state = timer.start(_initial_state(record))
+            config = variant_run_config(config, initial_state["customizations"])
+            for update in workflow.stream(initial_state, config, stream_mode="updates"):
+                timer.update(update)
+            # A history write error fails this record, not the whole batch
+            timer.save_history()
+        except Exception as e:
+            return timer.result(trace, e)
+    return timer.result(trace)
+
+
+async def arun_record(workflow, record: Dict, config: Dict) -> Dict:
+    """
+    Async variant of ``run_record`` built on ``astream``.
+    
+    Args:
+        workflow: Compiled LangGraph workflow
+        record (Dict): Input record
+        config (Dict): Runnable config carrying credentials
+    
+    Returns:
+        Dict: Output record with status, result, timings and trace summary
+    """
+    timer = _RunTimer(record)
+    with trace_run(record_id(record)) as trace:
+        try:
+            # A malformed record (no topic, non-numeric sizes) fails on its own
+            initial_state = timer.start(_initial_state(record))
+            config = variant_run_config(config, initial_state["customizations"])
+            async for update in workflow.astream(initial_state, config, stream_mode="updates"):
+                timer.update(update)
+            # A history write error fails this record, not the whole batch
+            timer.save_history()
+        except Exception as e:
+            return timer.result(trace, e)
+    return timer.result(trace)
+
+
+def summarize(results: List[Dict], skipped: int, wall_time: float) -> Dict:
+    """
+    Build the throughput and latency summary for a batch.
+    
+    Args:
+        results (List[Dict]): Output records produced by this invocation
+        skipped (int): Records skipped because they were already done
+        wall_time (float): Batch wall time in seconds
+    
+    Returns:
+        Dict: Counts, throughput, estimated cost, and p50/p95 latencies overall and per agent
+    """
+    succeeded = [result for result in results if result["status"] == "ok"]
+    latencies = [result["latency"] for result in succeeded]
+    
+    per_agent = {}
+    for result in succeeded:
+        for agent, values in result["agent_latencies"].items():
+            per_agent.setdefault(agent, []).extend(values)
+    
+    # Cost covers failed runs too, since their LLM calls were still billed
+    agent_costs = {}
+    agent_models = {}
+    for result in results:
+        for agent, stats in result["trace"]["agents"].items():
+            agent_costs[agent] = agent_costs.get(agent, 0.0) + stats["cost"]
+            agent_models.setdefault(agent, set()).update(stats["models"])
+    
+    return {
+        "processed": len(results),
+        "succeeded": len(succeeded),
+        "failed": len(results) - len(succeeded),
+        "skipped": skipped,
+        "wall_time": wall_time,
+        "throughput_per_minute": len(results) / wall_time * 60 if wall_time else 0.0,
+        "latency": {"p50": percentile(latencies, 50), "p95": percentile(latencies, 95)},
+        "cost": sum(agent_costs.values()),
+        "agents": {
+            agent: {
+                "p50": percentile(values, 50),
+                "p95": percentile(values, 95),
+                "calls": len(values),
+                "cost": agent_costs.get(agent, 0.0),
+                "models": sorted(agent_models.get(agent, ()))
+            }
+            for agent, values in per_agent.items()
+        }
+    }
+
+
+def _pending_records(records: Iterable[Dict], output_path: str) -> Tuple[List[Dict], int]:
+    """Split records into those still to run and a count of those already done."""
+    done = completed_ids(output_path)
+    pending = []
+    skipped = 0
+    for record in records:
+        if record_id(record) in done:
+            skipped += 1
+        else:
+            pending.append(record)
+    return pending, skipped
+
+
+def _write_result(output, result: Dict, completed: int, total: int):
+    output.write(json.dumps(result, default=str) + "\n")
+    output.flush()
+    print(f"[{completed}/{total}] {result['status']} {result['id']} "
+          f"({result['latency']:.1f}s)", file=sys.stderr)
+
+
+def run_batch(records: Iterable[Dict], output_path: str, openai_api_key: str, tavily_api_key: str,
+              concurrency: int = 4, **workflow_options) -> Dict:
+    """
+    Generate threads for every record not already completed in the output file.
+    
+    Args:
+        records (Iterable[Dict]): Input records
+        output_path (str): Output JSONL file, appended to as runs finish
+        openai_api_key (str): OpenAI API key
+        tavily_api_key (str): Tavily API key
+        concurrency (int): Maximum runs in flight
+        **workflow_options: Options for ``get_thread_workflow``
+    
+    Returns:
+        Dict: Batch summary
+    """
+    pending, skipped = _pending_records(records, output_path)
+    workflow = get_thread_workflow(**workflow_options)
+    config = credentials_config(openai_api_key, tavily_api_key)
+    results = []
+    started = time.perf_counter()
+    
+    with open(output_path, "a", encoding="utf-8") as output, \
+            ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="tweetcraft-batch") as executor:
+        futures = [executor.submit(run_record, workflow, record, config) for record in pending]
+        # Results are written from this thread only, as each run completes
+        for future in as_completed(futures):
+            results.append(future.result())
+            _write_result(output, results[-1], len(results), len(pending))
+    
+    return summarize(results, skipped, time.perf_counter() - started)
+
+
+async def arun_batch(records: Iterable[Dict], output_path: str, openai_api_key: str, tavily_api_key: str,
+                     concurrency: int = 64, **workflow_options) -> Dict:
+    """
+    Async variant of ``run_batch``: every run shares one event loop.
+    
+    Args:
+        records (Iterable[Dict]): Input records
+        output_path (str): Output JSONL file, appended to as runs finish
+        openai_api_key (str): OpenAI API key
+        tavily_api_key (str): Tavily API key
+        concurrency (int): Maximum runs in flight
+        **workflow_options: Options for ``get_thread_workflow``
+    
+    Returns:
+        Dict: Batch summary
+    """
+    pending, skipped = _pending_records(records, output_path)
+    workflow = get_thread_workflow(**workflow_options)
+    config = credentials_config(openai_api_key, tavily_api_key)
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    results = []
+    started = time.perf_counter()
+    
+    async def bounded(record: Dict) -> Dict:
+        async with semaphore:
+            return await arun_record(workflow, record, config)
+    
+    with open(output_path, "a", encoding="utf-8") as output:
+        for next_result in asyncio.as_completed([bounded(record) for record in pending]):
+            results.append(await next_result)
+            _write_result(output, results[-1], len(results), len(pending))
+    
+    return summarize(results, skipped, time.perf_counter() - started)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Generate tweet threads in bulk from a JSONL file of topics.")
+    parser.add_argument("input", help="Input JSONL with one topic record per line")
+    parser.add_argument("output", help="Output JSONL; existing successful records are skipped")
+    parser.add_argument("--concurrency", type=int, default=4, help="Maximum generations in flight")
+    parser.add_argument("--openai-api-key", default=os.environ.get("OPENAI_API_KEY"))
+    parser.add_argument("--tavily-api-key", default=os.environ.get("TAVILY_API_KEY"))
+    parser.add_argument("--speculative-analytics", action="store_true",
+                        help="Run analytics alongside the supervisor")
+    parser.add_argument("--cache-llm-responses", action="store_true",
+                        help="Cache LLM responses even at temperature > 0")
+    parser.add_argument("--model-routes",
+                        help="JSON file (or inline JSON) of per-agent models; overrides TWEETCRAFT_MODEL_ROUTES")
+    parser.add_argument("--async", dest="use_async", action="store_true",
+                        help="Run every generation on one event loop instead of a thread pool")
+    parser.add_argument("--summary", help="Also write the summary JSON to this file")
+    args = parser.parse_args(argv)
+    
+    if not args.openai_api_key or not args.tavily_api_key:
+        parser.error("OpenAI and Tavily API keys are required (flags or OPENAI_API_KEY/TAVILY_API_KEY)")
+    
+    batch_args = (read_records(args.input), args.output, args.openai_api_key, args.tavily_api_key)
+    batch_options = {
+        "concurrency": args.concurrency,
+        "speculative_analytics": args.speculative_analytics,
+        "cache_llm_responses": args.cache_llm_responses
+    }
+    if args.model_routes:
+        batch_options["model_routes"] = load_model_routes(args.model_routes, get_model_routes())
+    if args.use_async:
+        summary = asyncio.run(arun_batch(*batch_args, **batch_options))
+    else:
+        summary = run_batch(*batch_args, **batch_options)
+    
+    report = json.dumps(summary, indent=2)
+    print(report)
+    if args.summary:
+        with open(args.summary, "w", encoding="utf-8") as f:
+            f.write(report)
+    return 0 if summary["failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,381 @@
+"""
+Background generation jobs: a bounded queue served by a worker pool.
+
+Each job records a stream of progress events (queued, started, per-agent
+completion, streamed tokens and completed tweets, notices reported by agents,
+finished) that callers can poll or wait on, so generation is decoupled from
+whoever submitted it.
+"""
+
+import itertools
+import os
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+
+from ..models.state import merge_variants
+from ..utils.events import event_listener
+from ..utils.history import get_history_store
+from ..utils.text_processing import TweetStreamParser
+from ..utils.tracing import trace_run, write_trace_jsonl
+from .registry import get_thread_workflow
+from .variants import variant_run_config
+
+
+# Agents whose LLM output is forwarded as token events
+STREAMED_AGENTS = ("writer", "editor")
+
+# Node whose parallel branches stream writer and editor passes tagged with their variant
+VARIANT_NODE = "variant"
+
+
+class QueueFullError(Exception):
+    """Raised when a job is submitted while the queue is at capacity"""
+
+
+class Job:
+    """A single generation request and its progress events"""
+    
+    def __init__(self, initial_state: Dict, config: Dict, workflow_options: Dict, resume: bool = False):
+        self.id = uuid.uuid4().hex
+        self.initial_state = initial_state
+        self.config = config
+        self.workflow_options = workflow_options
+        self.resume = resume
+        self.status = "queued"
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.current_agent = None
+        self.completed_agents = []
+        self.final_state = None
+        self.error = None
+        self.exception = None
+        self.trace = None
+        self.events = []
+        self._changed = threading.Condition()
+    
+    @property
+    def done(self) -> bool:
+        return self.status in ("succeeded", "failed")
+    
+    def emit(self, event_type: str, **payload):
+        """Append a progress event and wake anyone waiting for it."""
+        with self._changed:
+            self.events.append({"seq": len(self.events), "type": event_type, "time": time.time(), **payload})
+            self._changed.notify_all()
+    
+    def events_since(self, since: int = 0, timeout: Optional[float] = None) -> List[Dict]:
+        """
+        Return events with ``seq >= since``, waiting up to ``timeout`` for new ones.
+        
+        Args:
+            since (int): First event sequence number wanted
+            timeout (Optional[float]): Seconds to wait when there are none yet
+        
+        Returns:
+            List[Dict]: Events in order
+        """
+        with self._changed:
+            if timeout and len(self.events) <= since and not self.done:
+                self._changed.wait(timeout)
+            return self.events[since:]
+    
+    def to_dict(self, include_state: bool = True) -> Dict:
+        """Public view of the job, without the credentials in its config."""
+        view = {
+            "id": self.id,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "current_agent": self.current_agent,
+            "completed_agents": list(self.completed_agents),
+            "events": len(self.events),
+            "error": self.error,
+            "timings": self.trace.summary() if self.trace else None
+        }
+        if include_state:
+            view["state"] = self.final_state
+        return view
+
+
+class JobManager:
+    """Runs generation jobs on a fixed pool of worker threads"""
+    
+    def __init__(self, workflow_factory: Callable = get_thread_workflow, max_workers: int = 4,
+                 max_queue: int = 100, max_retained_jobs: int = 1000, history_source: str = "service",
+                 trace_file: Optional[str] = None):
+        """
+        Initialize the manager and start its workers.
+        
+        Args:
+            workflow_factory (Callable): Returns a compiled workflow for a job's options
+            max_workers (int): Jobs run at the same time
+            max_queue (int): Jobs allowed to wait; further submissions are rejected
+            max_retained_jobs (int): Finished jobs kept for lookup before the oldest are dropped
+            history_source (str): Source recorded with each finished thread in the history
+            trace_file (Optional[str]): JSONL file each finished job's trace is appended to
+        """
+        self.workflow_factory = workflow_factory
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.max_retained_jobs = max_retained_jobs
+        self.history_source = history_source
+        self.trace_file = trace_file
+        self.submitted = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.rejected = 0
+        self.running = 0
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+        self._workers = []
+        
+        for i in range(max_workers):
+            worker = threading.Thread(target=self._work, name=f"tweetcraft-job-{i}", daemon=True)
+            worker.start()
+            self._workers.append(worker)
+    
+    def submit(self, initial_state: Dict, config: Optional[Dict] = None, resume: bool = False,
+               **workflow_options) -> Job:
+        """
+        Queue a generation.
+        
+        Args:
+            initial_state (Dict): Initial workflow state
+            config (Optional[Dict]): Runnable config, typically carrying credentials
+            resume (bool): Continue from the last checkpoint of the config's ``thread_id`` when
+                there is one, instead of starting from ``initial_state``
+            **workflow_options: Options for the workflow factory
+        
+        Returns:
+            Job: The queued job
+        
+        Raises:
+            QueueFullError: If the queue is at capacity
+        """
+        job = Job(initial_state, config or {}, workflow_options, resume)
+        job.emit("queued")
+        
+        with self._lock:
+            try:
+                self._queue.put_nowait(job)
+            except queue.Full:
+                self.rejected += 1
+                raise QueueFullError(f"Job queue is full ({self.max_queue} waiting)")
+            self.submitted += 1
+            self._jobs[job.id] = job
+            self._prune()
+        return job
+    
+    def get(self, job_id: str) -> Optional[Job]:
+        """Look up a job by ID."""
+        with self._lock:
+            return self._jobs.get(job_id)
+    
+    def _prune(self):
+        """Drop the oldest finished jobs beyond the retention limit."""
+        finished = [job_id for job_id, job in self._jobs.items() if job.done]
+        for job_id in itertools.islice(finished, max(0, len(finished) - self.max_retained_jobs)):
+            del self._jobs[job_id]
+    
+    def _work(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            with self._lock:
+                self.running += 1
+            try:
+                self._run(job)
+            except Exception as e:
+                # _run reports its own failures; this keeps the worker alive if reporting one fails
+                if not job.done:
+                    self._fail(job, job.final_state or dict(job.initial_state), e)
+            finally:
+                with self._lock:
+                    self.running -= 1
+                    if job.status == "succeeded":
+                        self.succeeded += 1
+                    else:
+                        self.failed += 1
+                    self._prune()
+    
+    @staticmethod
+    def _emit_tweets(job: Job, agent: str, parser: TweetStreamParser, tweets: List[str], targeted: bool = False,
+                     **tags):
+        if targeted:
+            # A targeted revision streams only the rewritten tweets, under their numbers in the thread
+            numbers = parser.completed_numbers[len(parser.completed_numbers) - len(tweets):]
+            indexes = [number - 1 for number in numbers]
+        else:
+            first = len(parser.tweets) - len(tweets)
+            indexes = range(first, first + len(tweets))
+        for index, tweet in zip(indexes, tweets):
+            job.emit("tweet", agent=agent, index=index, text=tweet, **tags)
+    
+    def _close_parsers(self, job: Job, parsers: Dict, keys: List, targeted: bool = False):
+        """Emit the last tweet of each finished stream."""
+        for agent, variant in keys:
+            tags = {} if variant is None else {"variant": variant}
+            parser = parsers.pop((agent, variant))
+            self._emit_tweets(job, agent, parser, parser.close(), targeted, **tags)
+    
+    def _run(self, job: Job):
+        """Execute one job, translating workflow stream output into events."""
+        job.status = "running"
+        job.started_at = time.time()
+        job.current_agent = job.initial_state.get("current_agent")
+        job.emit("started")
+        
+        state = dict(job.initial_state)
+        # Per-agent parsers turn streamed tokens into tweet events as each tweet completes
+        parsers = {}
+        try:
+            workflow = self.workflow_factory(**job.workflow_options)
+            config = variant_run_config(job.config, job.initial_state.get("customizations"))
+            stream_input = job.initial_state
+            if job.resume:
+                # The checkpointed state becomes the job's starting point
+                checkpoint = workflow.get_state(config).values
+                if checkpoint:
+                    stream_input = None
+                    job.initial_state = checkpoint
+                    state = dict(checkpoint)
+            
+            # Agents report notices through the job's events rather than to a UI
+            with trace_run(job.id) as job.trace, event_listener(job.emit):
+                for mode, payload in workflow.stream(stream_input, config, stream_mode=["updates", "messages"]):
+                    targeted = bool(state.get("revision_targets"))
+                    if mode == "messages":
+                        chunk, metadata = payload
+                        agent = metadata.get("langgraph_node")
+                        variant = None
+                        if agent == VARIANT_NODE:
+                            # Reported as the writer or editor pass of one variant
+                            agent, variant = metadata.get("variant_agent"), metadata.get("variant")
+                        if agent in STREAMED_AGENTS and chunk.content:
+                            tags = {} if variant is None else {"variant": variant}
+                            if variant is not None and agent == "editor" and ("writer", variant) in parsers:
+                                # The variant's writer pass is over once its editor starts
+                                self._close_parsers(job, parsers, [("writer", variant)])
+                            job.emit("token", agent=agent, text=chunk.content, **tags)
+                            parser = parsers.setdefault((agent, variant), TweetStreamParser(sequential=not targeted))
+                            self._emit_tweets(job, agent, parser, parser.feed(chunk.content), targeted, **tags)
+                        continue
+                    
+                    # Nodes in parallel branches return partial updates, so merge them
+                    for agent, update in payload.items():
+                        if agent == VARIANT_NODE:
+                            finished = {variant["index"] for variant in (update or {}).get("variants") or []}
+                            keys = [key for key in parsers if key[1] in finished]
+                        else:
+                            keys = [key for key in parsers if key == (agent, None)]
+                        self._close_parsers(job, parsers, keys, targeted)
+                        update = dict(update or {})
+                        if "variants" in update:
+                            update["variants"] = merge_variants(state.get("variants"), update["variants"])
+                        state.update(update)
+                        job.completed_agents.append(agent)
+                        job.current_agent = state.get("current_agent")
+                        job.emit("agent_completed", agent=agent, next_agent=job.current_agent,
+                                 iteration_count=state.get("iteration_count", 0))
+            
+            history = get_history_store()
+            if history is not None:
+                history.save(state, run_id=job.id, source=self.history_source)
+            
+            # A finished run has nothing left to resume
+            checkpointer = job.workflow_options.get("checkpointer")
+            thread_id = job.config.get("configurable", {}).get("thread_id")
+            if checkpointer is not None and thread_id:
+                checkpointer.delete_thread(thread_id)
+            
+            self._write_trace(job)
+        except Exception as e:
+            # A failed run's trace is still worth keeping, but writing it must not mask the error
+            try:
+                self._write_trace(job)
+            except Exception:
+                pass
+            self._fail(job, state, e)
+            return
+        
+        job.final_state = state
+        job.finished_at = time.time()
+        job.status = "succeeded"
+        job.emit("succeeded")
+    
+    @staticmethod
+    def _fail(job: Job, state: Dict, error: Exception):
+        """Mark a job failed and wake anyone waiting on it."""
+        job.error = f"{type(error).__name__}: {error}"
+        job.exception = error
+        job.final_state = state
+        job.finished_at = time.time()
+        job.status = "failed"
+        job.emit("failed", error=job.error)
+    
+    def _write_trace(self, job: Job):
+        if self.trace_file and job.trace is not None:
+            write_trace_jsonl(job.trace, self.trace_file)
+    
+    def metrics(self) -> Dict:
+        """
+        Report queue depth and job counters.
+        
+        Returns:
+            Dict: Queue and worker metrics
+        """
+        with self._lock:
+            return {
+                "queue_depth": self._queue.qsize(),
+                "queue_capacity": self.max_queue,
+                "workers": self.max_workers,
+                "running": self.running,
+                "submitted": self.submitted,
+                "succeeded": self.succeeded,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "retained_jobs": len(self._jobs)
+            }
+    
+    def shutdown(self):
+        """Stop the workers after the jobs already queued have run."""
+        for _ in self._workers:
+            self._queue.put(None)
+        for worker in self._workers:
+            worker.join()
+
+
+_default_manager = None
+_default_manager_lock = threading.Lock()
+
+
+def get_job_manager() -> JobManager:
+    """
+    Return the process-wide job manager the Streamlit app runs generations on.
+    
+    Runs outlive the script run (and browser tab) that submitted them.
+    Configured through ``TWEETCRAFT_JOB_WORKERS``, ``TWEETCRAFT_JOB_QUEUE`` and
+    ``TWEETCRAFT_TRACE_FILE``.
+    
+    Returns:
+        JobManager: Shared manager
+    """
+    global _default_manager
+    
+    with _default_manager_lock:
+        if _default_manager is None:
+            _default_manager = JobManager(
+                max_workers=int(os.environ.get("TWEETCRAFT_JOB_WORKERS", 4)),
+                max_queue=int(os.environ.get("TWEETCRAFT_JOB_QUEUE", 100)),
+                history_source="app",
+                trace_file=os.environ.get("TWEETCRAFT_TRACE_FILE")
+            )
+        return _default_manager
@@ -0,0 +1,108 @@
+"""
+Background prewarm of the generation stack.
+
+The UI imports only what first paint needs. This thread then loads the
+API clients, LangGraph and the agents, and compiles the session's workflow,
+so the first generation doesn't pay for them.
+"""
+
+import importlib
+import os
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from .registry import get_thread_workflow
+
+
+# Heaviest first: the API clients dominate cold import time
+PREWARM_MODULES = (
+    "openai",
+    "tavily",
+    "langchain_openai",
+    "numpy",
+    "src.utils.checkpoints",
+    "src.workflow.thread_workflow"
+)
+
+
+class Prewarm:
+    """One background prewarm per process, with timings for each step"""
+    
+    def __init__(self):
+        self.timings = {}
+        self.error = None
+        self.done = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+    
+    def start(self, workflow_options: Optional[Callable[[], Dict]] = None) -> bool:
+        """
+        Start the prewarm thread unless it already ran in this process.
+        
+        Args:
+            workflow_options (Optional[Callable[[], Dict]]): Returns the ``get_thread_workflow``
+                options to compile; called on the prewarm thread
+        
+        Returns:
+            bool: True if this call started the thread
+        """
+        with self._lock:
+            if self._thread is not None:
+                return False
+            self._thread = threading.Thread(
+                target=self._run, args=(workflow_options,), name="tweetcraft-prewarm", daemon=True
+            )
+        self._thread.start()
+        return True
+    
+    def _run(self, workflow_options: Optional[Callable[[], Dict]]):
+        try:
+            for module in PREWARM_MODULES:
+                started = time.perf_counter()
+                importlib.import_module(module)
+                self.timings[module] = time.perf_counter() - started
+            if workflow_options is not None:
+                started = time.perf_counter()
+                get_thread_workflow(**workflow_options())
+                self.timings["compile"] = time.perf_counter() - started
+        except Exception as e:
+            # Prewarming is best effort; the first generation does the same work and reports errors
+            self.error = f"{type(e).__name__}: {e}"
+        finally:
+            self.done.set()
+    
+    def stats(self) -> Dict:
+        """
+        Report prewarm progress.
+        
+        Returns:
+            Dict: started, done, per-step seconds and any error
+        """
+        return {
+            "started": self._thread is not None,
+            "done": self.done.is_set(),
+            "timings": dict(self.timings),
+            "error": self.error
+        }
+
+
+prewarm = Prewarm()
+
+
+def start_prewarm(workflow_options: Optional[Callable[[], Dict]] = None) -> bool:
+    """
+    Prewarm the generation stack in the background, once per process.
+    
+    Disabled with ``TWEETCRAFT_PREWARM=0``.
+    
+    Args:
+        workflow_options (Optional[Callable[[], Dict]]): Returns the ``get_thread_workflow``
+            options to compile after the imports
+    
+    Returns:
+        bool: True if this call started the prewarm
+    """
+    if os.environ.get("TWEETCRAFT_PREWARM", "1") == "0":
+        return False
+    return prewarm.start(workflow_options)
@@ -0,0 +1,108 @@
+"""
+Process-wide registry of compiled workflows.
+
+Building the agents and compiling the graph is pure setup cost, and since
+credentials are supplied per run the same compiled graph can serve every
+session with the same configuration.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict
+
+
+class WorkflowRegistry:
+    """Bounded LRU of compiled workflows keyed by configuration"""
+    
+    def __init__(self, max_size: int = 8):
+        """
+        Initialize the registry.
+        
+        Args:
+            max_size (int): Maximum compiled workflows kept
+        """
+        self.max_size = max_size
+        self.cold_compiles = 0
+        self.cold_seconds = 0.0
+        self.warm_lookups = 0
+        self.warm_seconds = 0.0
+        self.evictions = 0
+        self._workflows = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, **options):
+        """
+        Return the compiled workflow for a configuration, compiling it on first use.
+        
+        Args:
+            **options: Hashable keyword arguments for ``create_thread_workflow``, or dicts of
+                hashable values such as ``model_routes`` (API keys should be passed per run instead)
+        
+        Returns:
+            Compiled LangGraph workflow
+        """
+        key = tuple(sorted(
+            (name, tuple(sorted(value.items())) if isinstance(value, dict) else value)
+            for name, value in options.items()
+        ))
+        started = time.perf_counter()
+        
+        # Compile under the lock so concurrent sessions don't build the same graph twice
+        with self._lock:
+            workflow = self._workflows.get(key)
+            if workflow is not None:
+                self._workflows.move_to_end(key)
+                self.warm_lookups += 1
+                self.warm_seconds += time.perf_counter() - started
+                return workflow
+            
+            # Deferred so importing the registry doesn't load LangGraph and the agents
+            from .thread_workflow import create_thread_workflow
+            
+            workflow = create_thread_workflow(**options)
+            self._workflows[key] = workflow
+            while len(self._workflows) > self.max_size:
+                self._workflows.popitem(last=False)
+                self.evictions += 1
+            self.cold_compiles += 1
+            self.cold_seconds += time.perf_counter() - started
+            return workflow
+    
+    def clear(self):
+        """Drop every compiled workflow."""
+        with self._lock:
+            self._workflows.clear()
+    
+    def stats(self) -> Dict:
+        """
+        Report cold compilation versus warm lookup timings.
+        
+        Returns:
+            Dict: Counts and average seconds for cold compiles and warm lookups
+        """
+        with self._lock:
+            return {
+                "size": len(self._workflows),
+                "evictions": self.evictions,
+                "cold_compiles": self.cold_compiles,
+                "avg_cold_seconds": self.cold_seconds / self.cold_compiles if self.cold_compiles else 0.0,
+                "warm_lookups": self.warm_lookups,
+                "avg_warm_seconds": self.warm_seconds / self.warm_lookups if self.warm_lookups else 0.0
+            }
+
+
+workflow_registry = WorkflowRegistry()
+
+
+def get_thread_workflow(**options):
+    """
+    Return a shared compiled workflow from the process-wide registry.
+    
+    Args:
+        **options: Hashable keyword arguments for ``create_thread_workflow``
+    
+    Returns:
+        Compiled LangGraph workflow
+    """
+    return workflow_registry.get(**options)
@@ -2,8 +2,12 @@
 LangGraph workflow management for the TweetCraft multi-agent system.
 """
 
+import os
+import threading
+from typing import Dict, Optional
+
+from langchain_core.runnables import RunnableLambda
 from langgraph.graph import StateGraph, END, START
-from langchain_openai import ChatOpenAI
 
 from ..models.state import ThreadGenerationState
 from ..agents.research import ResearchAgent
@@ -12,79 +16,306 @@ from ..agents.writer import WriterAgent
 from ..agents.editor import EditorAgent
 from ..agents.supervisor import SupervisorAgent
 from ..agents.analytics import AnalyticsAgent
+from ..utils.credentials import PooledChatModel
+from ..utils.llm_cache import CachedChatModel, get_llm_cache
+from ..utils.model_routing import AGENTS, ModelRoute, get_model_routes
+from ..utils.rate_limit import RateLimitedChatModel, get_rate_limiter
+from ..utils.research_cache import ResearchCache, get_research_cache
+from ..utils.tracing import InstrumentedChatModel, span
+from .variants import VariantAgent, fan_out_variants
+
+
+class SpeculationStats:
+    """Process-wide counters for speculative analytics runs"""
+    
+    def __init__(self):
+        self.committed = 0
+        self.wasted = 0
+        self._lock = threading.Lock()
+    
+    def record(self, committed: bool):
+        """Count one speculative analytics result as committed or wasted."""
+        with self._lock:
+            if committed:
+                self.committed += 1
+            else:
+                self.wasted += 1
+    
+    def stats(self) -> Dict:
+        """
+        Report speculation counters.
+        
+        Returns:
+            Dict: committed, wasted and waste_rate
+        """
+        with self._lock:
+            total = self.committed + self.wasted
+            return {
+                "committed": self.committed,
+                "wasted": self.wasted,
+                "waste_rate": self.wasted / total if total else 0.0
+            }
+
+
+speculation_stats = SpeculationStats()
 
 
-def create_thread_workflow(openai_api_key: str, tavily_api_key: str):
+def _agent_node(agent) -> RunnableLambda:
+    """
+    Wrap an agent as a graph node with sync and async entry points.
+    
+    ``stream``/``invoke`` call the agent directly, while ``astream``/``ainvoke``
+    await its ``acall`` so no thread is held per in-flight generation.
+    """
+    def node(state: ThreadGenerationState) -> ThreadGenerationState:
+        with span("node"):
+            return agent(state)
+    
+    async def anode(state: ThreadGenerationState) -> ThreadGenerationState:
+        with span("node"):
+            return await agent.acall(state)
+    
+    return RunnableLambda(node, afunc=anode, name=type(agent).__name__)
+
+
+def _changed_keys_only(agent) -> RunnableLambda:
+    """
+    Adapt an agent that returns the full state so it returns only what it changed.
+    
+    Nodes running in the same step must not write the same keys, so agents
+    that run in parallel branches are wrapped with this.
+    """
+    def changed(state: ThreadGenerationState, result: ThreadGenerationState) -> Dict:
+        return {key: value for key, value in result.items() if key not in state or state[key] != value}
+    
+    def node(state: ThreadGenerationState) -> Dict:
+        with span("node"):
+            return changed(state, agent(state))
+    
+    async def anode(state: ThreadGenerationState) -> Dict:
+        with span("node"):
+            return changed(state, await agent.acall(state))
+    
+    return RunnableLambda(node, afunc=anode, name=type(agent).__name__)
+
+
+def _select_node(supervisor: SupervisorAgent) -> RunnableLambda:
+    """Wrap the supervisor's variant ranking as a graph node with sync and async entry points."""
+    def node(state: ThreadGenerationState) -> ThreadGenerationState:
+        with span("node"):
+            return supervisor.rank_variants(state)
+    
+    async def anode(state: ThreadGenerationState) -> ThreadGenerationState:
+        with span("node"):
+            return await supervisor.arank_variants(state)
+    
+    return RunnableLambda(node, afunc=anode, name="VariantSelection")
+
+
+def _routed_chat_model(route: ModelRoute, openai_api_key: Optional[str], cache_llm_responses: bool):
+    """
+    Build the wrapped chat model for one route.
+    
+    Clients are pooled per API key and route, so agents on the same route
+    share connections while a different model or timeout gets its own client.
+    """
+    openai_limiter = get_rate_limiter("openai")
+    llm = PooledChatModel(
+        model=route.model,
+        api_key=openai_api_key,
+        temperature=route.temperature,
+        **({"timeout": route.timeout} if route.timeout else {}),
+        # The shared limiter owns retries so concurrent sessions back off together
+        **({"max_retries": 0} if openai_limiter else {})
+    )
+    if openai_limiter:
+        llm = RateLimitedChatModel(llm, openai_limiter)
+    
+    llm_cache = get_llm_cache()
+    if llm_cache:
+        llm = CachedChatModel(llm, llm_cache, cache_nondeterministic=cache_llm_responses)
+    
+    # Outermost, so each span sees cache hits and retries from the layers below
+    return InstrumentedChatModel(llm)
+
+
+def create_thread_workflow(openai_api_key: Optional[str] = None, tavily_api_key: Optional[str] = None,
+                           research_cache: Optional[ResearchCache] = None,
+                           cache_llm_responses: Optional[bool] = None,
+                           speculative_analytics: bool = False,
+                           research_token_budget: int = 1500,
+                           quality_pass_threshold: Optional[float] = None,
+                           llm=None,
+                           search_client=None,
+                           checkpointer=None,
+                           model_routes: Optional[Dict[str, ModelRoute]] = None,
+                           structured_output: bool = True):
     """
     Creates the LangGraph workflow for tweet thread generation.
     
+    API keys given here are only defaults; a run can supply its own through
+    ``config["configurable"]`` (see ``credentials_config``), which lets one
+    compiled workflow serve every session.
+    
+    A run whose customizations ask for ``variants`` > 1 fans out after the
+    strategy into that many parallel writer/editor branches, and the
+    supervisor keeps the best in one batched evaluation (see ``variants.py``).
+    
     Args:
-        openai_api_key (str): OpenAI API key
-        tavily_api_key (str): Tavily API key for search
-        
+        openai_api_key (Optional[str]): Default OpenAI API key
+        tavily_api_key (Optional[str]): Default Tavily API key for search
+        research_cache (Optional[ResearchCache]): Research cache, defaults to the process-wide cache
+            unless ``llm`` or ``search_client`` is given
+        cache_llm_responses (Optional[bool]): Cache responses even though the model samples with
+            temperature > 0, for repeatable load tests and batch jobs. Defaults to
+            ``TWEETCRAFT_LLM_CACHE_NONDETERMINISTIC``.
+        speculative_analytics (bool): Run analytics on the editor's output alongside the
+            supervisor, committing it on approval and discarding it on revision
+        research_token_budget (int): Token budget for search results in the research synthesis prompt
+        quality_pass_threshold (Optional[float]): Local rule score (0-10) at which the supervisor
+            approves a thread without an LLM evaluation. Defaults to
+            ``TWEETCRAFT_QUALITY_PASS_THRESHOLD``; unset always asks the LLM.
+        llm: Chat model used instead of the pooled OpenAI clients, e.g. a local stand-in. Its
+            responses never go through the process-wide LLM cache; wrap it in a ``CachedChatModel``
+            to cache them.
+        search_client: Tavily-compatible search client used instead of the pooled Tavily clients
+        checkpointer: LangGraph checkpointer (e.g. ``get_checkpointer()``) that saves state after
+            every node, so a run started with a ``thread_id`` can resume where it stopped
+        model_routes (Optional[Dict[str, ModelRoute]]): Model, temperature and timeout per agent.
+            Defaults to ``get_model_routes()``; ignored when ``llm`` is given.
+        structured_output (bool): Constrain supervisor and analytics replies with a JSON schema
+            (``response_format``); turn off for models without structured output support
+    
     Returns:
         Compiled LangGraph workflow
     """
     
-    # Initialize LLM
-    llm = ChatOpenAI(
-        model="gpt-4o",
-        api_key=openai_api_key,
-        temperature=0.7
-    )
+    if cache_llm_responses is None:
+        cache_llm_responses = os.environ.get("TWEETCRAFT_LLM_CACHE_NONDETERMINISTIC", "0") == "1"
+    
+    # Injected backends (stand-ins, tests) must not read or fill the shared persistent caches
+    injected_backends = llm is not None or search_client is not None
+    if research_cache is None and not injected_backends:
+        research_cache = get_research_cache()
+    
+    # Initialize one LLM per agent; clients are created per API key on first use and pooled
+    if llm is None:
+        routes = model_routes or get_model_routes()
+        by_route = {
+            route: _routed_chat_model(route, openai_api_key, cache_llm_responses)
+            for route in set(routes.values())
+        }
+        llms = {agent: by_route[route] for agent, route in routes.items()}
+    else:
+        llm = InstrumentedChatModel(llm)
+        llms = {agent: llm for agent in AGENTS}
     
     # Initialize agents
-    research_agent = ResearchAgent(llm, tavily_api_key)
-    strategy_agent = StrategyAgent(llm)
-    writer_agent = WriterAgent(llm)
-    editor_agent = EditorAgent(llm)
-    supervisor_agent = SupervisorAgent(llm)
-    analytics_agent = AnalyticsAgent(llm)
-    
-    # Define routing logic
-    def route_workflow(state: ThreadGenerationState) -> str:
-        """
-        Determine the next step in the workflow based on current state.
-        
-        Args:
-            state (ThreadGenerationState): Current workflow state
-            
-        Returns:
-            str: Next node in the workflow
-        """
-        current_agent = state.get("current_agent", "research")
-        
-        if current_agent == "complete":
-            return END
-        elif state.get("needs_revision", False):
-            return "writer"  # Go back to writer for revision
-        else:
-            return current_agent
+    research_agent = ResearchAgent(
+        llms["research"],
+        tavily_api_key,
+        cache=research_cache,
+        context_token_budget=research_token_budget,
+        search_client=search_client
+    )
+    strategy_agent = StrategyAgent(llms["strategy"])
+    writer_agent = WriterAgent(llms["writer"])
+    editor_agent = EditorAgent(llms["editor"])
+    if quality_pass_threshold is None and os.environ.get("TWEETCRAFT_QUALITY_PASS_THRESHOLD"):
+        quality_pass_threshold = float(os.environ["TWEETCRAFT_QUALITY_PASS_THRESHOLD"])
+    supervisor_agent = SupervisorAgent(
+        llms["supervisor"],
+        pass_threshold=quality_pass_threshold,
+        structured_output=structured_output
+    )
+    analytics_agent = AnalyticsAgent(llms["analytics"], structured_output=structured_output)
+    variant_agent = VariantAgent(llms["writer"], llms["editor"])
     
     # Create the workflow graph
     workflow = StateGraph(ThreadGenerationState)
     
     # Add nodes
-    workflow.add_node("research", research_agent)
-    workflow.add_node("strategy", strategy_agent)
-    workflow.add_node("writer", writer_agent)
-    workflow.add_node("editor", editor_agent)
-    workflow.add_node("supervisor", supervisor_agent)
-    workflow.add_node("analytics", analytics_agent)
+    workflow.add_node("research", _agent_node(research_agent))
+    workflow.add_node("strategy", _agent_node(strategy_agent))
+    workflow.add_node("writer", _agent_node(writer_agent))
+    workflow.add_node("editor", _agent_node(editor_agent))
+    workflow.add_node("variant", _agent_node(variant_agent))
+    workflow.add_node("select", _select_node(supervisor_agent))
     
     # Add edges
     workflow.add_edge(START, "research")
     workflow.add_edge("research", "strategy")
-    workflow.add_edge("strategy", "writer")
+    workflow.add_conditional_edges("strategy", fan_out_variants, ["writer", "variant"])
     workflow.add_edge("writer", "editor")
+    
+    # Variant branches all finish in the same step, so selection runs once over every variant
+    workflow.add_edge("variant", "select")
+    
+    if not speculative_analytics:
+        workflow.add_node("supervisor", _agent_node(supervisor_agent))
+        workflow.add_node("analytics", _agent_node(analytics_agent))
+        workflow.add_edge("editor", "supervisor")
+        
+        # Conditional edges from supervisor
+        workflow.add_conditional_edges(
+            "supervisor",
+            lambda state: "writer" if state.get("needs_revision", False) else "analytics"
+        )
+        workflow.add_conditional_edges(
+            "select",
+            lambda state: "writer" if state.get("needs_revision", False) else "analytics"
+        )
+        
+        workflow.add_edge("analytics", END)
+        
+        return workflow.compile(checkpointer=checkpointer)
+    
+    # Speculative path: analytics runs on the editor's output while the supervisor
+    # evaluates it, and the join node keeps or discards the result
+    def speculate_analytics(state: ThreadGenerationState) -> Dict:
+        with span("node", speculative=True):
+            return {"speculative_analytics": analytics_agent(state)["analytics_insights"]}
+    
+    async def aspeculate_analytics(state: ThreadGenerationState) -> Dict:
+        with span("node", speculative=True):
+            return {"speculative_analytics": (await analytics_agent.acall(state))["analytics_insights"]}
+    
+    def commit_analytics(state: ThreadGenerationState) -> Dict:
+        speculation = dict(state.get("speculation_metrics") or {"committed": False, "wasted": 0})
+        
+        if state.get("needs_revision", False):
+            speculation_stats.record(committed=False)
+            speculation["wasted"] += 1
+            return {"speculative_analytics": None, "speculation_metrics": speculation}
+        
+        speculation_stats.record(committed=True)
+        speculation["committed"] = True
+        return {
+            "analytics_insights": state["speculative_analytics"],
+            "speculative_analytics": None,
+            "speculation_metrics": speculation,
+            "current_agent": "complete"
+        }
+    
+    workflow.add_node("supervisor", _changed_keys_only(supervisor_agent))
+    workflow.add_node("analytics", RunnableLambda(speculate_analytics, afunc=aspeculate_analytics))
+    workflow.add_node("commit_analytics", commit_analytics)
+    
     workflow.add_edge("editor", "supervisor")
+    workflow.add_edge("editor", "analytics")
+    workflow.add_edge(["supervisor", "analytics"], "commit_analytics")
     
-    # Conditional edges from supervisor
     workflow.add_conditional_edges(
-        "supervisor",
-        lambda state: "writer" if state.get("needs_revision", False) else "analytics"
+        "commit_analytics",
+        lambda state: "writer" if state.get("needs_revision", False) else END
     )
     
-    workflow.add_edge("analytics", END)
+    # Analytics needs the selected variant, so there is nothing to speculate on after a fan-out
+    workflow.add_node("selected_analytics", _agent_node(analytics_agent))
+    workflow.add_conditional_edges(
+        "select",
+        lambda state: "writer" if state.get("needs_revision", False) else "selected_analytics"
+    )
+    workflow.add_edge("selected_analytics", END)
     
-    return workflow.compile()
\ No newline at end of file
+    return workflow.compile(checkpointer=checkpointer)
\ No newline at end of file
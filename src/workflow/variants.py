@@ -0,0 +1,187 @@
+"""
+Variant mode: fan one thread out into parallel writer/editor branches.
+
+Each branch samples with its own temperature (and seed, when one is set),
+and the supervisor ranks every variant in a single evaluation. Parallel
+token spend replaces the serial supervisor → writer revision loop.
+"""
+
+from typing import Any, Dict, List, Optional, Union
+
+from ..models.state import ThreadGenerationState
+
+
+MAX_VARIANTS = 5
+
+# Variant temperatures are spread evenly across this range unless given explicitly
+TEMPERATURE_RANGE = (0.5, 1.0)
+
+
+class SamplingChatModel:
+    """Chat model wrapper that adds fixed call options, such as temperature and seed, to every call"""
+    
+    def __init__(self, llm, metadata: Optional[Dict] = None, **options):
+        """
+        Initialize the wrapper.
+        
+        Args:
+            llm: Chat model (or wrapper) to call
+            metadata (Optional[Dict]): Run metadata added to each call, e.g. to tell streamed
+                messages from parallel variants apart
+            **options: Call options merged into each call; explicit call options win
+        """
+        self.llm = llm
+        self.metadata = metadata or {}
+        self.options = {name: value for name, value in options.items() if value is not None}
+    
+    def __getattr__(self, name: str) -> Any:
+        if name == "llm":
+            raise AttributeError(name)
+        return getattr(self.llm, name)
+    
+    def _config(self, config: Optional[Dict]) -> Optional[Dict]:
+        if not self.metadata:
+            return config
+        config = config or {}
+        return {**config, "metadata": {**(config.get("metadata") or {}), **self.metadata}}
+    
+    def invoke(self, messages: List, config: Optional[Dict] = None, **kwargs):
+        """Call the model with the fixed options."""
+        return self.llm.invoke(messages, self._config(config), **{**self.options, **kwargs})
+    
+    async def ainvoke(self, messages: List, config: Optional[Dict] = None, **kwargs):
+        """Async variant of ``invoke``."""
+        return await self.llm.ainvoke(messages, self._config(config), **{**self.options, **kwargs})
+
+
+def variant_plan(customizations: Optional[Dict]) -> List[Dict]:
+    """
+    Sampling options for each variant of a run.
+    
+    Reads ``variants`` (count, capped at ``MAX_VARIANTS``), and optionally
+    ``variant_temperatures`` and ``variant_seed``, from the customizations.
+    
+    Args:
+        customizations (Optional[Dict]): Run customizations
+    
+    Returns:
+        List[Dict]: ``index``, ``temperature`` and ``seed`` per variant; empty when
+        variant mode is off
+    """
+    customizations = customizations or {}
+    count = max(1, min(int(customizations.get("variants") or 1), MAX_VARIANTS))
+    if count == 1:
+        return []
+    
+    temperatures = customizations.get("variant_temperatures")
+    if not temperatures:
+        low, high = TEMPERATURE_RANGE
+        temperatures = [round(low + (high - low) * i / (count - 1), 2) for i in range(count)]
+    seed = customizations.get("variant_seed")
+    
+    return [
+        {
+            "index": i,
+            "temperature": float(temperatures[i % len(temperatures)]),
+            "seed": seed + i if seed is not None else None
+        }
+        for i in range(count)
+    ]
+
+
+def fan_out_variants(state: ThreadGenerationState) -> Union[str, List]:
+    """
+    Route after the strategy: one writer pass, or one branch per variant.
+    
+    Args:
+        state (ThreadGenerationState): Current workflow state
+    
+    Returns:
+        ``"writer"``, or a ``Send`` to the variant node for each variant
+    """
+    # LangGraph is only needed once a workflow runs, not when the UI reads MAX_VARIANTS
+    from langgraph.types import Send
+    
+    plan = variant_plan(state.get("customizations"))
+    if not plan:
+        return "writer"
+    return [Send("variant", {**state, "variant": options}) for options in plan]
+
+
+def variant_run_config(config: Dict, customizations: Optional[Dict]) -> Dict:
+    """
+    Apply a run's variant concurrency cap to its runnable config.
+    
+    Args:
+        config (Dict): Runnable config, e.g. from ``credentials_config``
+        customizations (Optional[Dict]): Run customizations with an optional ``variant_concurrency``
+    
+    Returns:
+        Dict: Config with ``max_concurrency`` set when a cap was given
+    """
+    concurrency = (customizations or {}).get("variant_concurrency")
+    if not concurrency:
+        return config
+    return {**config, "max_concurrency": max(1, int(concurrency))}
+
+
+class VariantAgent:
+    """🔀 Writes and edits one thread variant with its own sampling options"""
+    
+    def __init__(self, llm, editor_llm=None):
+        """
+        Initialize the Variant Agent.
+        
+        Args:
+            llm: Language model instance for the writer pass
+            editor_llm: Language model instance for the editor pass, defaults to ``llm``
+        """
+        self.llm = llm
+        self.editor_llm = editor_llm or llm
+    
+    def _agents(self, options: Dict):
+        from ..agents.editor import EditorAgent
+        from ..agents.writer import WriterAgent
+        
+        sampling = {"temperature": options["temperature"], "seed": options["seed"]}
+        # Branches stream side by side, so their messages say which variant and pass they belong to
+        writer_metadata = {"variant": options["index"], "variant_agent": "writer"}
+        editor_metadata = {"variant": options["index"], "variant_agent": "editor"}
+        return (WriterAgent(SamplingChatModel(self.llm, writer_metadata, **sampling)),
+                EditorAgent(SamplingChatModel(self.editor_llm, editor_metadata, **sampling)))
+    
+    def _result(self, options: Dict, edited: ThreadGenerationState) -> Dict:
+        return {
+            "variants": [{
+                **options,
+                "draft_tweets": edited["draft_tweets"],
+                "polished_tweets": edited["polished_tweets"],
+                "parse_issues": edited.get("parse_issues")
+            }]
+        }
+    
+    def __call__(self, state: ThreadGenerationState) -> Dict:
+        """
+        Write and polish one variant.
+        
+        Args:
+            state (ThreadGenerationState): Workflow state plus this branch's ``variant`` options
+        
+        Returns:
+            Dict: Update adding the finished variant to ``variants``
+        """
+        writer, editor = self._agents(state["variant"])
+        return self._result(state["variant"], editor(writer(state)))
+    
+    async def acall(self, state: ThreadGenerationState) -> Dict:
+        """
+        Write and polish one variant without blocking the event loop.
+        
+        Args:
+            state (ThreadGenerationState): Workflow state plus this branch's ``variant`` options
+        
+        Returns:
+            Dict: Update adding the finished variant to ``variants``
+        """
+        writer, editor = self._agents(state["variant"])
+        return self._result(state["variant"], await editor.acall(await writer.acall(state)))
@@ -0,0 +1,12 @@
+"""
+Shared fixtures: every test gets its own cache directory and no shared limiter.
+"""
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def isolated_environment(tmp_path, monkeypatch):
+    monkeypatch.setenv("TWEETCRAFT_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setenv("TWEETCRAFT_RATE_LIMIT", "0")
+    monkeypatch.setenv("TWEETCRAFT_HISTORY", "0")
@@ -0,0 +1,65 @@
+"""
+Tests for batch generation.
+"""
+
+import asyncio
+
+import pytest
+
+from benchmarks.fakes import FakeChatModel, FakeTavilyClient
+from src.utils.history import HistoryStore
+from src.workflow import batch
+from src.workflow.thread_workflow import create_thread_workflow
+
+
+class BrokenHistory(HistoryStore):
+    def save(self, *args, **kwargs):
+        raise OSError("database is locked")
+
+
+def test_history_errors_fail_only_their_record(tmp_path, monkeypatch):
+    monkeypatch.setattr(batch, "get_history_store", lambda: BrokenHistory(str(tmp_path / "history.sqlite3")))
+    workflow = create_thread_workflow(llm=FakeChatModel(), search_client=FakeTavilyClient())
+    record = {"id": "r1", "topic": "AI in healthcare", "num_tweets": 3}
+    
+    result = batch.run_record(workflow, record, {})
+    assert result["status"] == "error"
+    assert "database is locked" in result["error"]
+    
+    result = asyncio.run(batch.arun_record(workflow, record, {}))
+    assert result["status"] == "error"
+    assert "database is locked" in result["error"]
+
+
+def test_malformed_records_fail_without_stopping_the_batch(tmp_path, monkeypatch):
+    workflow = create_thread_workflow(llm=FakeChatModel(), search_client=FakeTavilyClient())
+    monkeypatch.setattr(batch, "get_thread_workflow", lambda **options: workflow)
+    records = [
+        {"id": "ok", "topic": "AI in healthcare", "num_tweets": 3},
+        {"id": "no-topic", "style": "Casual"},
+        {"id": "bad-size", "topic": "AI", "num_tweets": "many"}
+    ]
+    output_path = tmp_path / "threads.jsonl"
+    
+    summary = batch.run_batch(records, str(output_path), "sk-test", "tvly-test")
+    assert summary["succeeded"] == 1
+    assert summary["failed"] == 2
+    
+    results = {result["id"]: result for result in batch.read_records(str(output_path))}
+    assert results["ok"]["status"] == "ok"
+    assert results["no-topic"]["status"] == "error"
+    assert "KeyError" in results["no-topic"]["error"]
+    assert results["bad-size"]["status"] == "error"
+    assert "ValueError" in results["bad-size"]["error"]
+
+
+def test_agent_latencies_come_from_node_spans():
+    workflow = create_thread_workflow(llm=FakeChatModel(), search_client=FakeTavilyClient(),
+                                      speculative_analytics=True)
+    result = batch.run_record(workflow, {"id": "r1", "topic": "AI in healthcare", "num_tweets": 3}, {})
+    assert result["status"] == "ok"
+    
+    latencies = result["agent_latencies"]
+    assert {"research", "writer", "supervisor"} <= set(latencies)
+    for agent, durations in latencies.items():
+        assert sum(durations) == pytest.approx(result["trace"]["agents"][agent]["wall_time"])
@@ -0,0 +1,28 @@
+"""
+Tests for the SQLite checkpoint store.
+"""
+
+from benchmarks.fakes import FakeChatModel, FakeTavilyClient
+from src.models.state import create_initial_state
+from src.utils.checkpoints import SQLiteCheckpointSaver
+from src.utils.credentials import credentials_config
+from src.workflow.thread_workflow import create_thread_workflow
+
+
+OPENAI_KEY = "sk-test-0123456789abcdef"
+TAVILY_KEY = "tvly-test-0123456789abcdef"
+
+
+def test_checkpoints_do_not_store_credentials(tmp_path):
+    saver = SQLiteCheckpointSaver(str(tmp_path / "checkpoints.sqlite3"))
+    workflow = create_thread_workflow(llm=FakeChatModel(), search_client=FakeTavilyClient(),
+                                      checkpointer=saver)
+    config = credentials_config(OPENAI_KEY, TAVILY_KEY, thread_id="run-1")
+    
+    workflow.invoke(create_initial_state("AI in healthcare", "Professional", 3, 35), config)
+    
+    assert saver.get_tuple({"configurable": {"thread_id": "run-1"}}) is not None
+    # Check the database and its WAL, where recent pages live until a checkpoint
+    stored = b"".join(path.read_bytes() for path in tmp_path.glob("checkpoints.sqlite3*"))
+    assert OPENAI_KEY.encode() not in stored
+    assert TAVILY_KEY.encode() not in stored
@@ -0,0 +1,42 @@
+"""
+Tests for pooled API clients.
+"""
+
+import asyncio
+
+from src.utils.credentials import LoopClientPool
+
+
+class AsyncClient:
+    def __init__(self):
+        self.closed = False
+    
+    async def close(self):
+        self.closed = True
+
+
+def test_loop_pool_never_shares_clients_across_loops():
+    pool = LoopClientPool()
+    
+    async def lookup():
+        first = pool.get("tavily", AsyncClient)
+        assert pool.get("tavily", AsyncClient) is first
+        return first
+    
+    clients = [asyncio.run(lookup()) for _ in range(3)]
+    
+    assert len({id(client) for client in clients}) == 3
+    # Pools of loops that asyncio.run already closed are dropped
+    assert len(pool._pools) <= 1
+
+
+def test_evicted_async_clients_are_closed():
+    pool = LoopClientPool(max_size=1)
+    
+    async def evict():
+        first = pool.get("a", AsyncClient)
+        pool.get("b", AsyncClient)
+        await asyncio.sleep(0)
+        return first
+    
+    assert asyncio.run(evict()).closed
@@ -0,0 +1,31 @@
+"""
+Tests for the background job manager.
+"""
+
+from benchmarks.fakes import FakeChatModel, FakeTavilyClient
+from src.models.state import create_initial_state
+from src.workflow.jobs import JobManager
+from src.workflow.thread_workflow import create_thread_workflow
+
+
+def _wait(job, timeout: float = 30.0):
+    while not job.done:
+        assert job.events_since(len(job.events), timeout=timeout) or job.done, "job never finished"
+
+
+def test_failed_post_processing_fails_the_job_and_keeps_the_worker(tmp_path):
+    workflow = create_thread_workflow(llm=FakeChatModel(), search_client=FakeTavilyClient())
+    # A directory can't be opened for appending, so writing the trace raises
+    jobs = JobManager(lambda **options: workflow, max_workers=1, trace_file=str(tmp_path))
+    
+    first = jobs.submit(create_initial_state("AI in healthcare", "Professional", 3, 35))
+    _wait(first)
+    assert first.status == "failed"
+    assert first.events[-1]["type"] == "failed"
+    
+    # The single worker survived and runs the next job
+    jobs.trace_file = None
+    second = jobs.submit(create_initial_state("AI in healthcare", "Professional", 3, 35))
+    _wait(second)
+    assert second.status == "succeeded"
+    assert jobs.metrics()["running"] == 0
@@ -0,0 +1,20 @@
+"""
+Tests for the LLM response cache.
+"""
+
+from langchain_core.messages import HumanMessage
+
+from benchmarks.fakes import FakeChatModel
+from src.utils.llm_cache import CachedChatModel, LLMResponseCache
+
+
+def test_cached_responses_are_scoped_to_the_api_key():
+    model = CachedChatModel(FakeChatModel(), LLMResponseCache(), cache_nondeterministic=True)
+    messages = [HumanMessage(content="Summarize AI in healthcare")]
+    
+    model.invoke(messages, {"configurable": {"openai_api_key": "sk-first"}})
+    model.invoke(messages, {"configurable": {"openai_api_key": "sk-first"}})
+    assert model.cache.stats()["memory_hits"] == 1
+    
+    model.invoke(messages, {"configurable": {"openai_api_key": "sk-second"}})
+    assert model.cache.stats()["misses"] == 2
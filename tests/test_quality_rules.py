@@ -0,0 +1,114 @@
+"""
+Tests for the local quality rules and the supervisor's use of them.
+"""
+
+import pytest
+
+from src.agents.supervisor import SupervisorAgent
+from src.models.state import create_initial_state
+from src.utils.quality_rules import HARD_RULE_PENALTY, SOFT_RULE_PENALTY, check_thread
+
+GOOD = [
+    "AI now reads chest scans faster than most radiologists 🩻",
+    "Hospitals using triage models cut emergency wait times by a fifth 📉",
+    "Want the full list of studies? Follow for part two 👇"
+]
+
+
+def _replace(index, tweet):
+    tweets = list(GOOD)
+    tweets[index] = tweet
+    return tweets
+
+
+@pytest.mark.parametrize("tweets, num_tweets, rule, tweet", [
+    (GOOD[:2], 3, "count", None),
+    (_replace(1, "   "), 3, "empty", 1),
+    (_replace(0, " ".join(["word"] * 36) + " 🩻"), 3, "word_limit", 0),
+    (_replace(1, "🚀" * 281), 3, "char_limit", 1),
+    (_replace(1, GOOD[0]), 3, "duplicate", 1),
+])
+def test_hard_rules(tweets, num_tweets, rule, tweet):
+    result = check_thread(tweets, num_tweets, word_limit=35)
+    
+    hard = [violation for violation in result["violations"] if violation["hard"]]
+    assert [(violation["rule"], violation["tweet"]) for violation in hard] == [(rule, tweet)]
+    assert result["hard_failure"]
+    assert result["failing_tweets"] == ([] if tweet is None else [tweet])
+    assert result["score"] <= 10.0 - HARD_RULE_PENALTY
+
+
+@pytest.mark.parametrize("tweets, rule, tweet", [
+    ([tweet[:-2] for tweet in GOOD], "emoji", None),
+    (_replace(2, "That is where the field stands today 🏥"), "call_to_action", 2),
+])
+def test_soft_rules(tweets, rule, tweet):
+    result = check_thread(tweets, 3, word_limit=35)
+    
+    assert [(violation["rule"], violation["tweet"], violation["hard"]) for violation in result["violations"]] == \
+        [(rule, tweet, False)]
+    assert not result["hard_failure"]
+    assert result["failing_tweets"] == []
+    assert result["score"] == 10.0 - SOFT_RULE_PENALTY
+
+
+def test_a_clean_thread_scores_full_marks():
+    result = check_thread(GOOD, 3, word_limit=35)
+    assert result == {"score": 10.0, "violations": [], "hard_failure": False, "failing_tweets": []}
+
+
+class UnexpectedLLMCall(Exception):
+    pass
+
+
+class ForbiddenLLM:
+    """Fails the test if the supervisor asks the model anything"""
+    
+    def __getattr__(self, name):
+        raise UnexpectedLLMCall(name)
+
+
+def _supervisor_state(tweets, iteration_count=0):
+    state = create_initial_state("AI in healthcare", "Professional", 3, 35)
+    state.update(polished_tweets=tweets, iteration_count=iteration_count)
+    return state
+
+
+def test_hard_failures_are_sent_back_without_an_llm_call():
+    state = SupervisorAgent(ForbiddenLLM())(_supervisor_state(_replace(1, GOOD[0])))
+    
+    assert state["quality_gate"]["decision"] == "revise"
+    assert state["needs_revision"]
+    assert state["revision_targets"] == [1]
+    assert state["tweet_feedback"] == [None, "Tweet repeats tweet 1", None]
+    assert state["iteration_count"] == 1
+    assert state["current_agent"] == "writer"
+
+
+def test_a_wrong_count_needs_a_full_rewrite():
+    state = SupervisorAgent(ForbiddenLLM())(_supervisor_state(GOOD[:2]))
+    
+    assert state["needs_revision"]
+    assert state["revision_targets"] is None
+
+
+def test_a_clean_thread_passes_without_an_llm_call():
+    state = SupervisorAgent(ForbiddenLLM(), pass_threshold=9.0)(_supervisor_state(GOOD))
+    
+    assert state["quality_gate"]["decision"] == "pass"
+    assert not state["needs_revision"]
+    assert state["current_agent"] == "analytics"
+
+
+@pytest.mark.parametrize("tweets, pass_threshold, iteration_count", [
+    # No threshold: the LLM always has the final say on a thread that breaks no hard rule
+    (GOOD, None, 0),
+    # Below the threshold
+    (_replace(2, "That is where the field stands today 🏥"), 10.0, 0),
+    # Out of rule-driven revisions
+    (_replace(1, GOOD[0]), 9.0, 2),
+])
+def test_the_llm_decides_everything_else(tweets, pass_threshold, iteration_count):
+    supervisor = SupervisorAgent(ForbiddenLLM(), pass_threshold=pass_threshold)
+    with pytest.raises(UnexpectedLLMCall):
+        supervisor(_supervisor_state(tweets, iteration_count))
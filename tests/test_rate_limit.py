@@ -0,0 +1,22 @@
+"""
+Tests for provider retry hints.
+"""
+
+from tavily.errors import TavilyKeylessLimitError, UsageLimitExceededError
+
+from src.utils.rate_limit import retry_after_seconds
+
+
+def test_tavily_retry_hint_attribute():
+    error = TavilyKeylessLimitError("Too many requests", retry_after_seconds=30)
+    
+    assert retry_after_seconds(error) == 30.0
+
+
+def test_tavily_retry_hint_in_message():
+    assert retry_after_seconds(UsageLimitExceededError("Rate limit exceeded, retry after 12 seconds")) == 12.0
+    assert retry_after_seconds(UsageLimitExceededError("Please try again in 500ms")) == 0.5
+
+
+def test_tavily_error_without_hint_uses_backoff():
+    assert retry_after_seconds(UsageLimitExceededError("Rate limit exceeded")) is None
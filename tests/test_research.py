@@ -0,0 +1,86 @@
+"""
+Tests for the research agent's searches.
+"""
+
+import time
+
+import pytest
+from tavily.errors import InvalidAPIKeyError
+
+from benchmarks.fakes import FakeTavilyClient
+from src.agents.research import ResearchAgent
+from src.utils import api_keys
+from src.utils.research_cache import ResearchCache
+
+
+class SlowTavilyClient(FakeTavilyClient):
+    """Answers after a fixed delay, or never for queries containing ``hang``"""
+    
+    def __init__(self, delay: float):
+        super().__init__()
+        self.delay = delay
+    
+    def search(self, query: str, max_results: int = 5, timeout: float = 60, **kwargs):
+        time.sleep(5 if "hang" in query else self.delay)
+        return super().search(query, max_results, timeout, **kwargs)
+
+
+def test_query_timeout_starts_when_the_query_does():
+    agent = ResearchAgent(llm=None, max_workers=2, query_timeout=0.5)
+    queries = [f"query {i}" for i in range(4)]
+    
+    # The second pair only starts after 0.3s, but still gets its full 0.5s
+    _, metrics = agent._run_searches(SlowTavilyClient(delay=0.3), queries, use_cache=False)
+    
+    assert [query["error"] for query in metrics["queries"]] == [None] * 4
+
+
+def test_a_hung_query_only_drops_its_own_results():
+    agent = ResearchAgent(llm=None, max_workers=2, query_timeout=0.3)
+    
+    started = time.perf_counter()
+    _, metrics = agent._run_searches(SlowTavilyClient(delay=0.05), ["hang", "a", "b", "c"], use_cache=False)
+    
+    assert time.perf_counter() - started < 1.0
+    assert [query["error"] is not None for query in metrics["queries"]] == [True, False, False, False]
+
+
+class RejectingTavilyClient(FakeTavilyClient):
+    """Rejects every search the way Tavily does an unknown key"""
+    
+    def search(self, query: str, max_results: int = 5, timeout: float = 60, **kwargs):
+        raise InvalidAPIKeyError("Unauthorized: missing or invalid API key.")
+
+
+@pytest.mark.parametrize("concurrent", [True, False])
+def test_a_rejected_key_is_revalidated(monkeypatch, concurrent):
+    monkeypatch.setattr(api_keys, "_validation_cache", {})
+    monkeypatch.setattr(api_keys, "_check_tavily_api_key", lambda api_key: True)
+    assert api_keys.validate_tavily_api_key("tvly-revoked")
+    monkeypatch.setattr(api_keys, "_check_tavily_api_key", lambda api_key: False)
+    
+    agent = ResearchAgent(llm=None, tavily_api_key="tvly-revoked", concurrent=concurrent)
+    _, metrics = agent._run_searches(RejectingTavilyClient(), ["a", "b"], use_cache=False)
+    
+    assert metrics["invalid_api_key"]
+    assert all("invalid API key" in query["error"] for query in metrics["queries"])
+    # The cached "valid" result was dropped, so the key is checked again
+    assert not api_keys.validate_tavily_api_key("tvly-revoked")
+
+
+def test_mode_reports_how_searches_actually_ran(tmp_path):
+    cache = ResearchCache(str(tmp_path / "research.sqlite3"))
+    agent = ResearchAgent(llm=None, cache=cache)
+    queries = ["a", "b", "c"]
+    
+    _, metrics = agent._run_searches(FakeTavilyClient(), queries)
+    assert metrics["mode"] == "concurrent"
+    
+    # Every query is now served from the cache, so no search ran at all
+    _, metrics = agent._run_searches(FakeTavilyClient(), queries)
+    assert metrics["mode"] == "cached"
+    assert all(query["cached"] for query in metrics["queries"])
+    
+    # A single uncached query runs on its own
+    _, metrics = agent._run_searches(FakeTavilyClient(), queries + ["d"])
+    assert metrics["mode"] == "sequential"
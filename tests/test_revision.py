@@ -0,0 +1,89 @@
+"""
+Tests for targeted revisions, which rewrite only the tweets the supervisor failed.
+"""
+
+from langchain_core.messages import AIMessageChunk
+
+from src.agents.editor import EditorAgent
+from src.agents.writer import WriterAgent
+from src.models.state import create_initial_state
+from src.utils.research_context import estimate_tokens
+from src.workflow.jobs import JobManager
+
+APPROVED = ["First tweet 🚀", "Second tweet 💡", "Third tweet 📊", "Fourth tweet 🎯"]
+
+
+def _revision_state(targets):
+    state = create_initial_state("AI in healthcare", "Professional", len(APPROVED), 35)
+    state.update(polished_tweets=list(APPROVED), needs_revision=True, revision_targets=targets)
+    return state
+
+
+def test_writer_splices_rewritten_tweets_into_the_approved_ones():
+    state = WriterAgent(llm=None)._process(_revision_state([1, 3]), "2. New second 🔥\n4. New fourth ✨")
+    
+    assert state["draft_tweets"] == ["First tweet 🚀", "New second 🔥", "Third tweet 📊", "New fourth ✨"]
+    assert state["parse_issues"] == []
+
+
+def test_writer_keeps_a_target_the_model_skipped():
+    state = WriterAgent(llm=None)._process(_revision_state([1, 3]), "4. New fourth ✨")
+    
+    assert state["draft_tweets"] == ["First tweet 🚀", "Second tweet 💡", "Third tweet 📊", "New fourth ✨"]
+    assert state["parse_issues"] == ["Writer: tweet 2 was not rewritten"]
+
+
+def test_editor_only_touches_the_targets():
+    state = _revision_state([1, 3])
+    state["draft_tweets"] = ["Draft first", "Draft second", "Draft third", "Draft fourth"]
+    
+    state = EditorAgent(llm=None)._process(state, "2. Polished second 🔥\n4. Polished fourth ✨")
+    assert state["polished_tweets"] == ["First tweet 🚀", "Polished second 🔥", "Third tweet 📊", "Polished fourth ✨"]
+    assert state["parse_issues"] == []
+
+
+def test_revision_metrics_count_kept_tweets():
+    writer = WriterAgent(llm=None)
+    
+    targeted = writer._revision_metrics(_revision_state([1, 3]), [1, 3])
+    assert targeted["revisions"] == 1
+    assert targeted["targeted_revisions"] == 1
+    assert targeted["tweets_rewritten"] == 2
+    assert targeted["tweets_kept"] == 2
+    kept_tokens = estimate_tokens(APPROVED[0]) + estimate_tokens(APPROVED[2])
+    assert targeted["completion_tokens_saved"] == 2 * kept_tokens
+    
+    # A full rewrite adds to the earlier revision's counts and saves nothing
+    state = _revision_state(None)
+    state["revision_metrics"] = targeted
+    full = writer._revision_metrics(state, None)
+    assert full["revisions"] == 2
+    assert full["targeted_revisions"] == 1
+    assert full["tweets_rewritten"] == 2 + len(APPROVED)
+    assert full["tweets_kept"] == 2
+    assert full["completion_tokens_saved"] == 2 * kept_tokens
+
+
+class ScriptedWorkflow:
+    """Replays a targeted revision's stream: the supervisor's verdict, then the writer rewriting tweets 2 and 4"""
+    
+    def __init__(self, state):
+        self.state = state
+    
+    def stream(self, stream_input, config, stream_mode):
+        yield "updates", {"supervisor": self.state}
+        for text in ["2. New second 🔥\n", "4. New ", "fourth ✨"]:
+            yield "messages", (AIMessageChunk(content=text), {"langgraph_node": "writer"})
+        yield "updates", {"writer": {**self.state, "current_agent": "editor"}}
+
+
+def test_tweet_events_carry_the_targeted_positions():
+    state = _revision_state([1, 3])
+    jobs = JobManager(lambda **options: ScriptedWorkflow(state), max_workers=1)
+    job = jobs.submit(create_initial_state("AI in healthcare", "Professional", len(APPROVED), 35))
+    while not job.done:
+        job.events_since(len(job.events), timeout=10)
+    
+    assert job.status == "succeeded", job.error
+    tweets = [(event["index"], event["text"]) for event in job.events if event["type"] == "tweet"]
+    assert tweets == [(1, "New second 🔥"), (3, "New fourth ✨")]
@@ -0,0 +1,62 @@
+"""
+Tests for the generation HTTP service.
+"""
+
+import json
+import threading
+from contextlib import contextmanager
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+import pytest
+
+from src.service.server import create_server
+from src.workflow.jobs import JobManager
+
+
+@contextmanager
+def _serve(jobs: JobManager):
+    server = create_server(port=0, jobs=jobs)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def _request(url: str, body=None):
+    data = json.dumps(body).encode("utf-8") if body is not None else None
+    request = Request(url, data=data, headers={"Content-Type": "application/json"})
+    try:
+        with urlopen(request, timeout=10) as response:
+            return response.status, dict(response.headers), json.loads(response.read())
+    except HTTPError as e:
+        return e.code, dict(e.headers), json.loads(e.read())
+
+
+@pytest.mark.parametrize("query", ["since=abc", "since=-1", "wait=soon", "wait=-2", "wait=nan"])
+def test_bad_event_parameters_are_rejected(query):
+    # Without workers queued jobs stay put, so nothing runs during the test
+    with _serve(JobManager(max_workers=0)) as base:
+        status, _, body = _request(f"{base}/jobs", {"topic": "AI in healthcare"})
+        assert status == 202
+        
+        status, _, body = _request(f"{base}/jobs/{body['job_id']}/events?{query}")
+        assert status == 400
+        assert "error" in body
+
+
+def test_full_queue_returns_429():
+    with _serve(JobManager(max_workers=0, max_queue=1)) as base:
+        status, _, _ = _request(f"{base}/jobs", {"topic": "AI in healthcare"})
+        assert status == 202
+        
+        status, headers, body = _request(f"{base}/jobs", {"topic": "AI in healthcare"})
+        assert status == 429
+        assert headers["Retry-After"] == "5"
+        assert "full" in body["error"]
+        
+        status, _, metrics = _request(f"{base}/metrics")
+        assert metrics["rejected"] == 1
@@ -0,0 +1,145 @@
+"""
+Tests for schema-constrained calls: parsing, the repair retry and the fallbacks.
+"""
+
+import asyncio
+import json
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+
+from src.agents.analytics import AnalyticsAgent
+from src.agents.supervisor import SupervisorAgent
+from src.models.outputs import AnalyticsInsights, ThreadEvaluation
+from src.models.state import create_initial_state
+from src.utils.structured_output import ainvoke_structured, invoke_structured, parse_output
+from src.utils.tracing import trace_run
+
+EVALUATION = {"score": 8.0, "feedback": "Clear and punchy", "revision_needed": False,
+              "tweets": [{"tweet": 1, "score": 8.0, "feedback": "Strong hook"}]}
+
+MALFORMED = [
+    # Truncated mid-string, as when max_tokens cuts the reply short
+    '{"score": 8.0, "feedback": "Clear and pun',
+    # Valid JSON missing a required field
+    '{"score": 8.0, "feedback": "Clear", "tweets": []}',
+    # Prose instead of JSON
+    "The thread looks great, I'd give it an 8.",
+]
+
+
+class ScriptedLLM:
+    """Answers with canned replies and records what it was sent"""
+    
+    def __init__(self, *replies: str):
+        self.replies = list(replies)
+        self.calls = []
+    
+    def invoke(self, messages, config=None, **kwargs):
+        self.calls.append((messages, kwargs))
+        return AIMessage(content=self.replies.pop(0))
+    
+    async def ainvoke(self, messages, config=None, **kwargs):
+        return self.invoke(messages, config, **kwargs)
+
+
+def _structured_stats(trace):
+    stats = trace.summary()["agents"]["unknown"]
+    return stats["repairs"], stats["parse_failures"]
+
+
+def test_fenced_json_is_parsed():
+    reply = "```json\n" + json.dumps(EVALUATION) + "\n```"
+    assert parse_output(ThreadEvaluation, reply).score == 8.0
+
+
+def test_a_valid_reply_needs_no_repair():
+    llm = ScriptedLLM(json.dumps(EVALUATION))
+    with trace_run() as trace:
+        result, _ = invoke_structured(llm, [HumanMessage(content="Rate it")], ThreadEvaluation, 200)
+    
+    assert result == ThreadEvaluation(**EVALUATION)
+    assert len(llm.calls) == 1
+    assert llm.calls[0][1]["response_format"]["json_schema"]["strict"]
+    assert _structured_stats(trace) == (0, 0)
+
+
+@pytest.mark.parametrize("reply", MALFORMED)
+def test_a_malformed_reply_is_repaired_once(reply):
+    llm = ScriptedLLM(reply, json.dumps(EVALUATION))
+    with trace_run() as trace:
+        result, last_reply = invoke_structured(llm, [HumanMessage(content="Rate it")], ThreadEvaluation, 200)
+    
+    assert result == ThreadEvaluation(**EVALUATION)
+    assert last_reply == json.dumps(EVALUATION)
+    # The retry shows the model its own reply and what was wrong with it
+    repair_messages = llm.calls[1][0]
+    assert repair_messages[-2].content == reply
+    assert "not valid JSON" in repair_messages[-1].content
+    assert _structured_stats(trace) == (1, 0)
+
+
+def test_the_repair_prompt_names_missing_fields():
+    llm = ScriptedLLM(MALFORMED[1], json.dumps(EVALUATION))
+    invoke_structured(llm, [HumanMessage(content="Rate it")], ThreadEvaluation, 200)
+    assert "revision_needed" in llm.calls[1][0][-1].content
+
+
+@pytest.mark.parametrize("reply", MALFORMED)
+def test_a_reply_still_malformed_after_the_repair_gives_up(reply):
+    llm = ScriptedLLM(reply, reply, json.dumps(EVALUATION))
+    with trace_run() as trace:
+        result, last_reply = invoke_structured(llm, [HumanMessage(content="Rate it")], ThreadEvaluation, 200)
+    
+    assert result is None
+    assert last_reply == reply
+    # Bounded to one repair
+    assert len(llm.calls) == 2
+    assert _structured_stats(trace) == (0, 1)
+
+
+def test_async_calls_repair_the_same_way():
+    llm = ScriptedLLM(MALFORMED[0], json.dumps(EVALUATION))
+    with trace_run() as trace:
+        result, _ = asyncio.run(
+            ainvoke_structured(llm, [HumanMessage(content="Rate it")], ThreadEvaluation, 200, constrained=False)
+        )
+    
+    assert result == ThreadEvaluation(**EVALUATION)
+    assert "response_format" not in llm.calls[0][1]
+    assert _structured_stats(trace) == (1, 0)
+
+
+def _thread_state():
+    state = create_initial_state("AI in healthcare", "Professional", 3, 35)
+    state["polished_tweets"] = [
+        "AI now reads chest scans faster than most radiologists 🩻",
+        "Hospitals using triage models cut emergency wait times by a fifth 📉",
+        "Want the full list of studies? Follow for part two 👇"
+    ]
+    return state
+
+
+def test_an_unparsed_evaluation_keeps_the_rule_score():
+    state = SupervisorAgent(ScriptedLLM(MALFORMED[2], MALFORMED[2]))(_thread_state())
+    
+    assert state["quality_gate"]["decision"] == "unparsed"
+    assert state["quality_score"] == state["quality_gate"]["score"]
+    assert not state["needs_revision"]
+    assert state["current_agent"] == "analytics"
+
+
+def test_unparsed_insights_keep_the_raw_reply():
+    state = AnalyticsAgent(ScriptedLLM(MALFORMED[2], MALFORMED[2]))(_thread_state())
+    
+    assert state["analytics_insights"] == {"raw_insights": MALFORMED[2]}
+    assert state["current_agent"] == "complete"
+
+
+def test_repaired_insights_are_stored_as_parsed():
+    insights = {"posting_times": ["9am"], "hashtags": ["#HealthTech"],
+                "engagement_prediction": {"likes": 120, "retweets": 30, "replies": 12},
+                "target_audience": "Clinicians", "optimization_tips": ["Lead with the statistic"]}
+    state = AnalyticsAgent(ScriptedLLM(MALFORMED[0], json.dumps(insights)))(_thread_state())
+    
+    assert state["analytics_insights"] == AnalyticsInsights(**insights).model_dump()
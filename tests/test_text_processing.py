@@ -0,0 +1,47 @@
+"""
+Tests for tweet parsing.
+"""
+
+from src.utils.text_processing import TweetStreamParser, parse_tweets
+
+
+def test_closing_remarks_are_not_part_of_the_last_tweet():
+    content = "1. AI reads scans faster.\n2. Doctors still decide.\n\nLet me know if you'd like a different tone!"
+    
+    tweets, issues = parse_tweets(content, 2)
+    
+    assert tweets == ["AI reads scans faster.", "Doctors still decide."]
+    assert issues == []
+
+
+def test_hashtags_after_the_last_tweet_are_kept():
+    tweets, _ = parse_tweets("1. First\n2. Second\n\n#AI #HealthTech", 2)
+    
+    assert tweets == ["First", "Second\n\n#AI #HealthTech"]
+
+
+def test_ratio_at_line_start_does_not_open_a_tweet():
+    content = "1. Tried the new model.\n10/10 would recommend.\n2. Here's why."
+    
+    tweets, issues = parse_tweets(content, 2)
+    
+    assert tweets == ["Tried the new model.\n10/10 would recommend.", "Here's why."]
+    assert issues == []
+
+
+def test_ratio_inside_a_line_is_streamed_as_text():
+    parser = TweetStreamParser(2)
+    completed = []
+    for character in "1. Reviewers rate it 10/10 across the board\n2. Second":
+        completed += parser.feed(character)
+    completed += parser.close()
+    
+    assert completed == ["Reviewers rate it 10/10 across the board", "Second"]
+    assert parser.issues == []
+
+
+def test_thread_numbering_still_splits_tweets():
+    tweets, issues = parse_tweets("1/3 First\n2/3 Second\n3/3 Third", 3)
+    
+    assert tweets == ["First", "Second", "Third"]
+    assert issues == []
@@ -0,0 +1,20 @@
+"""
+Tests for building the thread workflow.
+"""
+
+import os
+
+from benchmarks.fakes import FakeChatModel, FakeTavilyClient
+from src.models.state import create_initial_state
+from src.utils.credentials import credentials_config
+from src.workflow.thread_workflow import create_thread_workflow
+
+
+def test_injected_backends_leave_the_persistent_caches_alone():
+    workflow = create_thread_workflow(llm=FakeChatModel(), search_client=FakeTavilyClient(),
+                                      cache_llm_responses=True)
+    
+    workflow.invoke(create_initial_state("AI in healthcare", "Professional", 3, 35), credentials_config("sk", "tvly"))
+    
+    cache_dir = os.environ["TWEETCRAFT_CACHE_DIR"]
+    assert not os.path.exists(cache_dir) or not any(name.startswith(("llm", "research")) for name in os.listdir(cache_dir))
@@ -0,0 +1,36 @@
+"""
+Tests for the near-duplicate topic index.
+"""
+
+from src.utils.topic_index import TopicIndex
+
+
+def test_prune_drops_entries_without_reloading(tmp_path):
+    index = TopicIndex(str(tmp_path / "topics.sqlite3"), max_entries=3)
+    index.add("AI in healthcare", "Professional", "old research")
+    for i in range(3):
+        index.add(f"quantum computing startup number {i}", "Professional", f"research {i}")
+    assert index.find("the future of AI in healthcare", "Professional")["research"] == "old research"
+    
+    index.prune()
+    
+    assert index.find("the future of AI in healthcare", "Professional") is None
+    assert index.find("quantum computing startup number 2", "Professional")["research"] == "research 2"
+    # Survivors are still indexed in memory; nothing was reset
+    assert index._loaded_id == 4 and index._size == 4
+
+
+def test_compaction_keeps_live_entries(tmp_path):
+    index = TopicIndex(str(tmp_path / "topics.sqlite3"), max_entries=2)
+    topics = [f"rust embedded firmware topic {i}" for i in range(5)]
+    for topic in topics:
+        index.add(topic, "Casual", topic)
+    index.find(topics[0], "Casual")
+    
+    index.prune()
+    
+    assert index._size == 2
+    assert index.find(topics[4], "Casual")["research"] == topics[4]
+    # A pruned topic can only match a surviving near-duplicate, never itself
+    match = index.find(topics[0], "Casual")
+    assert match is None or match["research"] != topics[0]
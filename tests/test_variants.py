@@ -0,0 +1,117 @@
+"""
+Tests for variant mode: fan-out, best-of-N selection and streaming.
+"""
+
+import json
+
+from langchain_core.messages import AIMessage
+
+from benchmarks.fakes import FakeChatModel, FakeTavilyClient
+from src.agents.supervisor import SupervisorAgent
+from src.models.state import create_initial_state
+from src.workflow.jobs import JobManager
+from src.workflow.thread_workflow import create_thread_workflow
+from src.workflow.variants import VariantAgent, fan_out_variants
+
+GOOD = [
+    "AI now reads chest scans faster than most radiologists 🩻",
+    "Hospitals using triage models cut emergency wait times by a fifth 📉",
+    "Want the full list of studies? Follow for part two 👇"
+]
+
+
+class ScriptedLLM:
+    """Answers with canned replies and records the call options"""
+    
+    def __init__(self, *replies: str):
+        self.replies = list(replies)
+        self.calls = []
+    
+    def invoke(self, messages, config=None, **kwargs):
+        self.calls.append({"messages": messages, "config": config, **kwargs})
+        return AIMessage(content=self.replies.pop(0))
+
+
+def _state(variants: int = 1):
+    return create_initial_state("AI in healthcare", "Professional", 3, 35, {"variants": variants})
+
+
+def test_fan_out_sends_one_branch_per_variant():
+    assert fan_out_variants(_state()) == "writer"
+    
+    sends = fan_out_variants({**_state(3), "customizations": {"variants": 3, "variant_seed": 7}})
+    assert [send.node for send in sends] == ["variant"] * 3
+    assert [send.arg["variant"]["index"] for send in sends] == [0, 1, 2]
+    assert [send.arg["variant"]["temperature"] for send in sends] == [0.5, 0.75, 1.0]
+    assert [send.arg["variant"]["seed"] for send in sends] == [7, 8, 9]
+
+
+def test_a_variant_samples_and_tags_both_passes():
+    writer = ScriptedLLM("\n".join(f"{i}. {tweet}" for i, tweet in enumerate(GOOD, 1)))
+    editor = ScriptedLLM("\n".join(f"{i}. Polished {tweet}" for i, tweet in enumerate(GOOD, 1)))
+    options = {"index": 2, "temperature": 0.9, "seed": 11}
+    
+    update = VariantAgent(writer, editor)({**_state(3), "variant": options})
+    
+    assert update["variants"][0]["index"] == 2
+    assert update["variants"][0]["draft_tweets"] == GOOD
+    assert update["variants"][0]["polished_tweets"] == [f"Polished {tweet}" for tweet in GOOD]
+    for llm, agent in ((writer, "writer"), (editor, "editor")):
+        assert llm.calls[0]["temperature"] == 0.9
+        assert llm.calls[0]["seed"] == 11
+        assert llm.calls[0]["config"]["metadata"] == {"variant": 2, "variant_agent": agent}
+
+
+def _variant(index: int, tweets):
+    return {"index": index, "temperature": 0.5, "seed": None, "draft_tweets": tweets,
+            "polished_tweets": tweets, "parse_issues": []}
+
+
+def test_the_best_ranked_variant_is_selected():
+    ranking = {"variants": [{"variant": 1, "score": 6.0, "feedback": "Flat"},
+                            {"variant": 2, "score": 8.5, "feedback": "Punchy"}]}
+    second = [tweet.replace("AI", "Machine learning") for tweet in GOOD]
+    state = {**_state(2), "variants": [_variant(0, GOOD), _variant(1, second)]}
+    
+    state = SupervisorAgent(ScriptedLLM(json.dumps(ranking))).rank_variants(state)
+    
+    assert state["polished_tweets"] == second
+    assert state["quality_score"] == 8.5
+    assert state["quality_feedback"] == "Punchy"
+    assert not state["needs_revision"]
+    assert state["variant_metrics"]["selected"] == 1
+    assert state["variant_metrics"]["scores"] == [6.0, 8.5]
+    assert state["variant_metrics"]["decision"] == "ranked"
+
+
+def test_variants_failing_hard_rules_are_not_ranked():
+    # Only one variant passes the rules, so it is evaluated on its own like a single thread
+    evaluation = {"score": 8.0, "feedback": "Good", "revision_needed": False,
+                  "tweets": [{"tweet": i, "score": 8.0, "feedback": "Strong"} for i in range(1, 4)]}
+    state = {**_state(2), "variants": [_variant(0, GOOD[:2]), _variant(1, GOOD)]}
+    
+    state = SupervisorAgent(ScriptedLLM(json.dumps(evaluation))).rank_variants(state)
+    
+    assert state["polished_tweets"] == GOOD
+    assert state["variant_metrics"]["selected"] == 1
+    assert state["variant_metrics"]["decision"] == "single"
+
+
+def test_variant_tweets_stream_tagged_with_their_variant():
+    workflow = create_thread_workflow(llm=FakeChatModel(), search_client=FakeTavilyClient())
+    jobs = JobManager(lambda **options: workflow, max_workers=1)
+    job = jobs.submit(_state(2))
+    while not job.done:
+        job.events_since(len(job.events), timeout=10)
+    assert job.status == "succeeded", job.error
+    
+    # A revision of the selected variant afterwards streams untagged, like any single thread
+    tokens = [event for event in job.events if event["type"] == "token" and "variant" in event]
+    assert {(event["agent"], event["variant"]) for event in tokens} == \
+        {("writer", 0), ("writer", 1), ("editor", 0), ("editor", 1)}
+    
+    for variant in (0, 1):
+        for agent in ("writer", "editor"):
+            tweets = [event for event in job.events
+                      if event["type"] == "tweet" and event["agent"] == agent and event.get("variant") == variant]
+            assert [event["index"] for event in tweets] == [0, 1, 2]